@@ -0,0 +1,16 @@
+"""word_ast 性能基准测试包。
+
+Benchmark suite for the parse → view → merge → render pipeline.
+Run with ``python -m benchmarks``; see :mod:`benchmarks.runner`.
+"""
+from .generator import generate_docx
+from .runner import compare_results, run_benchmarks, run_case
+from .serialization import benchmark_serializers
+
+__all__ = [
+    "generate_docx",
+    "run_benchmarks",
+    "run_case",
+    "compare_results",
+    "benchmark_serializers",
+]
@@ -0,0 +1,194 @@
+"""合成 docx 生成器：按参数批量构造基准测试用的 Word 文档。
+
+Synthetic docx generator for the benchmark suite.
+
+``generate_docx`` builds a deterministic document from a small set of knobs
+(paragraph count, runs per paragraph, table count/size, merged cells, inline
+images, TOC) so that every pipeline stage can be timed on inputs of a known
+shape.  The same ``seed`` always produces the same document.
+"""
+import io
+import random
+import struct
+import zlib
+from pathlib import Path
+
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Inches, Pt, RGBColor
+
+# Mixed CJK / Latin vocabulary so run text exercises both font slots
+_WORDS = (
+    "文档", "解析", "渲染", "格式", "样式", "表格", "目录", "图片",
+    "document", "render", "paragraph", "style", "table", "heading",
+    "benchmark", "latency", "throughput", "memory", "pipeline", "round-trip",
+)
+
+_COLORS = (
+    RGBColor(0x1F, 0x1F, 0x1F),
+    RGBColor(0xC0, 0x00, 0x00),
+    RGBColor(0x00, 0x70, 0xC0),
+    RGBColor(0x00, 0x80, 0x00),
+)
+
+_FONTS = ("Calibri", "Arial", "宋体", "黑体")
+
+
+def make_png(width: int = 32, height: int = 32, seed: int = 0) -> bytes:
+    """生成一张 RGB 纯色 PNG（仅用标准库）。
+
+    Build a solid-colour RGB PNG of *width* × *height* pixels using only the
+    standard library, so image payload size scales with the requested size.
+    """
+    rng = random.Random(seed)
+    pixel = bytes(rng.randrange(256) for _ in range(3))
+    raw = b"".join(b"\x00" + pixel * width for _ in range(height))
+
+    def _chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", zlib.compress(raw))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def _build_toc_sdt(instruction: str = 'TOC \\o "1-3" \\h \\z \\u'):
+    """构造一个块级 TOC ``<w:sdt>``（含标题段落与字段）。"""
+    sdt = OxmlElement("w:sdt")
+    sdtPr = OxmlElement("w:sdtPr")
+    docPartObj = OxmlElement("w:docPartObj")
+    gallery = OxmlElement("w:docPartGallery")
+    gallery.set(qn("w:val"), "Table of Contents")
+    docPartObj.append(gallery)
+    sdtPr.append(docPartObj)
+    sdt.append(sdtPr)
+
+    sdtContent = OxmlElement("w:sdtContent")
+
+    def _text_p(text: str):
+        p = OxmlElement("w:p")
+        r = OxmlElement("w:r")
+        t = OxmlElement("w:t")
+        t.text = text
+        r.append(t)
+        p.append(r)
+        return p
+
+    def _fld_run(fld_type: str):
+        r = OxmlElement("w:r")
+        fc = OxmlElement("w:fldChar")
+        fc.set(qn("w:fldCharType"), fld_type)
+        r.append(fc)
+        return r
+
+    sdtContent.append(_text_p("目录"))
+    field_p = OxmlElement("w:p")
+    field_p.append(_fld_run("begin"))
+    r_instr = OxmlElement("w:r")
+    instr = OxmlElement("w:instrText")
+    instr.set(qn("xml:space"), "preserve")
+    instr.text = f" {instruction} "
+    r_instr.append(instr)
+    field_p.append(r_instr)
+    field_p.append(_fld_run("separate"))
+    sdtContent.append(field_p)
+    sdtContent.append(_text_p("Chapter 1.....1"))
+    end_p = OxmlElement("w:p")
+    end_p.append(_fld_run("end"))
+    sdtContent.append(end_p)
+    sdt.append(sdtContent)
+    return sdt
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _add_formatted_run(paragraph, rng: random.Random, words: int) -> None:
+    run = paragraph.add_run(_sentence(rng, words) + " ")
+    choice = rng.randrange(4)
+    if choice == 0:
+        run.bold = True
+    elif choice == 1:
+        run.italic = True
+    run.font.color.rgb = rng.choice(_COLORS)
+    run.font.size = Pt(rng.choice((10.5, 12, 14)))
+    run.font.name = rng.choice(_FONTS)
+
+
+def generate_docx(
+    path: str | Path,
+    *,
+    paragraphs: int = 200,
+    runs_per_paragraph: int = 4,
+    words_per_run: int = 6,
+    tables: int = 4,
+    table_rows: int = 8,
+    table_cols: int = 4,
+    merged_cells: bool = True,
+    images: int = 4,
+    image_size: int = 32,
+    toc: bool = True,
+    heading_every: int = 20,
+    seed: int = 0,
+) -> Path:
+    """生成一个合成 docx 并返回其路径。
+
+    Generate a synthetic document at *path* and return the path.
+
+    Body layout: an optional TOC first, then *paragraphs* paragraphs (every
+    *heading_every*-th one is a heading), with the *tables* tables and
+    *images* inline images spread evenly through the body.  Each body
+    paragraph carries *runs_per_paragraph* differently formatted runs, so
+    run merging and ``_raw_rPr`` capture see realistic work.  When
+    *merged_cells* is set each table gets one horizontal and one vertical
+    merge.
+    """
+    rng = random.Random(seed)
+    doc = Document()
+
+    if toc:
+        sectPr = doc.element.body.find(qn("w:sectPr"))
+        sectPr.addprevious(_build_toc_sdt())
+
+    table_at = {
+        (i + 1) * paragraphs // (tables + 1) for i in range(tables)
+    } if tables else set()
+    image_at = {
+        (i + 1) * paragraphs // (images + 1) for i in range(images)
+    } if images else set()
+    image_seq = 0
+
+    for i in range(paragraphs):
+        if heading_every and i % heading_every == 0:
+            level = 1 + (i // heading_every) % 3
+            doc.add_heading(_sentence(rng, 4), level=level)
+        else:
+            p = doc.add_paragraph()
+            for _ in range(max(runs_per_paragraph, 1)):
+                _add_formatted_run(p, rng, words_per_run)
+            if i in image_at:
+                png = make_png(image_size, image_size, seed=seed + image_seq)
+                p.add_run().add_picture(io.BytesIO(png), width=Inches(1), height=Inches(1))
+                image_seq += 1
+
+        if i in table_at:
+            table = doc.add_table(rows=table_rows, cols=table_cols)
+            table.style = "Table Grid"
+            for r in range(table_rows):
+                for c in range(table_cols):
+                    table.cell(r, c).text = _sentence(rng, 3)
+            if merged_cells and table_rows >= 3 and table_cols >= 3:
+                table.cell(0, 0).merge(table.cell(0, 1))
+                table.cell(1, table_cols - 1).merge(table.cell(2, table_cols - 1))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc.save(str(path))
+    return path
@@ -0,0 +1,378 @@
+"""基准测试运行器：逐阶段计时、统计吞吐与峰值内存，并与基线比较。
+
+Benchmark runner: times every pipeline stage on synthetic documents, reports
+throughput and peak memory, writes a machine-readable results file and can
+compare a run against a stored baseline to flag regressions.
+
+Usage::
+
+    python -m benchmarks                       # run the default cases
+    python -m benchmarks --cases small large -o results.json
+    python -m benchmarks --compare baseline.json --threshold 0.2
+    python -m benchmarks --serializers         # compare full-AST file formats
+
+The exit status is 1 when ``--compare`` finds at least one regression.
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from word_ast import extract_text, merge_ai_edits, parse_docx, render_ast, to_ai_view
+from word_ast.pipeline import roundtrip_docx
+
+from .generator import generate_docx
+from .serialization import benchmark_serializers, format_serializer_results
+
+RESULTS_VERSION = 1
+
+# Named document shapes; every key is forwarded to ``generate_docx``.
+CASES: dict[str, dict] = {
+    "small": {"paragraphs": 50, "tables": 1, "table_rows": 4, "images": 1},
+    "medium": {"paragraphs": 400, "tables": 6, "table_rows": 10, "images": 6},
+    "large": {"paragraphs": 2000, "tables": 20, "table_rows": 20, "table_cols": 6, "images": 20},
+    "run_dense": {"paragraphs": 300, "runs_per_paragraph": 24, "words_per_run": 2, "tables": 0, "images": 0},
+    "table_heavy": {"paragraphs": 40, "tables": 10, "table_rows": 40, "table_cols": 8, "images": 0},
+    "image_heavy": {"paragraphs": 100, "tables": 0, "images": 40, "image_size": 256},
+}
+
+DEFAULT_CASES = ("small", "medium")
+
+
+def _edit_view(view: dict) -> dict:
+    """模拟一次 AI 编辑：改写每第 10 个段落的首个文本 run 并加粗。
+
+    Simulate an AI edit on a copy of *view*: every 10th paragraph gets its
+    first Text run rewritten and bolded, so merge exercises the XML sync path.
+    """
+    edited = copy.deepcopy(view)
+    for i, block in enumerate(edited["document"]["body"]):
+        if i % 10 or block.get("type") != "Paragraph":
+            continue
+        for piece in block.get("content", []):
+            if piece.get("type") == "Text":
+                piece["text"] = piece["text"].upper()
+                piece.setdefault("overrides", {})["bold"] = True
+                break
+    return edited
+
+
+# Each stage is (prepare, run): *prepare* fills the shared context once
+# outside the timed region, *run* is the timed call.
+def _prep_parse(ctx: dict) -> None:
+    pass
+
+
+def _run_parse(ctx: dict):
+    return parse_docx(ctx["docx"])
+
+
+def _run_parse_no_raw(ctx: dict):
+    return parse_docx(ctx["docx"], raw=False)
+
+
+def _run_parse_no_images(ctx: dict):
+    return parse_docx(ctx["docx"], images=False)
+
+
+def _run_parse_text_only(ctx: dict):
+    return parse_docx(ctx["docx"], text_only=True)
+
+
+def _run_parse_parallel(ctx: dict):
+    return parse_docx(ctx["docx"], workers=os.cpu_count())
+
+
+def _run_render_parallel(ctx: dict):
+    out = Path(ctx["tmpdir"]) / "render_parallel_out.docx"
+    render_ast(ctx["merged"], out, workers=os.cpu_count())
+    return out
+
+
+def _run_render_streaming(ctx: dict):
+    out = Path(ctx["tmpdir"]) / "render_streaming_out.docx"
+    render_ast(ctx["merged"], out, streaming=True)
+    return out
+
+
+def _run_roundtrip(ctx: dict):
+    out = Path(ctx["tmpdir"]) / "roundtrip_out.docx"
+    render_ast(parse_docx(ctx["docx"]), out)
+    return out
+
+
+def _run_pipeline(ctx: dict):
+    out = Path(ctx["tmpdir"]) / "pipeline_out.docx"
+    return roundtrip_docx(ctx["docx"], out)
+
+
+def _run_pipeline_process(ctx: dict):
+    out = Path(ctx["tmpdir"]) / "pipeline_process_out.docx"
+    return roundtrip_docx(ctx["docx"], out, process=True)
+
+
+def _run_extract_text(ctx: dict):
+    return list(extract_text(ctx["docx"]))
+
+
+def _prep_ai_view(ctx: dict) -> None:
+    if "ast" not in ctx:
+        ctx["ast"] = parse_docx(ctx["docx"])
+
+
+def _run_ai_view(ctx: dict):
+    return to_ai_view(ctx["ast"])
+
+
+def _prep_merge(ctx: dict) -> None:
+    _prep_ai_view(ctx)
+    if "edited_view" not in ctx:
+        ctx["edited_view"] = _edit_view(to_ai_view(ctx["ast"]))
+
+
+def _run_merge(ctx: dict):
+    return merge_ai_edits(ctx["ast"], ctx["edited_view"])
+
+
+def _prep_render(ctx: dict) -> None:
+    _prep_merge(ctx)
+    if "merged" not in ctx:
+        ctx["merged"] = merge_ai_edits(ctx["ast"], ctx["edited_view"])
+
+
+def _run_render(ctx: dict):
+    out = Path(ctx["tmpdir"]) / "render_out.docx"
+    render_ast(ctx["merged"], out)
+    return out
+
+
+STAGES: dict[str, tuple] = {
+    "parse": (_prep_parse, _run_parse),
+    "ai_view": (_prep_ai_view, _run_ai_view),
+    "merge": (_prep_merge, _run_merge),
+    "render": (_prep_render, _run_render),
+    # Selective parse modes; opt-in with --stages
+    "parse_no_raw": (_prep_parse, _run_parse_no_raw),
+    "parse_no_images": (_prep_parse, _run_parse_no_images),
+    "parse_text_only": (_prep_parse, _run_parse_text_only),
+    "extract_text": (_prep_parse, _run_extract_text),
+    "parse_parallel": (_prep_parse, _run_parse_parallel),
+    "render_parallel": (_prep_render, _run_render_parallel),
+    "render_streaming": (_prep_render, _run_render_streaming),
+    # docx -> docx: two-phase parse + render vs. the overlapped pipeline
+    "roundtrip": (_prep_parse, _run_roundtrip),
+    "pipeline": (_prep_parse, _run_pipeline),
+    "pipeline_process": (_prep_parse, _run_pipeline_process),
+}
+
+DEFAULT_STAGES = ("parse", "ai_view", "merge", "render")
+
+
+def _time_stage(run, ctx: dict, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(ctx)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _peak_memory(run, ctx: dict) -> int:
+    """在 tracemalloc 下单独执行一次，返回峰值分配字节数。"""
+    tracemalloc.start()
+    try:
+        run(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_case(
+    name: str,
+    params: dict,
+    *,
+    stages: tuple[str, ...] | None = None,
+    repeat: int = 3,
+    measure_memory: bool = True,
+    workdir: str | Path | None = None,
+) -> dict:
+    """生成一个用例文档并对各阶段计时，返回该用例的结果 dict。
+
+    Generate the document described by *params* and benchmark each stage.
+    Timings are wall-clock seconds over *repeat* runs (``min`` is the value
+    used for comparison); throughput is reported as blocks/s and input
+    MB/s.  Peak memory is measured in a separate tracemalloc run so that
+    tracing overhead does not distort the timings.
+    """
+    with tempfile.TemporaryDirectory(dir=workdir) as tmpdir:
+        docx_path = generate_docx(Path(tmpdir) / f"{name}.docx", **params)
+        ctx: dict = {"docx": docx_path, "tmpdir": tmpdir}
+        input_bytes = docx_path.stat().st_size
+        block_count = len(parse_docx(docx_path)["document"]["body"])
+
+        stage_results = {}
+        for stage in stages or DEFAULT_STAGES:
+            prepare, run = STAGES[stage]
+            prepare(ctx)
+            timings = _time_stage(run, ctx, repeat)
+            best = min(timings)
+            result = {
+                "seconds_min": best,
+                "seconds_median": statistics.median(timings),
+                "runs": len(timings),
+                "blocks_per_sec": block_count / best if best else None,
+                "input_mb_per_sec": input_bytes / 1e6 / best if best else None,
+            }
+            if measure_memory:
+                result["peak_bytes"] = _peak_memory(run, ctx)
+            stage_results[stage] = result
+
+    return {
+        "params": params,
+        "input_bytes": input_bytes,
+        "blocks": block_count,
+        "stages": stage_results,
+    }
+
+
+def run_benchmarks(
+    case_names=DEFAULT_CASES,
+    *,
+    stages: tuple[str, ...] | None = None,
+    repeat: int = 3,
+    measure_memory: bool = True,
+) -> dict:
+    """运行多个用例，返回可直接写成 JSON 的完整结果。"""
+    cases = {}
+    for name in case_names:
+        cases[name] = run_case(
+            name, CASES[name],
+            stages=stages, repeat=repeat, measure_memory=measure_memory,
+        )
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cases": cases,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float = 0.15) -> list[dict]:
+    """与基线比较，返回所有超出阈值的回归项。
+
+    A stage regresses when its ``seconds_min`` or ``peak_bytes`` exceeds the
+    baseline value by more than *threshold* (a fraction, ``0.15`` = +15%).
+    Cases or stages missing from either side are ignored.
+    """
+    regressions = []
+    for case, cur_case in current.get("cases", {}).items():
+        base_case = baseline.get("cases", {}).get(case)
+        if base_case is None:
+            continue
+        for stage, cur in cur_case.get("stages", {}).items():
+            base = base_case.get("stages", {}).get(stage)
+            if base is None:
+                continue
+            for metric in ("seconds_min", "peak_bytes"):
+                if metric not in cur or not base.get(metric):
+                    continue
+                ratio = cur[metric] / base[metric]
+                if ratio > 1 + threshold:
+                    regressions.append({
+                        "case": case,
+                        "stage": stage,
+                        "metric": metric,
+                        "baseline": base[metric],
+                        "current": cur[metric],
+                        "ratio": ratio,
+                    })
+    return regressions
+
+
+def format_results(results: dict) -> str:
+    """将结果格式化为人类可读的表格文本。"""
+    lines = [f"{'case':<12} {'stage':<16} {'min s':>9} {'blocks/s':>11} {'MB/s':>8} {'peak MB':>9}"]
+    for case, data in results["cases"].items():
+        for stage, r in data["stages"].items():
+            peak = r.get("peak_bytes")
+            lines.append(
+                f"{case:<12} {stage:<16} {r['seconds_min']:>9.4f} "
+                f"{r['blocks_per_sec'] or 0:>11.0f} {r['input_mb_per_sec'] or 0:>8.2f} "
+                f"{peak / 1e6 if peak is not None else float('nan'):>9.2f}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="word_ast pipeline benchmarks",
+    )
+    parser.add_argument("--cases", nargs="+", default=list(DEFAULT_CASES),
+                        choices=sorted(CASES), help="要运行的用例")
+    parser.add_argument("--stages", nargs="+", default=None,
+                        choices=list(STAGES),
+                        help="要计时的阶段（默认 parse/ai_view/merge/render；"
+                             "parse_no_raw/parse_no_images/parse_text_only 对比选择性解析，"
+                             "extract_text 为纯文本流式提取，parse_parallel/render_parallel 用全部 CPU 核并行解析/渲染，"
+                             "render_streaming 为流式写出；roundtrip 与 pipeline/pipeline_process "
+                             "对比两阶段往返与流水线往返）")
+    parser.add_argument("--repeat", type=int, default=3, help="每阶段重复次数")
+    parser.add_argument("--no-memory", action="store_true", help="跳过峰值内存测量")
+    parser.add_argument("-o", "--output", default=None, metavar="JSON",
+                        help="结果文件路径（JSON）")
+    parser.add_argument("--compare", default=None, metavar="JSON",
+                        help="基线结果文件；发现回归时退出码为 1")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="回归阈值（比例，默认 0.15 即 +15%%）")
+    parser.add_argument("--serializers", action="store_true",
+                        help="改为比较完整 AST 各序列化格式的大小与读写耗时")
+    args = parser.parse_args(argv)
+
+    if args.serializers:
+        serializer_results = {}
+        for case in args.cases:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                docx_path = generate_docx(Path(tmpdir) / f"{case}.docx", **CASES[case])
+                serializer_results[case] = benchmark_serializers(
+                    parse_docx(docx_path), repeat=args.repeat,
+                )
+        print(format_serializer_results(serializer_results))
+        if args.output:
+            Path(args.output).write_text(json.dumps(serializer_results, indent=2), encoding="utf-8")
+            print(f"Results saved  : {args.output}")
+        return 0
+
+    results = run_benchmarks(
+        args.cases,
+        stages=tuple(args.stages) if args.stages else None,
+        repeat=args.repeat,
+        measure_memory=not args.no_memory,
+    )
+    print(format_results(results))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results saved  : {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) vs {args.compare}:")
+            for r in regressions:
+                print(f"  {r['case']}/{r['stage']} {r['metric']}: "
+                      f"{r['baseline']:.4g} → {r['current']:.4g} (x{r['ratio']:.2f})")
+            return 1
+        print(f"No regressions vs {args.compare} (threshold {args.threshold:.0%}).")
+    return 0
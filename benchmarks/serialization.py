@@ -0,0 +1,66 @@
+"""完整 AST 序列化格式对比：文件大小与读写耗时。
+
+Compares the serializers of :mod:`word_ast.serializers` on one AST: file
+size, compression ratio against indented JSON, and best-of-*repeat* save
+and load times.
+
+Usage::
+
+    python -m benchmarks --serializers --cases medium large
+"""
+import tempfile
+import time
+from pathlib import Path
+
+from word_ast.serializers import SERIALIZERS, load_ast
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_serializers(
+    ast: dict,
+    *,
+    formats: tuple[str, ...] | None = None,
+    repeat: int = 3,
+    workdir: str | Path | None = None,
+) -> dict:
+    """对每种格式计时保存/加载，返回 ``{format: {bytes, ratio, save_seconds, load_seconds}}``。
+
+    ``ratio`` is the file size relative to the ``json`` format (or to the
+    first format measured when ``json`` is not among *formats*).
+    """
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmpdir:
+        for name in formats or tuple(SERIALIZERS):
+            serializer = SERIALIZERS[name]
+            path = Path(tmpdir) / f"ast.{name}{serializer.suffix}"
+            save_seconds = _best_of(lambda: serializer.dump(ast, path), repeat)
+            load_seconds = _best_of(lambda: load_ast(path), repeat)
+            results[name] = {
+                "bytes": path.stat().st_size,
+                "save_seconds": save_seconds,
+                "load_seconds": load_seconds,
+            }
+    reference = results.get("json") or next(iter(results.values()), None)
+    for r in results.values():
+        r["ratio"] = r["bytes"] / reference["bytes"] if reference["bytes"] else None
+    return results
+
+
+def format_serializer_results(results: dict[str, dict]) -> str:
+    """格式化为表格：case / format / 大小 / 比例 / 保存与加载耗时。"""
+    lines = [f"{'case':<12} {'format':<13} {'size MB':>9} {'ratio':>7} {'save s':>9} {'load s':>9}"]
+    for case, formats in results.items():
+        for name, r in formats.items():
+            lines.append(
+                f"{case:<12} {name:<13} {r['bytes'] / 1e6:>9.3f} {r['ratio']:>7.3f} "
+                f"{r['save_seconds']:>9.4f} {r['load_seconds']:>9.4f}"
+            )
+    return "\n".join(lines)
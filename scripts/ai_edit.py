@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 """AI-assisted Word document workflow.
 
-两个子命令 / Two subcommands:
+三个子命令 / Three subcommands:
 
   export  —— docx → AI 视图 + 保真数据（两个 JSON 文件）
   render  —— AI 视图 [+ 保真数据] → docx
+  run     —— docx + 修改需求 → 分块并发调用 LLM → docx
 
 导出 / Export:
   python scripts/ai_edit.py export -I report.docx -O ./out/
@@ -17,8 +18,29 @@
                                     -S ./out/report.full_ast.json \\
                                     -O output.docx
 
+流式渲染（边接收 LLM 输出边合并渲染）/ Streaming render from LLM output:
+  llm-client ... | python scripts/ai_edit.py render -V - --stream \\
+                                    -S ./out/report.full_ast.json -O output.docx
+
+锚点文本视图（纯文本改写，每个 block 一行）/ Anchored text view:
+  python scripts/ai_edit.py export -I report.docx -O ./out/ --text-view
+  python scripts/ai_edit.py render -V ./out/modified.ai_view.txt \\
+                                    -S ./out/report.full_ast.json -O output.docx
+
 渲染（从零创建）/ Render (create from scratch):
   python scripts/ai_edit.py render -V new_doc.json -O output.docx
+  python scripts/ai_edit.py render -V new_doc.md --markdown -O output.docx \\
+                                    [--style-map styles.json]
+
+分块调用 LLM 一步完成 / Chunked LLM edit in one step:
+  python scripts/ai_edit.py run -I report.docx -O output.docx \\
+                                 --instruction "把所有“客户”改为“用户”" \\
+                                 --client mypkg.llm:make_client --parallel 8
+  （--client mock 使用本地模拟客户端，原样返回内容）
+
+性能剖析 / Profiling (all subcommands):
+  python scripts/ai_edit.py export -I report.docx -O ./out/ --profile
+  产出 ./out/report.profile.pstats 与 ./out/report.profile.txt
 """
 import argparse
 import json
@@ -30,8 +52,34 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from word_ast import parse_docx, render_ast
-from word_ast.ai_view import to_ai_view
 from word_ast.ai_merge import merge_ai_edits
+from word_ast.ai_stream import render_ai_stream
+from word_ast.compact_view import compact_ai_view, dumps_compact, expand_ai_view, is_compact
+from word_ast.export import export_docx
+from word_ast.llm.cache import DEFAULT_MAX_ENTRIES, EditCache
+from word_ast.llm.orchestrator import (
+    DEFAULT_CHUNK_CHARS, DEFAULT_PARALLEL, DEFAULT_RETRIES, edit_document, load_client,
+)
+from word_ast.llm.tokens import load_tokenizer, token_report
+from word_ast.markdown_import import load_style_map, markdown_to_ast
+from word_ast.profiling import Profiler
+from word_ast.serializers import SERIALIZERS, get_serializer, load_ast
+from word_ast.storage.jsonl import JsonlAST, is_jsonl_ast
+from word_ast.text_view import parse_text_view, to_text_view
+
+TEXT_VIEW_SUFFIX = ".txt"
+
+
+def _make_profiler(args, default_prefix: Path) -> Profiler:
+    """根据 --profile 参数创建剖析器（未指定时返回空剖析器）。"""
+    if args.profile is None:
+        return Profiler(None)
+    return Profiler(args.profile or default_prefix)
+
+
+def _finish_profiler(profiler: Profiler) -> None:
+    for path in profiler.write():
+        print(f"Profile saved  : {path}")
 
 
 def cmd_export(args):
@@ -41,48 +89,176 @@ def cmd_export(args):
 
     stem = input_path.stem
     ai_view_path = outdir / f"{stem}.ai_view.json"
-    full_ast_path = outdir / f"{stem}.full_ast.json"
+    fmt = args.format
+    full_ast_suffix = ".jsonl" if fmt == "jsonl" else get_serializer(fmt).suffix
+    full_ast_path = outdir / f"{stem}.full_ast{full_ast_suffix}"
+    profiler = _make_profiler(args, outdir / f"{stem}.profile")
 
-    # Step 1: Parse → full AST (含 _raw_*)
-    full_ast = parse_docx(input_path)
-    print(f"Parsed: {input_path}")
-
-    # Step 2: Save full AST（保真数据，用户本地留存）
-    full_ast_path.write_text(
-        json.dumps(full_ast, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    # 单次遍历：逐块解析，同时写出 full AST（含 _raw_*，本地留存）
+    # 与 AI 视图（去掉 _raw_*，给 LLM）
+    with profiler.stage("export"):
+        block_count = export_docx(
+            input_path, full_ast_path, ai_view_path, compact=args.compact,
+            format=None if fmt == "jsonl" else fmt,
+        )
+    print(f"Parsed: {input_path} ({block_count} blocks)")
     print(f"Full AST saved : {full_ast_path}")
-
-    # Step 3: Generate AI view（去掉 _raw_*，给 LLM）
-    ai_view = to_ai_view(full_ast)
-    ai_view_path.write_text(
-        json.dumps(ai_view, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    if args.compact_view:
+        # 紧凑编码需要全文统计（样式共享字段、重复格式），导出后整体重写 AI 视图
+        with profiler.stage("compact_view"):
+            view = compact_ai_view(json.loads(ai_view_path.read_text(encoding="utf-8")))
+            text = dumps_compact(view) if args.compact else json.dumps(view, ensure_ascii=False, indent=2)
+            ai_view_path.write_text(text, encoding="utf-8")
     print(f"AI view saved  : {ai_view_path}")
+    if args.text_view:
+        # 锚点文本视图：每个 block 一行，只含文字，供纯文本改写
+        text_view_path = ai_view_path.with_suffix(TEXT_VIEW_SUFFIX)
+        with profiler.stage("text_view"):
+            view = json.loads(ai_view_path.read_text(encoding="utf-8"))
+            text_view_path.write_text(to_text_view(expand_ai_view(view)), encoding="utf-8")
+        print(f"Text view saved: {text_view_path}")
+    if args.stats:
+        # token 占用报告：找出 AI 视图中最耗上下文的 block / 字段 / 节点类型
+        report = token_report(
+            json.loads(ai_view_path.read_text(encoding="utf-8")), load_tokenizer(args.tokenizer)
+        )
+        stats_path = outdir / f"{stem}.token_stats.json"
+        stats_path.write_text(json.dumps(report.as_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        print()
+        print(report.format())
+        print(f"\nToken stats saved: {stats_path}")
+    _finish_profiler(profiler)
+
+
+def _read_chunks(view: str, size: int = 4096):
+    """逐段读取 AI 视图文本（``-`` 表示标准输入）。"""
+    if view == "-":
+        while chunk := sys.stdin.read(size):
+            yield chunk
+        return
+    with open(view, encoding="utf-8") as fp:
+        while chunk := fp.read(size):
+            yield chunk
+
+
+def cmd_render_stream(args, profiler: Profiler):
+    # 边读取 AI 输出边合并渲染；full AST 在首个 block 到达前加载
+    with profiler.stage("render_stream"):
+        full_ast = None
+        if args.schema:
+            full_ast = JsonlAST(args.schema) if is_jsonl_ast(args.schema) else load_ast(args.schema)
+        stats = render_ai_stream(_read_chunks(args.view), args.output, full_ast)
+    print(f"AI blocks received: {stats['ai_blocks']}, blocks rendered: {stats['blocks']}")
+    print(f"Output written : {args.output}")
+    _finish_profiler(profiler)
+
+
+def cmd_render_markdown(args, profiler: Profiler):
+    # 从零创建：Markdown 直接转换为 AST，无需 LLM 写出完整 JSON
+    if args.schema or args.stream:
+        sys.exit("render: --markdown creates a new document and cannot be used with -S/--schema or --stream")
+    with profiler.stage("markdown"):
+        if args.view == "-":
+            text, base_dir = sys.stdin.read(), Path.cwd()
+        else:
+            text, base_dir = Path(args.view).read_text(encoding="utf-8"), Path(args.view).parent
+        style_map = load_style_map(args.style_map) if args.style_map else None
+        try:
+            ast = markdown_to_ast(text, style_map=style_map, base_dir=base_dir)
+        except (OSError, ValueError) as exc:
+            sys.exit(f"render: {exc}")
+    print(f"Markdown loaded: {args.view} ({len(ast['document']['body'])} blocks)")
+    with profiler.stage("render"):
+        render_ast(ast, args.output)
+    print(f"Output written : {args.output}")
+    _finish_profiler(profiler)
 
 
 def cmd_render(args):
     output_path = Path(args.output)
+    profiler = _make_profiler(args, output_path.with_suffix(".profile"))
+    if args.markdown:
+        cmd_render_markdown(args, profiler)
+        return
+    text_view = Path(args.view).suffix == TEXT_VIEW_SUFFIX
+    if text_view and (args.stream or not args.schema):
+        sys.exit("render: a text view (.txt) needs -S/--schema and cannot be used with --stream")
+    if args.stream:
+        cmd_render_stream(args, profiler)
+        return
 
-    # 读取 AI 视图（必需）
-    ai_view = json.loads(Path(args.view).read_text(encoding="utf-8"))
+    # 读取 AI 视图（必需）；文本视图在 full AST 加载后再解析
+    with profiler.stage("load_view"):
+        if text_view:
+            ai_view = Path(args.view).read_text(encoding="utf-8")
+        else:
+            ai_view = json.loads(Path(args.view).read_text(encoding="utf-8"))
+            if is_compact(ai_view):
+                ai_view = expand_ai_view(ai_view)
     print(f"AI view loaded : {args.view}")
 
     if args.schema:
         # 场景 A：修改已有文档 — merge AI 视图回保真 AST
-        full_ast = json.loads(Path(args.schema).read_text(encoding="utf-8"))
+        with profiler.stage("load_full_ast"):
+            if is_jsonl_ast(args.schema):
+                # JSONL：只读头部与索引，block 在渲染时流式读取
+                full_ast = JsonlAST(args.schema)
+            else:
+                # json / gzip / lzma：按文件头自动识别
+                full_ast = load_ast(args.schema)
         print(f"Full AST loaded: {args.schema}")
-        ast_to_render = merge_ai_edits(full_ast, ai_view)
+        if text_view:
+            with profiler.stage("parse_text_view"):
+                ai_view = parse_text_view(ai_view, full_ast)
+            print(f"Text view parsed: {len(ai_view['document']['body'])} paragraphs changed")
+        with profiler.stage("merge"):
+            ast_to_render = merge_ai_edits(full_ast, ai_view)
         print("Merged AI edits into full AST.")
     else:
         # 场景 B：从零创建 — ai_view 本身就是完整 AST（无 _raw_*）
         ast_to_render = ai_view
         print("No schema provided — rendering AI view directly (create mode).")
 
-    render_ast(ast_to_render, output_path)
+    with profiler.stage("render"):
+        render_ast(ast_to_render, output_path)
     print(f"Output written : {output_path}")
+    _finish_profiler(profiler)
+
+
+def cmd_run(args):
+    output_path = Path(args.output)
+    profiler = _make_profiler(args, output_path.with_suffix(".profile"))
+    instruction = args.instruction
+    if args.instruction_file:
+        instruction = Path(args.instruction_file).read_text(encoding="utf-8")
+    if not instruction:
+        sys.exit("run: --instruction or --instruction-file is required")
+    client = load_client(args.client)
+    cache = EditCache(args.cache, max_entries=args.cache_size) if args.cache else None
+
+    with profiler.stage("parse"):
+        full_ast = parse_docx(args.input)
+    print(f"Parsed: {args.input} ({len(full_ast['document']['body'])} blocks)")
+    try:
+        with profiler.stage("llm_edit"):
+            merged, stats = edit_document(
+                full_ast, instruction, client,
+                max_parallel=args.parallel, chunk_chars=args.chunk_chars,
+                retries=args.retries, strict=not args.keep_failed, cache=cache,
+            )
+    finally:
+        if cache is not None:
+            cache.close()
+    print(f"LLM chunks: {stats.chunks}, requests: {stats.requests}, "
+          f"retries: {stats.retries}, failed: {stats.failed}")
+    if cache is not None:
+        c = cache.stats()
+        print(f"Cache: {c['hits']} hits, {c['misses']} misses ({c['hit_rate']:.0%}), "
+              f"{c['evictions']} evicted, {c['entries']} entries")
+    with profiler.stage("render"):
+        render_ast(merged, output_path)
+    print(f"Output written : {output_path}")
+    _finish_profiler(profiler)
 
 
 def main():
@@ -102,6 +278,26 @@ def main():
                           help="输入 .docx 文件路径")
     p_export.add_argument("-O", "--outdir", required=True, metavar="DIR",
                           help="输出目录（自动生成 <stem>.ai_view.json 和 <stem>.full_ast.json）")
+    p_export.add_argument("--compact", action="store_true",
+                          help="紧凑 JSON 输出（无缩进、无空格）")
+    full_ast_format = p_export.add_mutually_exclusive_group()
+    full_ast_format.add_argument("--format", default="json", choices=[*SERIALIZERS, "jsonl"],
+                                 help="full AST 格式：json（默认）/ json-compact / gzip（.json.gz）"
+                                      "/ lzma（.json.xz）/ jsonl；渲染时自动识别")
+    full_ast_format.add_argument("--jsonl", dest="format", action="store_const", const="jsonl",
+                                 help="等价于 --format jsonl：full AST 写为 <stem>.full_ast.jsonl"
+                                      "（每行一个 block，附带偏移索引）")
+    p_export.add_argument("--compact-view", action="store_true",
+                          help="AI 视图使用紧凑编码（省略默认值、共享格式提升到头部），"
+                               "render 时自动展开")
+    p_export.add_argument("--text-view", action="store_true",
+                          help="另写出锚点文本视图 <stem>.ai_view.txt（每个 block 一行），"
+                               "改写后以 render -V <文件>.txt -S <full AST> 合并")
+    p_export.add_argument("--stats", action="store_true",
+                          help="打印 AI 视图的 token 占用报告（按 block / 字段 / 节点类型），"
+                               "并写出 <stem>.token_stats.json")
+    p_export.add_argument("--tokenizer", default="heuristic", metavar="SPEC",
+                          help="token 计数方式：heuristic（默认，内置估算）或 tiktoken:<encoding>")
 
     # ── render ──────────────────────────────────────────────────────────────
     p_render = sub.add_parser(
@@ -109,11 +305,56 @@ def main():
         help="AI view [+ full AST] → docx",
     )
     p_render.add_argument("-V", "--view", required=True, metavar="JSON",
-                          help="AI 修改后的 ai_view JSON 文件路径")
+                          help="AI 修改后的 ai_view JSON 文件路径（--stream 时可用 - 表示标准输入）；"
+                               ".txt 为锚点文本视图，须同时指定 -S")
     p_render.add_argument("-S", "--schema", default=None, metavar="JSON",
-                          help="保真数据 full_ast JSON（可选；不传则为从零创建模式）")
+                          help="保真数据 full_ast（JSON / .json.gz / .json.xz / JSONL，自动识别；"
+                               "可选，不传则为从零创建模式）")
     p_render.add_argument("-O", "--output", required=True, metavar="DOCX",
                           help="输出 .docx 文件路径")
+    p_render.add_argument("--stream", action="store_true",
+                          help="增量读取 AI 视图，block 到达即合并并流式渲染"
+                               "（AI 返回的 block 须按文档顺序）")
+    p_render.add_argument("--markdown", action="store_true",
+                          help="-V 为 Markdown 文件（- 表示标准输入），直接转换为 AST 并从零创建文档；"
+                               "图片路径相对 Markdown 文件所在目录")
+    p_render.add_argument("--style-map", default=None, metavar="JSON",
+                          help="--markdown 的样式映射（元素 → 样式 id 或 "
+                               "{style, paragraph_format, overrides}），覆盖默认映射中的同名项")
+
+    # ── run ─────────────────────────────────────────────────────────────────
+    p_run = sub.add_parser(
+        "run",
+        help="docx + 修改需求 → 分块并发调用 LLM → docx",
+    )
+    p_run.add_argument("-I", "--input", required=True, metavar="DOCX",
+                       help="输入 .docx 文件路径")
+    p_run.add_argument("-O", "--output", required=True, metavar="DOCX",
+                       help="输出 .docx 文件路径")
+    p_run.add_argument("--instruction", default=None,
+                       help="修改需求（对全文每个分块使用同一条需求）")
+    p_run.add_argument("--instruction-file", default=None, metavar="TXT",
+                       help="从文件读取修改需求")
+    p_run.add_argument("--client", default="mock", metavar="SPEC",
+                       help="LLM 客户端：mock（本地模拟）或 module:factory，"
+                            "factory() 返回带 complete(system, prompt) 方法的对象")
+    p_run.add_argument("--parallel", type=int, default=DEFAULT_PARALLEL, metavar="N",
+                       help=f"同时进行的 LLM 请求数上限（默认 {DEFAULT_PARALLEL}）")
+    p_run.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS, metavar="N",
+                       help=f"每个分块的 JSON 字符数上限（默认 {DEFAULT_CHUNK_CHARS}）")
+    p_run.add_argument("--retries", type=int, default=DEFAULT_RETRIES, metavar="N",
+                       help=f"失败分块的重试次数（默认 {DEFAULT_RETRIES}）")
+    p_run.add_argument("--keep-failed", action="store_true",
+                       help="重试后仍失败的分块保留原文，而不是中止")
+    p_run.add_argument("--cache", default=None, metavar="DB",
+                       help="LLM 结果缓存（SQLite 文件）：内容与需求均未变的 block 直接取缓存，不再发送")
+    p_run.add_argument("--cache-size", type=int, default=DEFAULT_MAX_ENTRIES, metavar="N",
+                       help=f"缓存条目上限，超出时淘汰最久未用的（默认 {DEFAULT_MAX_ENTRIES}）")
+
+    for p in (p_export, p_render, p_run):
+        p.add_argument("--profile", nargs="?", const="", default=None, metavar="PREFIX",
+                       help="写出 <PREFIX>.pstats 与 <PREFIX>.txt 剖析报告"
+                            "（省略 PREFIX 时放在输出文件旁）")
 
     args = parser.parse_args()
 
@@ -121,6 +362,8 @@ def main():
         cmd_export(args)
     elif args.cmd == "render":
         cmd_render(args)
+    elif args.cmd == "run":
+        cmd_run(args)
 
 
 if __name__ == "__main__":
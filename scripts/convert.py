@@ -11,6 +11,9 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from word_ast import parse_docx, render_ast
+from word_ast.pipeline import DEFAULT_QUEUE_SIZE, roundtrip_docx
+from word_ast.profiling import Profiler
+from word_ast.serializers import SERIALIZERS
 
 
 def main():
@@ -20,17 +23,55 @@ def main():
     p_parse = sub.add_parser("parse")
     p_parse.add_argument("input")
     p_parse.add_argument("--output-dir", required=True)
+    p_parse.add_argument("--format", default="json", choices=list(SERIALIZERS),
+                         help="AST file format (render auto-detects it)")
+    p_parse.add_argument("--workers", type=int, default=None, metavar="N",
+                         help="parse blocks in N worker processes")
 
     p_render = sub.add_parser("render")
     p_render.add_argument("input")
     p_render.add_argument("--output", required=True)
+    p_render.add_argument("--workers", type=int, default=None, metavar="N",
+                          help="render blocks in N worker processes")
+    p_render.add_argument("--streaming", action="store_true",
+                          help="write word/document.xml incrementally (bounded memory)")
+
+    p_roundtrip = sub.add_parser("roundtrip", help="docx -> docx, parsing and rendering overlapped")
+    p_roundtrip.add_argument("input")
+    p_roundtrip.add_argument("--output", required=True)
+    p_roundtrip.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, metavar="N",
+                             help="max parsed blocks waiting to be rendered")
+    p_roundtrip.add_argument("--process", action="store_true",
+                             help="parse in a child process (uses a second core)")
+
+    for p in (p_parse, p_render, p_roundtrip):
+        p.add_argument("--profile", nargs="?", const="", default=None, metavar="PREFIX",
+                       help="write <PREFIX>.pstats and <PREFIX>.txt profile reports")
 
     args = parser.parse_args()
 
     if args.cmd == "parse":
-        parse_docx(args.input, args.output_dir)
+        default_prefix = Path(args.output_dir) / "parse.profile"
+    else:
+        default_prefix = Path(args.output).with_suffix(".profile")
+    profiler = Profiler(
+        None if args.profile is None else (args.profile or default_prefix)
+    )
+
+    if args.cmd == "parse":
+        with profiler.stage("parse"):
+            parse_docx(args.input, args.output_dir, format=args.format, workers=args.workers)
     elif args.cmd == "render":
-        render_ast(args.input, args.output)
+        with profiler.stage("render"):
+            render_ast(args.input, args.output, workers=args.workers, streaming=args.streaming)
+    elif args.cmd == "roundtrip":
+        with profiler.stage("roundtrip"):
+            stats = roundtrip_docx(args.input, args.output,
+                                   queue_size=args.queue_size, process=args.process)
+        print(f"{stats.blocks} blocks, producer waited {stats.producer_waits} times")
+
+    for path in profiler.write():
+        print(f"Profile saved: {path}")
 
 
 if __name__ == "__main__":
@@ -1,11 +1,14 @@
 """Tests for ai_view, ai_merge, and _inherit_style_rPr."""
+import json
 from pathlib import Path
 
+import pytest
 from docx import Document
 from docx.oxml.ns import qn
 from docx.shared import Pt, RGBColor
 
 from word_ast import parse_docx, to_ai_view, merge_ai_edits
+from word_ast.ai_view import AIViewProxy, json_default
 
 
 # ---------------------------------------------------------------------------
@@ -74,6 +77,52 @@ def test_to_ai_view_preserves_non_raw_fields():
     assert para["content"][0]["overrides"] == {"bold": True, "size": 24, "color": "#FF0000"}
 
 
+def test_to_ai_view_shares_scalars_and_copies_containers():
+    """to_ai_view must share immutable values but never share containers."""
+    ast = _make_minimal_ast(run_overrides={"bold": True, "_raw_rPr": "<x/>"})
+    view = to_ai_view(ast)
+    orig_run = ast["document"]["body"][0]["content"][0]
+    view_run = view["document"]["body"][0]["content"][0]
+    assert view_run["text"] is orig_run["text"]
+    assert view_run is not orig_run
+    assert view_run["overrides"] is not orig_run["overrides"]
+
+
+def test_to_ai_view_handles_deep_nesting():
+    """to_ai_view is iterative and must not hit the recursion limit."""
+    node: dict = {"leaf": True, "_raw_x": "drop"}
+    for _ in range(5000):
+        node = {"child": [node], "_raw_x": "drop"}
+    view = to_ai_view(node)
+    depth = 0
+    while "child" in view:
+        assert "_raw_x" not in view
+        view = view["child"][0]
+        depth += 1
+    assert depth == 5000
+    assert view == {"leaf": True}
+
+
+def test_ai_view_proxy_hides_raw_fields_without_copying():
+    """AIViewProxy must hide _raw_* keys and serialize like to_ai_view."""
+    raw_xml = f'<w:rPr xmlns:w="{_W_NS}"><w:b/></w:rPr>'
+    ast = _make_minimal_ast(
+        para_fmt={"alignment": "center", "_raw_pPr": raw_xml},
+        run_overrides={"bold": True, "_raw_rPr": raw_xml},
+    )
+    proxy = AIViewProxy(ast)
+    para = proxy["document"]["body"][0]
+    assert "_raw_pPr" not in para["paragraph_format"]
+    with pytest.raises(KeyError):
+        para["paragraph_format"]["_raw_pPr"]
+    assert dict(para["content"][0]["overrides"]) == {"bold": True}
+    assert proxy == to_ai_view(ast)
+    assert proxy.to_dict() == to_ai_view(ast)
+    assert json.dumps(proxy, default=json_default, ensure_ascii=False, indent=2) == (
+        json.dumps(to_ai_view(ast), ensure_ascii=False, indent=2)
+    )
+
+
 # ---------------------------------------------------------------------------
 # merge_ai_edits tests
 # ---------------------------------------------------------------------------
@@ -282,3 +331,193 @@ def test_ai_view_merge_roundtrip_preserves_text(tmp_path: Path):
 
     rebuilt = Document(out)
     assert rebuilt.paragraphs[0].text == "Hello AI World"
+
+
+def test_stream_reader_yields_blocks_as_they_complete():
+    from word_ast.ai_stream import AIViewStreamReader
+
+    view = {
+        "schema_version": "1.0",
+        "document": {
+            "meta": {"title": "x"},
+            "styles": {"Normal": {"font": "宋体"}},
+            "body": [
+                {"id": "p0", "type": "Paragraph", "content": [{"text": 'a "quoted" } ] \\ text'}]},
+                {"id": "t1", "type": "Table", "rows": [[{"text": "[cell]"}]]},
+            ],
+            "passthrough": {},
+        },
+    }
+    text = "Here you go:\n```json\n" + json.dumps(view, ensure_ascii=False) + "\n```"
+    reader = AIViewStreamReader()
+    arrivals = []
+    for i in range(0, len(text), 3):
+        arrivals.append(reader.feed(text[i:i + 3]))
+    got = [block for chunk in arrivals for block in chunk]
+    assert got == view["document"]["body"]
+    # The first block is delivered before the text of the second one ends
+    first_at = next(i for i, chunk in enumerate(arrivals) if chunk)
+    assert first_at < len(arrivals) - 10
+    assert reader.header["document"]["styles"] == view["document"]["styles"]
+    assert reader.close() == {**view, "document": {**view["document"], "body": []}}
+
+    truncated = AIViewStreamReader()
+    truncated.feed(text[: len(text) // 2])
+    with pytest.raises(ValueError):
+        truncated.close()
+
+
+def test_render_ai_stream_matches_merge_then_render(tmp_path: Path):
+    import zipfile
+
+    from benchmarks import generate_docx
+    from word_ast import render_ast
+    from word_ast.ai_stream import render_ai_stream
+
+    src = generate_docx(tmp_path / "src.docx", paragraphs=30, tables=2, table_rows=3, images=2)
+    ast = parse_docx(src)
+    view = json.loads(json.dumps(to_ai_view(ast), default=json_default))
+    body = view["document"]["body"]
+    edited = [b for b in body if b["type"] == "Paragraph" and b.get("content")][::3]
+    for block in edited:
+        block["content"][0]["text"] = "改写后的文本"
+    # The model returns only the edited blocks plus an id it made up
+    view["document"]["body"] = edited + [{"id": "p9999", "type": "Paragraph", "content": []}]
+    text = json.dumps(view, ensure_ascii=False)
+
+    render_ast(merge_ai_edits(ast, view), tmp_path / "expected.docx")
+    stats = render_ai_stream(
+        (text[i:i + 50] for i in range(0, len(text), 50)), tmp_path / "streamed.docx", ast
+    )
+    assert stats["ai_blocks"] == len(edited) + 1
+    assert stats["blocks"] == len(ast["document"]["body"])
+    expected = zipfile.ZipFile(tmp_path / "expected.docx")
+    streamed = zipfile.ZipFile(tmp_path / "streamed.docx")
+    for part in expected.namelist():
+        assert streamed.read(part) == expected.read(part), part
+
+    # Create mode renders the view itself
+    create_text = json.dumps(to_ai_view(ast), default=json_default)
+    render_ai_stream([create_text], tmp_path / "created.docx")
+    render_ast(json.loads(create_text), tmp_path / "created_expected.docx")
+    created = zipfile.ZipFile(tmp_path / "created.docx")
+    assert created.read("word/document.xml") == zipfile.ZipFile(
+        tmp_path / "created_expected.docx").read("word/document.xml")
+
+    # Edits out of document order cannot be streamed
+    view["document"]["body"] = edited[::-1]
+    with pytest.raises(ValueError):
+        render_ai_stream([json.dumps(view)], tmp_path / "bad.docx", ast)
+    assert not any("bad" in p.name for p in tmp_path.iterdir())
+
+
+def test_render_ai_stream_over_lazy_full_asts(tmp_path: Path):
+    import zipfile
+
+    from benchmarks import generate_docx
+    from word_ast import render_ast
+    from word_ast.ai_stream import render_ai_stream
+    from word_ast.parser import LazyDocument
+    from word_ast.storage.jsonl import JsonlAST, write_jsonl_ast
+
+    src = generate_docx(tmp_path / "src.docx", paragraphs=20, tables=1, table_rows=3)
+    ast = parse_docx(src)
+    view = json.loads(json.dumps(to_ai_view(ast), default=json_default))
+    edited = [b for b in view["document"]["body"] if b["type"] == "Paragraph" and b.get("content")][::4]
+    for block in edited:
+        block["content"][0]["text"] = "改写后的文本"
+    view["document"]["body"] = edited
+    text = json.dumps(view, ensure_ascii=False)
+    write_jsonl_ast(ast, tmp_path / "full.jsonl")
+
+    for name, lazy in (("jsonl", JsonlAST(tmp_path / "full.jsonl")), ("lazy", LazyDocument(src))):
+        render_ast(merge_ai_edits(lazy, view), tmp_path / f"{name}_expected.docx")
+        render_ai_stream((text[i:i + 50] for i in range(0, len(text), 50)), tmp_path / f"{name}.docx", lazy)
+        assert zipfile.ZipFile(tmp_path / f"{name}.docx").read("word/document.xml") == \
+            zipfile.ZipFile(tmp_path / f"{name}_expected.docx").read("word/document.xml"), name
+
+
+def _drop_empty_formats(obj):
+    if isinstance(obj, list):
+        return [_drop_empty_formats(x) for x in obj]
+    if isinstance(obj, dict):
+        return {
+            k: _drop_empty_formats(v) for k, v in obj.items()
+            if not (k in ("overrides", "paragraph_format") and v == {})
+        }
+    return obj
+
+
+@pytest.mark.parametrize("name", ["Hello.docx", "test1.docx", "test2_t.docx"])
+def test_compact_view_expands_losslessly(name):
+    from word_ast import compact_ai_view, expand_ai_view
+    from word_ast.compact_view import dumps_compact
+    from word_ast.llm import estimate_tokens
+
+    ast = parse_docx(Path(__file__).parent / "word" / name)
+    view = to_ai_view(ast)
+    compact = compact_ai_view(view)
+    assert "compact" in compact["document"] and "compact" not in view["document"]
+    expanded = expand_ai_view(json.loads(dumps_compact(compact)))
+    assert expanded == _drop_empty_formats(view)
+    assert merge_ai_edits(ast, expanded) == merge_ai_edits(ast, view)
+    assert estimate_tokens(dumps_compact(compact)) < estimate_tokens(json.dumps(view, ensure_ascii=False))
+
+
+def test_compact_view_edits_and_streaming(tmp_path: Path):
+    import zipfile
+
+    from benchmarks import generate_docx
+    from word_ast import compact_ai_view, expand_ai_view, render_ast
+    from word_ast.ai_stream import render_ai_stream
+    from word_ast.compact_view import dumps_compact
+
+    src = generate_docx(tmp_path / "src.docx", paragraphs=30, tables=2, table_rows=3, toc=True)
+    ast = parse_docx(src)
+    compact = compact_ai_view(to_ai_view(ast))
+    assert compact["document"]["compact"]["formats"]
+    # The model edits text and writes one format inline
+    block = next(b for b in compact["document"]["body"] if b["type"] == "Paragraph" and b["content"])
+    block["content"][0]["text"] = "改写"
+    block["content"][0]["overrides"] = {"bold": True}
+
+    expected = merge_ai_edits(ast, expand_ai_view(compact))
+    edited = next(b for b in expected["document"]["body"] if b["id"] == block["id"])
+    assert edited["content"][0]["text"] == "改写"
+    assert edited["content"][0]["overrides"]["bold"] is True
+
+    render_ast(expected, tmp_path / "expected.docx")
+    text = dumps_compact(compact)
+    render_ai_stream((text[i:i + 64] for i in range(0, len(text), 64)), tmp_path / "streamed.docx", ast)
+    assert zipfile.ZipFile(tmp_path / "streamed.docx").read("word/document.xml") == \
+        zipfile.ZipFile(tmp_path / "expected.docx").read("word/document.xml")
+
+
+def test_text_view_round_trip_and_edits():
+    from word_ast import parse_text_view, to_text_view
+    from word_ast.llm import estimate_tokens
+
+    ast = _make_minimal_ast(run_overrides={"bold": True})
+    ast["document"]["body"][0]["content"] = [
+        {"type": "Text", "text": "普通", "overrides": {}},
+        {"type": "Text", "text": "加粗\n换行", "overrides": {"bold": True}, "_raw_rPr": "<w:rPr><w:b/></w:rPr>"},
+        {"type": "InlineImage", "data": "AAAA", "content_type": "image/png"},
+    ]
+    text = to_text_view(ast)
+    assert text == "[p0] 普通⟦1⟧加粗↵换行⟦2:image⟧\n"
+    assert parse_text_view(text, ast)["document"]["body"] == []
+
+    edited = "[p0] 改写后⟦1⟧仍然加粗\n  接续的一行⟦2:image⟧\n[p9] 未知锚点\n"
+    merged = merge_ai_edits(ast, parse_text_view(edited, ast))
+    content = merged["document"]["body"][0]["content"]
+    assert [item.get("text") for item in content] == ["改写后", "仍然加粗 接续的一行", None]
+    assert content[1]["_raw_rPr"] == "<w:rPr><w:b/></w:rPr>"
+    assert content[2]["data"] == "AAAA"
+
+    # A dropped marker empties its run; the text stays with the run before it
+    dropped = parse_text_view("[p0] 全部文字⟦2:image⟧", ast)["document"]["body"][0]["content"]
+    assert [item.get("text") for item in dropped[:2]] == ["全部文字", ""]
+
+    full = parse_docx(Path(__file__).parent / "word" / "test2_t.docx")
+    assert parse_text_view(to_text_view(full), full)["document"]["body"] == []
+    assert estimate_tokens(to_text_view(full)) * 2 < estimate_tokens(json.dumps(to_ai_view(full), ensure_ascii=False))
@@ -0,0 +1,131 @@
+import asyncio
+import itertools
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from benchmarks import generate_docx
+from word_ast import aio, merge_ai_edits, parse_docx, render_ast, to_ai_view
+from word_ast.aio import AsyncRunner
+
+
+def test_async_entry_points_match_sync(tmp_path: Path):
+    src = generate_docx(tmp_path / "src.docx", paragraphs=20, tables=1, table_rows=3, images=1)
+    ast = parse_docx(src)
+    view = to_ai_view(ast)
+    block = next(b for b in view["document"]["body"] if b["type"] == "Paragraph" and b["content"])
+    block["content"][0]["text"] = "改写"
+    render_ast(merge_ai_edits(ast, view), tmp_path / "sync.docx")
+
+    async def main():
+        parsed = await aio.parse_docx(src)
+        merged = await aio.merge_ai_edits(parsed, view)
+        await aio.render_ast(merged, tmp_path / "async.docx", streaming=True)
+        return parsed, merged
+
+    parsed, merged = asyncio.run(main())
+    assert parsed == ast
+    assert merged == merge_ai_edits(ast, view)
+    expected = zipfile.ZipFile(tmp_path / "sync.docx").read("word/document.xml")
+    assert zipfile.ZipFile(tmp_path / "async.docx").read("word/document.xml") == expected
+
+
+class _SlowAST:
+    """lazy AST：每个 block 之前等待，并记录同时在读的作业数。"""
+
+    def __init__(self, ast: dict, *, gate: threading.Event | None = None, repeat: bool = False):
+        self.header = {**ast, "document": {**ast["document"], "body": []}}
+        self._blocks = ast["document"]["body"]
+        self._gate = gate
+        self._repeat = repeat
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.yielded = 0
+        self.started = threading.Event()
+
+    def iter_blocks(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if self._gate is not None:
+                assert self._gate.wait(timeout=10)
+            # Repeating sources run for ~5 s, so a job that ignores cancellation finishes
+            blocks = itertools.islice(itertools.cycle(self._blocks), 1000) if self._repeat else self._blocks
+            for block in blocks:
+                time.sleep(0.005)
+                with self._lock:
+                    self.yielded += 1
+                self.started.set()
+                yield block
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+async def _wait_until(predicate, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+def test_async_runner_limits_concurrency(tmp_path: Path):
+    ast = parse_docx(generate_docx(tmp_path / "src.docx", paragraphs=5, tables=0, images=0))
+    gate = threading.Event()
+    source = _SlowAST(ast, gate=gate)
+
+    async def main():
+        # More pool workers than slots: only the semaphore can hold jobs back
+        async with AsyncRunner(max_concurrency=2, max_workers=5) as runner:
+            jobs = [
+                asyncio.create_task(runner.render_ast(source, tmp_path / f"out{i}.docx"))
+                for i in range(5)
+            ]
+            await _wait_until(lambda: source.in_flight == 2)
+            await asyncio.sleep(0.2)  # room for a third job to start if the limit leaked
+            assert source.in_flight == 2
+            gate.set()
+            await asyncio.gather(*jobs)
+
+    asyncio.run(main())
+    assert source.peak == 2
+    assert all((tmp_path / f"out{i}.docx").exists() for i in range(5))
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_async_render_cancel_and_timeout_leave_no_output(tmp_path: Path, streaming: bool):
+    ast = parse_docx(generate_docx(tmp_path / "src.docx", paragraphs=5, tables=0, images=0))
+    out = tmp_path / "out.docx"
+
+    async def main():
+        async with AsyncRunner(max_concurrency=1) as runner:
+            # Cancel mid-stream: the job stops at the next block boundary
+            source = _SlowAST(ast, repeat=True)
+            task = asyncio.create_task(runner.render_ast(source, out, streaming=streaming))
+            await _wait_until(source.started.is_set)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # The worker has stopped reading blocks by the time the task is done
+            stopped_at = source.yielded
+            await asyncio.sleep(0.05)
+            assert source.yielded == stopped_at
+
+            source = _SlowAST(ast, repeat=True)
+            with pytest.raises(TimeoutError):
+                await runner.render_ast(source, out, streaming=streaming, timeout=0.1)
+            stopped_at = source.yielded
+            await asyncio.sleep(0.05)
+            assert source.yielded == stopped_at
+
+            # The slot is free again
+            await runner.render_ast(ast, tmp_path / "after.docx", streaming=streaming)
+
+    asyncio.run(main())
+    assert not out.exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["after.docx", "src.docx"]
@@ -0,0 +1,62 @@
+"""Tests for the benchmark generator and regression comparison."""
+from pathlib import Path
+
+from benchmarks import compare_results, generate_docx, run_case
+from word_ast import parse_docx
+
+
+def test_generator_produces_requested_shape(tmp_path: Path):
+    path = generate_docx(
+        tmp_path / "gen.docx",
+        paragraphs=12, tables=2, table_rows=3, table_cols=3,
+        images=2, toc=True, heading_every=5,
+    )
+    body = parse_docx(path)["document"]["body"]
+    types = [b["type"] for b in body]
+    assert types[0] == "TOC"
+    assert types.count("Paragraph") == 12
+    assert types.count("Table") == 2
+
+    images = [
+        piece
+        for b in body if b["type"] == "Paragraph"
+        for piece in b["content"] if piece["type"] == "InlineImage"
+    ]
+    assert len(images) == 2
+
+    table = next(b for b in body if b["type"] == "Table")
+    assert table["rows"][0]["cells"][0]["col_span"] == 2
+    assert table["rows"][1]["cells"][-1]["row_span"] == 2
+
+
+def test_generator_is_deterministic(tmp_path: Path):
+    a = parse_docx(generate_docx(tmp_path / "a.docx", paragraphs=8, seed=3))
+    b = parse_docx(generate_docx(tmp_path / "b.docx", paragraphs=8, seed=3))
+    assert a["document"]["body"] == b["document"]["body"]
+
+
+def test_run_case_reports_every_stage(tmp_path: Path):
+    result = run_case(
+        "tiny", {"paragraphs": 5, "tables": 1, "table_rows": 3, "images": 0},
+        repeat=1, workdir=tmp_path,
+    )
+    assert set(result["stages"]) == {"parse", "ai_view", "merge", "render"}
+    for stage in result["stages"].values():
+        assert stage["seconds_min"] > 0
+        assert stage["peak_bytes"] > 0
+
+
+def test_compare_results_flags_regressions():
+    baseline = {"cases": {"small": {"stages": {
+        "parse": {"seconds_min": 1.0, "peak_bytes": 1000},
+        "render": {"seconds_min": 1.0, "peak_bytes": 1000},
+    }}}}
+    current = {"cases": {"small": {"stages": {
+        "parse": {"seconds_min": 1.1, "peak_bytes": 1000},
+        "render": {"seconds_min": 1.5, "peak_bytes": 2000},
+    }}}}
+    regressions = compare_results(current, baseline, threshold=0.2)
+    assert {(r["stage"], r["metric"]) for r in regressions} == {
+        ("render", "seconds_min"),
+        ("render", "peak_bytes"),
+    }
@@ -0,0 +1,58 @@
+"""Tests for the streaming full-AST / AI-view export."""
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks import generate_docx
+from word_ast import parse_docx, to_ai_view
+from word_ast.export import export_docx, write_ast_json
+from word_ast.parser import iter_parse_docx
+
+
+@pytest.fixture(scope="module")
+def sample_docx(tmp_path_factory) -> Path:
+    path = tmp_path_factory.mktemp("export") / "sample.docx"
+    return generate_docx(path, paragraphs=25, tables=2, table_rows=3, images=1, toc=True)
+
+
+def test_iter_parse_docx_matches_parse_docx(sample_docx: Path):
+    ast, blocks = iter_parse_docx(sample_docx)
+    assert ast["document"]["body"] == []
+    ast["document"]["body"] = list(blocks)
+    assert ast == parse_docx(sample_docx)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_export_matches_json_dumps(sample_docx: Path, tmp_path: Path, compact: bool):
+    full_path = tmp_path / "full.json"
+    view_path = tmp_path / "view.json"
+    count = export_docx(sample_docx, full_path, view_path, compact=compact)
+
+    ast = parse_docx(sample_docx)
+    assert count == len(ast["document"]["body"])
+    kwargs = {"separators": (",", ":")} if compact else {"indent": 2}
+    assert full_path.read_text(encoding="utf-8") == json.dumps(ast, ensure_ascii=False, **kwargs)
+    assert view_path.read_text(encoding="utf-8") == json.dumps(
+        to_ai_view(ast), ensure_ascii=False, **kwargs
+    )
+
+
+def test_write_ast_json_empty_body():
+    ast = {"schema_version": "1.0", "document": {"meta": {}, "styles": {}, "body": [], "passthrough": {}}}
+    buf = io.StringIO()
+    write_ast_json(ast, buf)
+    assert buf.getvalue() == json.dumps(ast, indent=2)
+
+
+def test_export_jsonl_full_ast(sample_docx: Path, tmp_path: Path):
+    from word_ast.storage.jsonl import JsonlAST
+
+    full_path = tmp_path / "full.jsonl"
+    view_path = tmp_path / "view.json"
+    export_docx(sample_docx, full_path, view_path)
+
+    ast = parse_docx(sample_docx)
+    assert JsonlAST(full_path).load() == ast
+    assert json.loads(view_path.read_text(encoding="utf-8")) == to_ai_view(ast)
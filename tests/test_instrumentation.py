@@ -0,0 +1,92 @@
+"""Tests for the opt-in instrumentation layer and the CLI profiler."""
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+from word_ast import instrumentation, merge_ai_edits, parse_docx, render_ast, to_ai_view
+from word_ast.profiling import Profiler
+
+
+def _make_docx(path: Path) -> Path:
+    doc = Document()
+    p = doc.add_paragraph("Hello ")
+    p.add_run("World").bold = True
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "A"
+    doc.save(path)
+    return path
+
+
+def test_disabled_records_nothing(tmp_path: Path):
+    seen = []
+    instrumentation.add_span_hook(seen.append)
+    try:
+        instrumentation.reset_counters()
+        parse_docx(_make_docx(tmp_path / "src.docx"))
+    finally:
+        instrumentation.remove_span_hook(seen.append)
+    assert not instrumentation.is_enabled()
+    assert seen == []
+    assert instrumentation.get_counters() == {}
+    assert instrumentation.span("anything") is instrumentation.span("other")
+
+
+def test_record_collects_stage_spans_and_counters(tmp_path: Path):
+    src = _make_docx(tmp_path / "src.docx")
+    out = tmp_path / "out.docx"
+
+    with instrumentation.record() as rec:
+        ast = parse_docx(src)
+        merged = merge_ai_edits(ast, to_ai_view(ast))
+        render_ast(merged, out)
+
+    names = {s.name for s in rec.spans}
+    assert {
+        "parse_docx", "parse.load", "parse_paragraph_block", "parse_table_block",
+        "parse.style_inheritance", "merge_ai_edits", "render_ast",
+        "render.paragraph", "render.table", "render.save",
+    } <= names
+    assert rec.counters["parsed_blocks"] == 2
+    assert rec.counters["rendered_blocks"] == 2
+    assert rec.counters["runs"] > 0
+    assert rec.counters["raw_xml_parses"] > 0
+    assert rec.counters["bytes_written"] == out.stat().st_size
+    assert not instrumentation.is_enabled()
+
+    para_span = next(s for s in rec.spans if s.name == "parse_paragraph_block")
+    assert para_span.attrs["block_id"] == "p0"
+    assert para_span.parent is not None and para_span.parent.name == "parse_docx"
+    assert rec.totals()["parse_docx"] >= para_span.duration
+
+
+def test_span_marks_errors():
+    with instrumentation.record() as rec:
+        with pytest.raises(ValueError):
+            with instrumentation.span("failing"):
+                raise ValueError("boom")
+    assert rec.spans[0].attrs["error"] == "ValueError"
+
+
+def test_profiler_writes_pstats_and_summary(tmp_path: Path):
+    src = _make_docx(tmp_path / "src.docx")
+    profiler = Profiler(tmp_path / "run.profile")
+    with profiler.stage("parse"):
+        ast = parse_docx(src)
+    with profiler.stage("render"):
+        render_ast(ast, tmp_path / "out.docx")
+
+    written = profiler.write()
+    assert [p.name for p in written] == ["run.profile.pstats", "run.profile.txt"]
+    assert [s["stage"] for s in profiler.stages] == ["parse", "render"]
+    assert all(s["peak_bytes"] > 0 for s in profiler.stages)
+    summary = written[1].read_text(encoding="utf-8")
+    assert "word_ast/parser/document_parser.py" in summary
+
+
+def test_profiler_without_output_is_inert(tmp_path: Path):
+    profiler = Profiler(None)
+    with profiler.stage("parse"):
+        pass
+    assert profiler.stages == []
+    assert profiler.write() == []
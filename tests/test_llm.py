@@ -0,0 +1,137 @@
+"""Tests for the LLM helpers: chunked edits, result cache and token report."""
+import json
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+from word_ast import parse_docx
+from word_ast.llm import MockLLMClient, chunk_blocks, edit_ai_view, edit_document
+
+
+def _upper(block: dict, instruction: str) -> dict:
+    assert instruction == "全部大写"
+    for item in block.get("content", []):
+        if "text" in item:
+            item["text"] = item["text"].upper()
+    return block
+
+
+def test_edit_document_chunks_concurrently_and_merges(tmp_path: Path):
+    from benchmarks import generate_docx
+    from word_ast import render_ast
+
+    src = generate_docx(tmp_path / "src.docx", paragraphs=40, tables=2, table_rows=3)
+    ast = parse_docx(src)
+    client = MockLLMClient(_upper, fail_first=2, delay=0.02)
+    merged, stats = edit_document(
+        ast, "全部大写", client, max_parallel=3, chunk_chars=1500, backoff=0, system_prompt=""
+    )
+
+    assert stats.chunks > 3
+    assert stats.retries == 2
+    assert stats.requests == stats.chunks + 2 == client.calls
+    assert 1 < client.max_in_flight <= 3
+    render_ast(merged, tmp_path / "out.docx")
+    texts = [p.text for p in Document(tmp_path / "out.docx").paragraphs if p.text]
+    assert texts and all(t == t.upper() for t in texts)
+    assert [b["id"] for b in merged["document"]["body"]] == [b["id"] for b in ast["document"]["body"]]
+
+
+def test_edit_ai_view_rejects_bad_replies():
+    view = {"schema_version": "1.0", "document": {"styles": {}, "body": [
+        {"id": f"p{i}", "type": "Paragraph", "content": [{"text": "x" * 50}]} for i in range(6)
+    ]}}
+    assert [len(c) for c in chunk_blocks(view["document"]["body"], 250)] == [2, 2, 2]
+
+    def retype(block, instruction):
+        return {**block, "type": "Table"} if block["id"] == "p3" else block
+
+    client = MockLLMClient(retype)
+    with pytest.raises(RuntimeError, match="chunk 2"):
+        edit_ai_view(view, "x", client, chunk_chars=250, retries=1, backoff=0, system_prompt="")
+
+    edited, stats = edit_ai_view(
+        view, "x", MockLLMClient(retype), chunk_chars=250, retries=1, backoff=0,
+        system_prompt="", strict=False,
+    )
+    assert stats.failed == 1 and stats.requests == 4
+    assert edited["document"]["body"] == view["document"]["body"]
+
+
+def test_edit_cache_serves_repeat_runs_and_evicts(tmp_path: Path):
+    from word_ast.llm import EditCache
+
+    def block(i, text):
+        return {"id": f"p{i}", "type": "Paragraph", "content": [{"text": text}]}
+
+    view = {"schema_version": "1.0", "document": {"styles": {}, "body": [block(i, f"段落{i}") for i in range(8)]}}
+    marked = lambda b, instruction: {**b, "content": [{"text": b["content"][0]["text"] + "!"}]}
+
+    with EditCache(tmp_path / "cache.db") as cache:
+        first, stats = edit_ai_view(view, "加感叹号", MockLLMClient(marked), chunk_chars=300,
+                                    backoff=0, system_prompt="", cache=cache)
+        assert stats.cached == 0 and cache.stats()["stores"] == 8
+
+    # A new session: one block changed, one inserted at the front (ids shift)
+    view["document"]["body"] = [block(0, "新段落")] + [
+        block(i + 1, "改过的" if i == 3 else f"段落{i}") for i in range(8)
+    ]
+    client = MockLLMClient(marked)
+    with EditCache(tmp_path / "cache.db", max_entries=9) as cache:
+        second, stats = edit_ai_view(view, "加感叹号", client, chunk_chars=300,
+                                     backoff=0, system_prompt="", cache=cache)
+        assert stats.cached == 7
+        assert cache.stats()["hits"] == 7 and cache.stats()["misses"] == 2
+        assert cache.stats()["evictions"] == 1 and len(cache) == 9
+        assert client.calls == stats.chunks == 1
+        # Another instruction or prompt version misses
+        assert cache.get(view["document"]["body"][1], "别的需求", "v") is None
+
+    texts = [(b["id"], b["content"][0]["text"]) for b in second["document"]["body"]]
+    assert texts[0] == ("p0", "新段落!")
+    assert texts[2] == ("p2", "段落1!")
+    assert texts[4] == ("p4", "改过的!")
+
+
+def test_edit_cache_hits_moved_table():
+    from word_ast.llm import EditCache
+
+    def table(table_id):
+        cell = f"{table_id}.r0c0"
+        return {"id": table_id, "type": "Table", "rows": [{"cells": [{
+            "id": cell, "col_span": 1, "row_span": 1,
+            "content": [{"id": f"{cell}.p0", "type": "Paragraph", "content": [{"text": "单元格"}]}],
+        }]}]}
+
+    with EditCache(":memory:") as cache:
+        edited = table("t1")
+        edited["rows"][0]["cells"][0]["content"][0]["content"][0]["text"] = "改过的单元格"
+        cache.put(table("t1"), edited, "改写", "v")
+        hit = cache.get(table("t3"), "改写", "v")
+        assert hit is not None and cache.stats()["hits"] == 1
+        cell = hit["rows"][0]["cells"][0]
+        assert (hit["id"], cell["id"], cell["content"][0]["id"]) == ("t3", "t3.r0c0", "t3.r0c0.p0")
+        assert cell["content"][0]["content"][0]["text"] == "改过的单元格"
+
+
+def test_token_report_breaks_down_the_view(tmp_path: Path):
+    from benchmarks import generate_docx
+    from word_ast import to_ai_view
+    from word_ast.llm import estimate_tokens, token_report
+
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("中文ab") == 3
+
+    src = generate_docx(tmp_path / "src.docx", paragraphs=20, tables=2, table_rows=3)
+    view = to_ai_view(parse_docx(src))
+    report = token_report(view)
+    body = report.total - report.header
+    assert len(report.blocks) == len(view["document"]["body"])
+    assert abs(sum(n for _, n in report.by_type.values()) - body) < body * 0.02
+    assert {"Paragraph", "Text", "Table", "Row", "Cell"} <= set(report.by_type)
+    assert report.by_field["Text.overrides"][1] > 0
+    assert "By field" in report.format()
+
+    # A pluggable tokenizer: one token per character
+    assert token_report(view, len).total == len(json.dumps(view, ensure_ascii=False))
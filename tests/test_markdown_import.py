@@ -0,0 +1,117 @@
+"""Tests for the Markdown importer used in create mode."""
+import struct
+import zlib
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+from word_ast import markdown_to_ast, render_ast
+
+
+def _png(width: int, height: int) -> bytes:
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    raw = b"".join(b"\x00" + b"\x00\x00\xff" * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+MARKDOWN = """\
+# 项目报告
+
+[TOC]
+
+本报告概述了**项目**的主要进展，
+包括 *进度* 与 `code_x`、[链接](http://example.com) 和 snake_case。  
+第二行\\*不是斜体\\*。
+
+二级标题
+--------
+
+- 第一项
+    - 嵌套项
+- 第二项 ***粗斜***
+
+1. 步骤一
+
+> 引用
+
+```
+print("hi")
+```
+
+| 任务 | 状态 |
+|:-----|:----:|
+| 需求 | **完成** |
+| 设计 \\| 评审 |
+
+![图](fig.png)
+"""
+
+
+@pytest.mark.filterwarnings("error::UserWarning")
+def test_markdown_to_ast_structure(tmp_path: Path):
+    (tmp_path / "fig.png").write_bytes(_png(2000, 500))
+    ast = markdown_to_ast(MARKDOWN, base_dir=tmp_path)
+    body = ast["document"]["body"]
+    assert [b["id"] for b in body] == [
+        "p0", "toc0", "p1", "p2", "p3", "p4", "p5", "p6", "p7", "p8", "t0", "p9",
+    ]
+    assert [b.get("style") for b in body if b["type"] == "Paragraph"] == [
+        "Heading1", "Normal", "Heading2", "ListBullet", "ListBullet2", "ListBullet",
+        "ListNumber", "Quote", "NoSpacing", "Normal",
+    ]
+    para = body[2]["content"]
+    assert "".join(item["text"] for item in para) == (
+        "本报告概述了项目的主要进展，包括 进度 与 code_x、链接 和 snake_case。\n第二行*不是斜体*。"
+    )
+    assert para[1] == {"type": "Text", "text": "项目", "overrides": {"bold": True}}
+    assert para[3]["overrides"] == {"italic": True}
+    assert para[5]["overrides"] == {"font_ascii": "Consolas"}
+    assert body[6]["content"][1]["overrides"] == {"bold": True, "italic": True}
+
+    table = body[10]
+    assert table["style"] == "TableGrid"
+    header, first, second = table["rows"]
+    assert header["cells"][1]["content"][0]["paragraph_format"] == {"alignment": "center"}
+    assert header["cells"][0]["content"][0]["content"][0]["overrides"] == {"bold": True}
+    assert first["cells"][1]["id"] == "t0.r1c1" and first["cells"][1]["content"][0]["id"] == "t0.r1c1.p0"
+    assert second["cells"][0]["content"][0]["content"][0]["text"] == "设计 | 评审"
+    assert second["cells"][1]["content"][0]["content"] == []
+
+    image = body[11]["content"][0]
+    assert image["type"] == "InlineImage" and image["content_type"] == "image/png"
+    text_width = 11906 - 1800 * 2
+    assert (image["width"], image["height"]) == (text_width, 500 * text_width // 2000)
+    assert body[11]["paragraph_format"] == {"alignment": "center"}
+
+    styles = ast["document"]["styles"]
+    assert styles["Heading1"]["name"] == "Heading 1" and styles["TableGrid"]["type"] == "table"
+    assert set(styles) == {b.get("style") for b in body if b.get("style")}
+
+    render_ast(ast, tmp_path / "out.docx")
+    doc = Document(tmp_path / "out.docx")
+    assert doc.paragraphs[0].style.name == "Heading 1"
+    assert len(doc.tables) == 1 and len(doc.inline_shapes) == 1
+
+
+def test_markdown_style_map_overrides_defaults():
+    style_map = {
+        "paragraph": {"style": "Normal", "paragraph_format": {"indent_first_line": 420},
+                      "overrides": {"font_east_asia": "宋体"}},
+        "heading1": "Title",
+    }
+    body = markdown_to_ast("# 标题\n\n正文**加粗**", style_map=style_map)["document"]["body"]
+    assert body[0]["style"] == "Title"
+    assert body[1]["paragraph_format"] == {"indent_first_line": 420}
+    assert body[1]["content"] == [
+        {"type": "Text", "text": "正文", "overrides": {"font_east_asia": "宋体"}},
+        {"type": "Text", "text": "加粗", "overrides": {"font_east_asia": "宋体", "bold": True}},
+    ]
+
+
+def test_markdown_missing_image_is_reported(tmp_path: Path):
+    with pytest.raises(FileNotFoundError, match="missing.png"):
+        markdown_to_ast("![图](missing.png)", base_dir=tmp_path)
@@ -0,0 +1,110 @@
+"""Tests for the typed __slots__ AST node layer."""
+import copy
+import json
+import tracemalloc
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from benchmarks import generate_docx
+from word_ast import merge_ai_edits, parse_docx, render_ast, to_ai_view
+from word_ast.nodes import (
+    Cell,
+    Paragraph,
+    Row,
+    Table,
+    Text,
+    ast_from_dict,
+    ast_to_dict,
+    from_dict,
+    json_default,
+)
+
+
+@pytest.fixture(scope="module")
+def sample_docx(tmp_path_factory) -> Path:
+    path = tmp_path_factory.mktemp("nodes") / "sample.docx"
+    return generate_docx(path, paragraphs=30, tables=2, table_rows=4, images=1, toc=True)
+
+
+def _document_xml(path: Path) -> bytes:
+    with zipfile.ZipFile(path) as zf:
+        return zf.read("word/document.xml")
+
+
+def test_roundtrip_is_lossless(sample_docx: Path):
+    ast = parse_docx(sample_docx)
+    typed = parse_docx(sample_docx, typed=True)
+    body = typed["document"]["body"]
+    assert {type(b) for b in body} >= {Paragraph, Table}
+    table = next(b for b in body if isinstance(b, Table))
+    assert isinstance(table["rows"][0], Row)
+    assert isinstance(table["rows"][0]["cells"][0], Cell)
+    assert isinstance(table["rows"][0]["cells"][0]["content"][0], Paragraph)
+
+    assert typed == ast
+    assert ast_to_dict(typed) == ast
+    assert ast_from_dict(ast) == ast
+    assert json.dumps(typed, ensure_ascii=False, indent=2, default=json_default) == json.dumps(
+        ast, ensure_ascii=False, indent=2
+    )
+
+
+def test_mapping_interface_and_unknown_keys():
+    node = from_dict({"type": "Text", "text": "a", "extra": [1]})
+    assert isinstance(node, Text)
+    assert list(node) == ["type", "text", "extra"]
+    assert node.get("overrides") is None and "overrides" not in node
+    node.setdefault("overrides", {})["bold"] = True
+    assert node["overrides"] == {"bold": True}
+    del node["overrides"]
+    assert node.to_dict() == {"type": "Text", "text": "a", "extra": [1]}
+    with pytest.raises(ValueError):
+        node["type"] = "InlineImage"
+    with pytest.raises(KeyError):
+        del node["overrides"]
+
+    clone = copy.deepcopy(node)
+    clone["extra"].append(2)
+    assert node["extra"] == [1]
+    # Unknown node types pass through untouched
+    assert from_dict({"type": "Chart", "x": 1}) == {"type": "Chart", "x": 1}
+
+
+def test_typed_ast_through_view_merge_render(sample_docx: Path, tmp_path: Path):
+    ast = parse_docx(sample_docx)
+    typed = parse_docx(sample_docx, typed=True)
+    assert to_ai_view(typed) == to_ai_view(ast)
+
+    view = to_ai_view(ast)
+    first = next(b for b in view["document"]["body"] if b["type"] == "Paragraph" and b["content"])
+    first["content"][0]["text"] = "EDITED"
+    first["content"][0].setdefault("overrides", {})["italic"] = True
+
+    merged_typed = merge_ai_edits(typed, view)
+    assert isinstance(merged_typed["document"]["body"][1], Paragraph)
+    assert merged_typed == merge_ai_edits(ast, view)
+    assert typed == ast  # input left untouched
+
+    render_ast(merged_typed, tmp_path / "typed.docx")
+    render_ast(merge_ai_edits(ast, view), tmp_path / "dict.docx")
+    assert _document_xml(tmp_path / "typed.docx") == _document_xml(tmp_path / "dict.docx")
+
+
+def test_typed_body_uses_less_memory(sample_docx: Path):
+    text = json.dumps(parse_docx(sample_docx))
+
+    def _traced(build):
+        tracemalloc.start()
+        try:
+            obj = build()
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return obj, size
+
+    _, dict_bytes = _traced(lambda: json.loads(text))
+    _, typed_bytes = _traced(lambda: ast_from_dict(json.loads(text)))
+    # The intermediate dicts are freed once ast_from_dict returns
+    assert typed_bytes < dict_bytes * 0.75
@@ -91,3 +91,104 @@ def test_parse_does_not_merge_runs_with_different_styles(tmp_path: Path):
     ast = parse_docx(path)
     content = ast["document"]["body"][0]["content"]
     assert len(content) == 2
+
+
+def test_lazy_document_parses_on_demand(tmp_path: Path):
+    from benchmarks import generate_docx
+    from word_ast import instrumentation, merge_ai_edits, render_ast, to_ai_view
+    from word_ast.parser import LazyDocument
+
+    path = generate_docx(tmp_path / "lazy.docx", paragraphs=30, tables=2, table_rows=3, images=1, toc=True)
+    ast = parse_docx(path)
+    by_id = {b["id"]: b for b in ast["document"]["body"]}
+
+    doc = LazyDocument(path, cache_size=4)
+    assert doc.block_ids == list(by_id)
+    assert "p12" in doc and "p999" not in doc
+    with instrumentation.record() as rec:
+        assert doc.get_block("p12") == by_id["p12"]
+        assert doc.get_block("t1") == by_id["t1"]
+        assert doc.get_block("p12") == by_id["p12"]
+    assert rec.counters["parsed_blocks"] == 2
+    assert rec.counters["cache_hits"] == 1
+
+    # Re-parsing after LRU eviction gives the same blocks: parsing never
+    # modifies the underlying document
+    assert doc.load() == ast
+    assert doc.load() == ast
+
+    view = to_ai_view(ast)
+    merged = merge_ai_edits(doc, view)
+    render_ast(merged, tmp_path / "out.docx")
+    assert (tmp_path / "out.docx").stat().st_size > 0
+
+
+def test_selective_parse_modes(tmp_path: Path):
+    from benchmarks import generate_docx
+    from word_ast.parser import iter_parse_docx
+
+    path = generate_docx(tmp_path / "modes.docx", paragraphs=20, tables=1, table_rows=3, images=2, toc=True)
+    full = parse_docx(path)
+    body = full["document"]["body"]
+
+    ranged = parse_docx(path, block_range=(5, 9))
+    assert ranged["document"]["body"] == body[5:9]
+    _, blocks = iter_parse_docx(path, block_range=(len(body) - 2, None))
+    assert list(blocks) == body[-2:]
+
+    def _keys(obj):
+        if isinstance(obj, dict):
+            return set(obj) | {k for v in obj.values() for k in _keys(v)}
+        if isinstance(obj, list):
+            return {k for v in obj for k in _keys(v)}
+        return set()
+
+    no_raw = parse_docx(path, raw=False)["document"]["body"]
+    assert not {k for k in _keys(no_raw) if k.startswith("_raw_")}
+    assert [b["id"] for b in no_raw] == [b["id"] for b in body]
+
+    no_images = parse_docx(path, images=False)["document"]["body"]
+    images = [i for b in no_images if b["type"] == "Paragraph" for i in b["content"] if i["type"] == "InlineImage"]
+    assert len(images) == 2 and all("data" not in i and i["width"] for i in images)
+
+    text = parse_docx(path, text_only=True)["document"]["body"]
+    for full_block, text_block in zip(body, text):
+        assert text_block["id"] == full_block["id"]
+        if full_block["type"] == "Paragraph":
+            expected = "".join(i.get("text", "") for i in full_block["content"])
+            assert "".join(i["text"] for i in text_block["content"]) == expected
+            assert set(text_block) == {"id", "type", "content"}
+    table = next(b for b in text if b["type"] == "Table")
+    assert table["rows"][0]["cells"][0]["col_span"] == 2
+
+
+def test_extract_text_matches_text_only_parse(tmp_path: Path):
+    from benchmarks import generate_docx
+    from word_ast import extract_text
+
+    path = generate_docx(tmp_path / "extract.docx", paragraphs=20, tables=2, table_rows=3, images=1, toc=True)
+    expected = []
+    for block in parse_docx(path, text_only=True)["document"]["body"]:
+        if block["type"] == "Paragraph":
+            expected.append((block["id"], "".join(i["text"] for i in block["content"])))
+        elif block["type"] == "Table":
+            for row in block["rows"]:
+                for cell in row["cells"]:
+                    texts = ["".join(i["text"] for i in p["content"]) for p in cell["content"]]
+                    expected.append((cell["id"], "\n".join(texts)))
+        elif block["type"] == "TOC" and block.get("title"):
+            title = block["title"]
+            expected.append((title["id"], "".join(i["text"] for i in title["content"])))
+    assert list(extract_text(path)) == expected
+    assert any(block_id.startswith("toc") for block_id, _ in expected)
+
+
+def test_parallel_parse_matches_serial(tmp_path: Path):
+    from benchmarks import generate_docx
+
+    path = generate_docx(tmp_path / "parallel.docx", paragraphs=30, tables=2, table_rows=3, images=2, toc=True)
+    serial = parse_docx(path)
+    assert parse_docx(path, workers=2) == serial
+    body = serial["document"]["body"]
+    ranged = parse_docx(path, workers=2, block_range=(3, 20))
+    assert ranged["document"]["body"] == body[3:20]
@@ -3,6 +3,7 @@ import io
 import zipfile
 from pathlib import Path
 
+import pytest
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml import OxmlElement
@@ -1524,3 +1525,83 @@ def test_roundtrip_style_inherited_indentation(tmp_path: Path):
     ind_out = raw_pPr.find(qn("w:ind"))
     assert ind_out is not None, "<w:ind> must be restored after round-trip"
     assert ind_out.get(qn("w:left")) == "720"
+
+
+def test_parallel_render_is_identical_to_serial(tmp_path: Path):
+    from benchmarks import generate_docx
+    from word_ast.parser import LazyDocument
+
+    src = generate_docx(tmp_path / "src.docx", paragraphs=40, tables=2, table_rows=3, images=3, toc=True)
+    ast = parse_docx(src)
+    render_ast(ast, tmp_path / "serial.docx")
+    render_ast(ast, tmp_path / "parallel.docx", workers=2)
+    render_ast(LazyDocument(src), tmp_path / "lazy.docx", workers=2)
+
+    serial = zipfile.ZipFile(tmp_path / "serial.docx")
+    for name in ("parallel.docx", "lazy.docx"):
+        other = zipfile.ZipFile(tmp_path / name)
+        assert other.namelist() == serial.namelist()
+        for part in serial.namelist():
+            assert other.read(part) == serial.read(part), part
+
+
+def test_streaming_render_writes_same_parts(tmp_path: Path):
+    from benchmarks import generate_docx
+    from word_ast.renderer.document_renderer import _new_document, _render_block
+    from word_ast.renderer.streaming import StreamingDocxWriter
+
+    src = generate_docx(tmp_path / "src.docx", paragraphs=30, tables=2, table_rows=3, images=3, toc=True)
+    ast = parse_docx(src)
+    render_ast(ast, tmp_path / "serial.docx")
+    render_ast(ast, tmp_path / "streaming.docx", streaming=True)
+
+    serial = zipfile.ZipFile(tmp_path / "serial.docx")
+    streamed = zipfile.ZipFile(tmp_path / "streaming.docx")
+    assert sorted(streamed.namelist()) == sorted(serial.namelist())
+    for part in serial.namelist():
+        assert streamed.read(part) == serial.read(part), part
+
+    # Flushed blocks leave the tree: the body never holds more than one batch
+    doc = _new_document(ast)
+    sizes = []
+    with StreamingDocxWriter(doc, tmp_path / "batched.docx", flush_every=5) as writer:
+        for block in ast["document"]["body"]:
+            _render_block(doc, block, ast["document"]["styles"])
+            sizes.append(len(doc.element.body))
+            writer.block_done()
+    assert max(sizes) <= 6
+    assert zipfile.ZipFile(tmp_path / "batched.docx").read("word/document.xml") == serial.read("word/document.xml")
+
+    # A failure mid-render leaves no partial package behind
+    doc = _new_document(ast)
+    with pytest.raises(RuntimeError):
+        with StreamingDocxWriter(doc, tmp_path / "failed.docx", flush_every=5) as writer:
+            for block in ast["document"]["body"][:12]:
+                _render_block(doc, block, ast["document"]["styles"])
+                writer.block_done()
+            raise RuntimeError("render failed")
+    assert sorted(p.name for p in tmp_path.iterdir() if "failed" in p.name) == []
+
+
+def test_pipeline_roundtrip_matches_two_phase(tmp_path: Path):
+    from benchmarks import generate_docx
+    from word_ast.pipeline import roundtrip_docx
+
+    src = generate_docx(tmp_path / "src.docx", paragraphs=30, tables=2, table_rows=3, images=2, toc=True)
+    ast = parse_docx(src)
+    render_ast(ast, tmp_path / "two_phase.docx")
+    expected = zipfile.ZipFile(tmp_path / "two_phase.docx").read("word/document.xml")
+
+    stats = roundtrip_docx(src, tmp_path / "thread.docx", queue_size=1, flush_every=4)
+    assert stats.blocks == len(ast["document"]["body"])
+    assert stats.max_queue_depth <= 1
+    assert zipfile.ZipFile(tmp_path / "thread.docx").read("word/document.xml") == expected
+
+    roundtrip_docx(src, tmp_path / "process.docx", process=True)
+    assert zipfile.ZipFile(tmp_path / "process.docx").read("word/document.xml") == expected
+
+    def _drop_tables(block):
+        return None if block["type"] == "Table" else block
+
+    stats = roundtrip_docx(src, tmp_path / "filtered.docx", transform=_drop_tables)
+    assert stats.blocks == sum(1 for b in ast["document"]["body"] if b["type"] != "Table")
@@ -0,0 +1,80 @@
+"""Tests for the pluggable full-AST serializers."""
+import json
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from benchmarks import benchmark_serializers, generate_docx
+from word_ast import parse_docx, render_ast
+from word_ast.export import export_docx
+from word_ast.serializers import (
+    SERIALIZERS,
+    detect_format,
+    dump_ast,
+    load_ast,
+    serializer_for_path,
+)
+
+
+@pytest.fixture(scope="module")
+def sample(tmp_path_factory) -> tuple[Path, dict]:
+    path = tmp_path_factory.mktemp("serializers") / "sample.docx"
+    generate_docx(path, paragraphs=20, tables=1, table_rows=3, images=1, toc=True)
+    return path, parse_docx(path)
+
+
+@pytest.mark.parametrize("name", list(SERIALIZERS))
+def test_roundtrip_and_detection(sample, tmp_path: Path, name: str):
+    _, ast = sample
+    path = tmp_path / f"ast{SERIALIZERS[name].suffix}"
+    size = dump_ast(ast, path, name)
+    assert size == path.stat().st_size
+    assert load_ast(path) == ast
+    expected = "json" if name == "json-compact" else name
+    assert detect_format(path) == expected
+
+
+def test_compressed_formats_are_smaller(sample, tmp_path: Path):
+    _, ast = sample
+    sizes = {name: dump_ast(ast, tmp_path / f"{name}.bin", name) for name in SERIALIZERS}
+    assert sizes["json-compact"] < sizes["json"]
+    assert sizes["gzip"] < sizes["json-compact"] / 5
+    assert sizes["lzma"] < sizes["json-compact"] / 5
+
+
+def test_serializer_for_path():
+    assert serializer_for_path("a.full_ast.json.gz").name == "gzip"
+    assert serializer_for_path("a.full_ast.json.xz").name == "lzma"
+    assert serializer_for_path("a.full_ast.json").name == "json"
+
+
+def test_parse_docx_output_dir_format(sample, tmp_path: Path):
+    docx, ast = sample
+    parse_docx(docx, tmp_path, format="gzip")
+    assert load_ast(tmp_path / "document.ast.json.gz") == ast
+
+
+def test_export_and_render_compressed(sample, tmp_path: Path):
+    docx, ast = sample
+    full_path = tmp_path / "full.json.xz"
+    export_docx(docx, full_path, tmp_path / "view.json")
+    assert detect_format(full_path) == "lzma"
+    assert load_ast(full_path) == ast
+    # The streaming writer produces exactly the compact JSON text
+    assert json.dumps(ast, ensure_ascii=False, separators=(",", ":")) == (
+        SERIALIZERS["lzma"].open(full_path).read()
+    )
+
+    render_ast(full_path, tmp_path / "from_xz.docx")
+    render_ast(ast, tmp_path / "from_dict.docx")
+    with zipfile.ZipFile(tmp_path / "from_xz.docx") as a, zipfile.ZipFile(tmp_path / "from_dict.docx") as b:
+        assert a.read("word/document.xml") == b.read("word/document.xml")
+
+
+def test_benchmark_serializers(sample, tmp_path: Path):
+    _, ast = sample
+    results = benchmark_serializers(ast, formats=("json", "gzip"), repeat=1, workdir=tmp_path)
+    assert results["json"]["ratio"] == 1.0
+    assert results["gzip"]["ratio"] < 1.0
+    assert results["gzip"]["load_seconds"] > 0
@@ -0,0 +1,232 @@
+"""Tests for the AST storage backends."""
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from benchmarks import generate_docx
+from word_ast import merge_ai_edits, parse_docx, render_ast, to_ai_view
+from word_ast.ai_merge import LazyMergedAST
+from word_ast.storage.jsonl import JsonlAST, index_path_for, is_jsonl_ast, write_jsonl_ast
+from word_ast.storage.sqlite_store import SQLiteStore
+from word_ast.storage.versions import VersionStore
+
+
+@pytest.fixture(scope="module")
+def sample_ast(tmp_path_factory) -> dict:
+    path = tmp_path_factory.mktemp("storage") / "sample.docx"
+    generate_docx(path, paragraphs=20, tables=2, table_rows=3, images=1, toc=True)
+    return parse_docx(path)
+
+
+def _edited_view(ast: dict) -> dict:
+    view = to_ai_view(ast)
+    for block in view["document"]["body"]:
+        if block["type"] == "Paragraph" and block["content"]:
+            block["content"][0]["text"] = "EDITED"
+            block["content"][0].setdefault("overrides", {})["bold"] = True
+            break
+    return view
+
+
+def _document_xml(path: Path) -> bytes:
+    with zipfile.ZipFile(path) as zf:
+        return zf.read("word/document.xml")
+
+
+# ---------------------------------------------------------------------------
+# JSONL full AST
+# ---------------------------------------------------------------------------
+
+def test_jsonl_roundtrip_and_random_access(sample_ast: dict, tmp_path: Path):
+    path = tmp_path / "doc.full_ast.jsonl"
+    count = write_jsonl_ast(sample_ast, path)
+    body = sample_ast["document"]["body"]
+    assert count == len(body)
+    assert is_jsonl_ast(path)
+    assert index_path_for(path).exists()
+
+    lazy = JsonlAST(path)
+    assert len(lazy) == len(body)
+    assert lazy.block_ids == [b["id"] for b in body]
+    assert lazy.load() == sample_ast
+    last = body[-1]
+    assert lazy.get_block(last["id"]) == last
+    assert lazy.get_blocks([last["id"], body[0]["id"]]) == [last, body[0]]
+    with pytest.raises(KeyError):
+        lazy.get_block("missing")
+
+
+def test_jsonl_rebuilds_missing_or_stale_index(sample_ast: dict, tmp_path: Path):
+    path = tmp_path / "doc.jsonl"
+    write_jsonl_ast(sample_ast, path)
+    index_path_for(path).unlink()
+    assert JsonlAST(path).block_ids == [b["id"] for b in sample_ast["document"]["body"]]
+    assert index_path_for(path).exists()
+
+    truncated = dict(sample_ast, document=dict(sample_ast["document"], body=sample_ast["document"]["body"][:3]))
+    write_jsonl_ast(truncated, path)
+    index_path_for(path).write_text('{"version": 1, "size": 0, "offsets": {}, "count": 0}')
+    assert len(JsonlAST(path)) == 3
+
+
+def test_jsonl_lazy_merge_and_render_match_dict_path(sample_ast: dict, tmp_path: Path):
+    path = tmp_path / "doc.jsonl"
+    write_jsonl_ast(sample_ast, path)
+    view = _edited_view(sample_ast)
+
+    merged_lazy = merge_ai_edits(JsonlAST(path), view)
+    assert isinstance(merged_lazy, LazyMergedAST)
+    merged = merge_ai_edits(sample_ast, view)
+    assert merged_lazy.load() == merged
+
+    render_ast(merged, tmp_path / "dict.docx")
+    render_ast(merge_ai_edits(JsonlAST(path), view), tmp_path / "lazy.docx")
+    render_ast(path, tmp_path / "path.docx")
+    assert _document_xml(tmp_path / "dict.docx") == _document_xml(tmp_path / "lazy.docx")
+    render_ast(sample_ast, tmp_path / "plain.docx")
+    assert _document_xml(tmp_path / "plain.docx") == _document_xml(tmp_path / "path.docx")
+
+
+# ---------------------------------------------------------------------------
+# SQLite store
+# ---------------------------------------------------------------------------
+
+def test_merge_ai_edits_rejects_non_ast_input(sample_ast: dict, tmp_path: Path):
+    path = tmp_path / "doc.jsonl"
+    write_jsonl_ast(sample_ast, path)
+    view = _edited_view(sample_ast)
+    with pytest.raises(TypeError):
+        merge_ai_edits(path, view)
+    with pytest.raises(TypeError):
+        merge_ai_edits([sample_ast], view)
+
+
+def test_sqlite_store_roundtrip_and_queries(sample_ast: dict, tmp_path: Path):
+    with SQLiteStore(tmp_path / "corpus.db") as store:
+        doc_id = store.add_document(sample_ast, "sample")
+        assert store.load_ast(doc_id) == sample_ast
+
+        body = sample_ast["document"]["body"]
+        tables = store.load_blocks(doc_id, type="Table")
+        assert [b["id"] for b in tables] == [b["id"] for b in body if b["type"] == "Table"]
+        picked = store.load_blocks(doc_id, [body[5]["id"], body[1]["id"]])
+        assert picked == [body[5], body[1]]
+
+        headings = list(store.find_blocks(style="Heading1"))
+        assert headings and all(block["style"] == "Heading1" for _, block in headings)
+
+        word = body[1]["content"][0]["text"].split()[0]
+        assert any(pid == body[1]["id"] for _, pid, _ in store.search_text(word))
+
+        # Identical raw XML across runs is stored once
+        raw_rows = store.conn.execute("SELECT COUNT(*) FROM raw_xml").fetchone()[0]
+        raw_values = set()
+
+        def _collect(obj):
+            if isinstance(obj, dict):
+                for k, v in obj.items():
+                    if k.startswith("_raw_"):
+                        raw_values.add(v)
+                    else:
+                        _collect(v)
+            elif isinstance(obj, list):
+                for v in obj:
+                    _collect(v)
+
+        _collect(body)
+        assert raw_rows == len(raw_values)
+
+
+def test_sqlite_store_bulk_insert_and_render(sample_ast: dict, tmp_path: Path):
+    with SQLiteStore(":memory:") as store:
+        ids = store.add_documents(((f"doc{i}", sample_ast) for i in range(20)), batch_size=7)
+        assert len(ids) == 20
+        assert [name for _, name, _ in store.documents()] == [f"doc{i}" for i in range(20)]
+
+        view = _edited_view(sample_ast)
+        stored = store.document(ids[-1])
+        assert stored.load() == sample_ast
+        render_ast(merge_ai_edits(stored, view), tmp_path / "db.docx")
+        render_ast(merge_ai_edits(sample_ast, view), tmp_path / "dict.docx")
+        assert _document_xml(tmp_path / "db.docx") == _document_xml(tmp_path / "dict.docx")
+
+        store.delete_document(ids[0])
+        assert len(store.documents()) == 19
+        assert store.conn.execute(
+            "SELECT COUNT(*) FROM blocks WHERE doc_id = ?", (ids[0],)
+        ).fetchone()[0] == 0
+
+
+def test_sqlite_store_failed_batch_then_add_and_delete(sample_ast: dict):
+    def _pool_rows(store: SQLiteStore) -> tuple[int, int]:
+        return tuple(store.conn.execute(
+            f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ("raw_xml", "media"))
+
+    with SQLiteStore(":memory:") as store:
+        bad = {"document": {"body": [None]}}
+        with pytest.raises(AttributeError):
+            store.add_documents([sample_ast, bad])
+        assert store.documents() == [] and _pool_rows(store) == (0, 0)
+        # Pool ids cached during the rolled-back batch must not be reused
+        doc_id = store.add_document(sample_ast)
+        assert store.load_ast(doc_id) == sample_ast
+
+        other = store.add_document(sample_ast)
+        pooled = _pool_rows(store)
+        assert pooled[0] > 0
+        store.delete_document(doc_id)
+        assert _pool_rows(store) == pooled  # still referenced by the other copy
+        store.delete_document(other)
+        assert _pool_rows(store) == (0, 0)
+        assert store.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 0
+        doc_id = store.add_document(sample_ast)
+        assert store.load_ast(doc_id) == sample_ast
+
+
+# ---------------------------------------------------------------------------
+# Version store
+# ---------------------------------------------------------------------------
+
+def test_version_store_dedups_blocks_across_versions(sample_ast: dict, tmp_path: Path):
+    store = VersionStore(tmp_path / "versions")
+    assert store.head is None
+    v1 = store.commit(sample_ast, "original")
+    size_v1 = store.storage_bytes()
+
+    view = _edited_view(sample_ast)
+    v2 = store.commit_ai_edits(view, "turn 1")
+    assert store.versions() == [v1, v2]
+    assert [e["message"] for e in store.log()] == ["original", "turn 1"]
+
+    # Only the edited block (plus the tiny version record) is new
+    edited = store.checkout(v2)
+    changed = [
+        b["id"] for b, o in zip(edited["document"]["body"], sample_ast["document"]["body"]) if b != o
+    ]
+    assert len(changed) == 1
+    assert store.diff(v1, v2) == {
+        "added": [], "removed": [], "changed": changed, "header_changed": False,
+    }
+    assert store.storage_bytes() - size_v1 < size_v1 / 4
+
+    # Committing an identical AST adds no objects at all
+    objects = sum(1 for _ in (tmp_path / "versions" / "objects").rglob("*.json"))
+    store.commit(edited, "no-op")
+    assert sum(1 for _ in (tmp_path / "versions" / "objects").rglob("*.json")) == objects
+
+    assert store.checkout(v1) == sample_ast
+    assert edited == merge_ai_edits(sample_ast, view)
+
+
+def test_version_store_render_matches_dict_path(sample_ast: dict, tmp_path: Path):
+    store = VersionStore(tmp_path / "versions")
+    store.commit(sample_ast)
+    v2 = store.commit_ai_edits(_edited_view(sample_ast))
+
+    reopened = VersionStore(tmp_path / "versions")
+    reopened.render(v2, tmp_path / "v2.docx")
+    render_ast(merge_ai_edits(sample_ast, _edited_view(sample_ast)), tmp_path / "dict.docx")
+    assert _document_xml(tmp_path / "v2.docx") == _document_xml(tmp_path / "dict.docx")
+    with pytest.raises(KeyError):
+        reopened.checkout(99)
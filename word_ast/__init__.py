@@ -1,6 +1,12 @@
 from .parser.document_parser import parse_docx
+from .parser.text_extractor import extract_text
 from .renderer.document_renderer import render_ast
 from .ai_view import to_ai_view
 from .ai_merge import merge_ai_edits
+from .compact_view import compact_ai_view, expand_ai_view
+from .text_view import parse_text_view, to_text_view
+from .markdown_import import markdown_to_ast
 
-__all__ = ["parse_docx", "render_ast", "to_ai_view", "merge_ai_edits"]
+__all__ = ["parse_docx", "render_ast", "to_ai_view", "merge_ai_edits", "extract_text",
+           "compact_ai_view", "expand_ai_view", "to_text_view", "parse_text_view",
+           "markdown_to_ast"]
@@ -15,12 +15,15 @@ Renderer can preserve both round-trip fidelity and AI-requested edits.
 Block matching is by ``id``; run matching is positional.
 """
 import copy
+from collections.abc import Mapping
 
 from lxml import etree
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 from docx.oxml.parser import parse_xml
 
+from word_ast import instrumentation
+
 # Alignment: AST semantic value → OOXML <w:jc w:val="..."/>
 _ALIGN_TO_JC: dict[str, str] = {
     "left": "left",
@@ -43,7 +46,7 @@ _PPR_FIELDS = (
 _RPR_FIELDS = ("font_ascii", "font_east_asia", "size", "bold", "italic", "color")
 
 
-def merge_ai_edits(original_ast: dict, ai_ast: dict) -> dict:
+def merge_ai_edits(original_ast, ai_ast: dict) -> "dict | LazyMergedAST":
     """将 AI 修改的 ai_ast 合并回含 _raw_* 的 original_ast。
 
     Merges the AI-modified *ai_ast* into the full *original_ast* that
@@ -53,29 +56,109 @@ def merge_ai_edits(original_ast: dict, ai_ast: dict) -> dict:
 
     Block matching is by the ``id`` key; run (content item) matching is
     positional within each paragraph's ``content`` list.
+
+    *original_ast* may also be a lazy AST — any object with a ``header``
+    skeleton and an ``iter_blocks()`` method, such as
+    :class:`word_ast.storage.jsonl.JsonlAST`.  The result is then a
+    :class:`LazyMergedAST` that merges blocks as they are streamed instead
+    of copying the whole document.  Body blocks may be typed nodes
+    (:mod:`word_ast.nodes`); they stay typed in the result.  Any other
+    type raises :class:`TypeError`.
     """
+    if isinstance(original_ast, dict):
+        with instrumentation.span("merge_ai_edits"):
+            return _merge_ai_edits(original_ast, ai_ast)
+    if hasattr(original_ast, "iter_blocks"):
+        return LazyMergedAST(original_ast, ai_ast)
+    raise TypeError(
+        "merge_ai_edits expects a dict AST or a lazy AST with iter_blocks(), "
+        f"got {type(original_ast).__name__}"
+    )
+
+
+def _merge_ai_edits(original_ast: dict, ai_ast: dict) -> dict:
     result = copy.deepcopy(original_ast)
-
-    ai_body = ai_ast.get("document", {}).get("body", [])
-    ai_by_id = {
-        b["id"]: b
-        for b in ai_body
-        if isinstance(b, dict) and "id" in b
-    }
+    ai_by_id = _ai_blocks_by_id(ai_ast)
 
     for orig_block in result.get("document", {}).get("body", []):
-        if not isinstance(orig_block, dict):
+        if not isinstance(orig_block, Mapping):
             continue
         block_id = orig_block.get("id")
         if block_id not in ai_by_id:
             continue
-        ai_block = ai_by_id[block_id]
-        if orig_block.get("type") == "Paragraph":
-            _merge_paragraph_block(orig_block, ai_block)
+        merge_block(orig_block, ai_by_id[block_id])
 
     return result
 
 
+def _ai_blocks_by_id(ai_ast: dict) -> dict:
+    ai_body = ai_ast.get("document", {}).get("body", [])
+    return {
+        b["id"]: b
+        for b in ai_body
+        if isinstance(b, Mapping) and "id" in b
+    }
+
+
+def merge_block(orig_block: dict, ai_block: dict) -> dict:
+    """将单个 AI block 合并进 orig_block（原地修改并返回 orig_block）。
+
+    Merges one AI-modified block into *orig_block* in place and returns it.
+    Only ``Paragraph`` blocks carry mergeable edits; other block types are
+    returned unchanged.
+    """
+    if orig_block.get("type") == "Paragraph":
+        _merge_paragraph_block(orig_block, ai_block)
+    return orig_block
+
+
+class LazyMergedAST:
+    """惰性合并结果：按需从原始 lazy AST 流式读取并合并 block。
+
+    Lazy result of :func:`merge_ai_edits` over a lazy source.  Blocks are
+    pulled from *source* on iteration; only the blocks the AI returned are
+    copied and merged, all others are passed through as loaded.  The object
+    satisfies the same lazy-AST protocol (``header``/``iter_blocks()``), so
+    it can be handed straight to ``render_ast``.
+    """
+
+    def __init__(self, source, ai_ast: dict):
+        self.source = source
+        self._ai_by_id = _ai_blocks_by_id(ai_ast)
+
+    @property
+    def header(self) -> dict:
+        return self.source.header
+
+    @property
+    def touched_ids(self) -> list[str]:
+        """AI 视图中出现的 block id（按 AI 返回顺序）。"""
+        return list(self._ai_by_id)
+
+    def _merged(self, block: dict) -> dict:
+        ai_block = self._ai_by_id.get(block.get("id"))
+        if ai_block is None:
+            return block
+        with instrumentation.span("merge_ai_edits", block_id=block.get("id")):
+            return merge_block(copy.deepcopy(block), ai_block)
+
+    def iter_blocks(self):
+        for block in self.source.iter_blocks():
+            yield self._merged(block) if isinstance(block, Mapping) else block
+
+    def get_block(self, block_id: str) -> dict:
+        """随机访问单个 block（需要 source 支持 ``get_block``）。"""
+        return self._merged(self.source.get_block(block_id))
+
+    def load(self) -> dict:
+        """物化为普通 dict AST。"""
+        ast = copy.deepcopy(self.header)
+        ast["document"]["body"] = list(self.iter_blocks())
+        return ast
+
+    to_dict = load
+
+
 def _merge_paragraph_block(orig_block: dict, ai_block: dict) -> None:
     """合并 AI 对段落块的修改，原地更新 orig_block。
 
@@ -142,7 +225,8 @@ def _merge_paragraph_format(orig_fmt: dict, ai_fmt: dict) -> dict:
 
     # Sync changes into _raw_pPr XML
     if "_raw_pPr" in result:
-        updated_xml = _apply_pPr_changes(result["_raw_pPr"], changed)
+        with instrumentation.span("merge.xml_sync", field="_raw_pPr"):
+            updated_xml = _apply_pPr_changes(result["_raw_pPr"], changed)
         if updated_xml is None:
             # XML parse failure — drop _raw_pPr; Renderer will use structural fields
             del result["_raw_pPr"]
@@ -176,7 +260,8 @@ def _merge_run_overrides(orig_ov: dict, ai_ov: dict) -> dict:
 
     # Sync changes into _raw_rPr XML
     if "_raw_rPr" in result:
-        updated_xml = _apply_rPr_changes(result["_raw_rPr"], changed)
+        with instrumentation.span("merge.xml_sync", field="_raw_rPr"):
+            updated_xml = _apply_rPr_changes(result["_raw_rPr"], changed)
         if updated_xml is None:
             del result["_raw_rPr"]
         else:
@@ -196,6 +281,7 @@ def _apply_pPr_changes(raw_pPr: str, changes: dict) -> str | None:
     ``_raw_pPr`` XML string.  Returns the updated XML string, or ``None``
     if the input XML cannot be parsed (caller should then drop ``_raw_pPr``).
     """
+    instrumentation.incr("raw_xml_parses")
     try:
         pPr_el = parse_xml(raw_pPr)
     except Exception:
@@ -270,6 +356,7 @@ def _apply_rPr_changes(raw_rPr: str, changes: dict) -> str | None:
     ``_raw_rPr`` XML string.  Returns the updated XML string, or ``None``
     if the input XML cannot be parsed.
     """
+    instrumentation.incr("raw_xml_parses")
     try:
         rPr_el = parse_xml(raw_rPr)
     except Exception:
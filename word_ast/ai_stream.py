@@ -0,0 +1,330 @@
+"""流式 AI 输出消费：边接收 LLM 文本边解析 AI 视图，逐块合并并渲染。
+
+Streaming consumer for LLM output in the AI-view format.
+
+An LLM streams its answer token by token, but ``json.loads`` needs the
+whole response.  :class:`AIViewStreamReader` is an incremental reader for
+the AI-view layout (``{"schema_version": ..., "document": {"meta": ...,
+"styles": ..., "body": [...]}}``): :meth:`~AIViewStreamReader.feed` takes
+text chunks as they arrive and returns every body block whose closing
+brace has been seen, each decoded with ``json.loads``.  Only the text of
+the block in progress — kept as a list of chunks and joined once when the
+block closes — and the small non-body header are buffered.  Text
+before the first ``{`` and after the closing ``}`` (chat preamble, code
+fences) is ignored.
+
+:func:`render_ai_stream` feeds those blocks straight into a merge and the
+streaming docx writer, so rendering runs while the model is still
+generating and the output is complete moments after the last token:
+
+- **edit mode** (*full_ast* given) — each AI block is merged into the
+  original block with the same id (:func:`~word_ast.ai_merge.merge_block`);
+  original blocks the AI skipped are passed through unchanged.  AI blocks
+  must arrive in document order, as they do in an exported AI view;
+  a block that arrives after a later block was already rendered raises
+  :class:`ValueError`.
+- **create mode** — the AI view is the document; the header keys that
+  precede ``"body"`` (``meta``, ``styles``) set up the document.
+
+Compact views (:mod:`word_ast.compact_view`) are expanded block by block;
+their ``compact`` header must precede ``"body"``, as it does in
+:func:`~word_ast.compact_view.compact_ai_view` output.
+
+The result is identical to ``render_ast(merge_ai_edits(full_ast, view))``.
+"""
+import copy
+import itertools
+import json
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+
+from word_ast import instrumentation
+from word_ast.ai_merge import merge_block
+from word_ast.compact_view import COMPACT_KEY, expand_block, expand_header, is_compact
+from word_ast.renderer.document_renderer import _new_document, _render_block, _resolve_ast
+from word_ast.renderer.streaming import StreamingDocxWriter
+
+# Characters that change the scanner state outside / inside a string
+_STRUCTURAL = re.compile(r'["{}\[\]]')
+_IN_STRING = re.compile(r'["\\]')
+# Object key immediately before a container opening, e.g. "body":
+_KEY_BEFORE = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*$')
+_KEY_LOOKBEHIND = 256
+
+# Container path of the body array: root object → "document" → "body"
+_BODY_DEPTH = 3
+
+
+class AIViewStreamReader:
+    """AI 视图的增量 JSON 读取器。
+
+    Call :meth:`feed` with each text chunk; it returns the body blocks
+    completed by that chunk.  :attr:`header` holds the document skeleton
+    (with an empty body) as soon as the ``"body"`` array opens;
+    :meth:`close` checks the JSON is complete and returns the final
+    skeleton, including keys that followed the body.
+    """
+
+    def __init__(self):
+        # Text outside body blocks (the header), scanned from _pos
+        self._buf = ""
+        self._pos = 0
+        self._in_string = False
+        self._escape = False
+        self._stack: list[tuple[str, str | None]] = []
+        self._started = False
+        self._done = False
+        self._body_open: int | None = None
+        # Chunks of the body block in progress, joined once it closes
+        self._block_parts: list[str] | None = None
+        self.header: dict | None = None
+        self.blocks = 0
+
+    def feed(self, text: str) -> list[dict]:
+        """追加一段文本，返回其中已完整接收的 body block 列表。"""
+        if self._done or not text:
+            return []
+        if not self._started:
+            start = text.find("{")
+            if start < 0:
+                return []
+            text = text[start:]
+            self._started = True
+        completed: list[dict] = []
+        while text and not self._done:
+            if self._block_parts is not None:
+                text = self._scan_block(text, completed)
+            else:
+                text = self._scan_header(text)
+        self.blocks += len(completed)
+        return completed
+
+    def _scan_block(self, text: str, completed: list[dict]) -> str:
+        """扫描 block 内部的文本；block 结束时解码并返回其后剩余的文本。"""
+        pos, stack = 0, self._stack
+        while True:
+            if self._in_string:
+                if self._escape:
+                    if pos >= len(text):  # the escaped char is in the next chunk
+                        break
+                    self._escape = False
+                    pos += 1
+                    continue
+                m = _IN_STRING.search(text, pos)
+                if m is None:
+                    break
+                pos = m.end()
+                if m.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                continue
+            m = _STRUCTURAL.search(text, pos)
+            if m is None:
+                break
+            char = m.group()
+            pos = m.end()
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                stack.append((char, None))
+            else:
+                if stack[-1][0] != ("{" if char == "}" else "["):
+                    raise ValueError(f"malformed AI view JSON: unexpected {char!r}")
+                stack.pop()
+                if len(stack) == _BODY_DEPTH:
+                    self._block_parts.append(text[:pos])
+                    completed.append(json.loads("".join(self._block_parts)))
+                    self._block_parts = None
+                    return text[pos:]
+        self._block_parts.append(text)
+        return ""
+
+    def _scan_header(self, text: str) -> str:
+        """扫描 body block 之外的文本；遇到 block 开始时返回 block 其余的文本。"""
+        buf, pos, stack = self._buf + text, self._pos, self._stack
+        rest = ""
+        while True:
+            if self._in_string:
+                m = _IN_STRING.search(buf, pos)
+                if m is None:
+                    pos = len(buf)
+                    break
+                if m.group() == "\\":
+                    if m.end() >= len(buf):  # the escaped char has not arrived yet
+                        pos = m.start()
+                        break
+                    pos = m.end() + 1
+                    continue
+                self._in_string = False
+                pos = m.end()
+                continue
+            m = _STRUCTURAL.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                break
+            char, idx = m.group(), m.start()
+            pos = idx + 1
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                key = None
+                if stack and stack[-1][0] == "{" and len(stack) < _BODY_DEPTH:
+                    found = _KEY_BEFORE.search(buf, max(0, idx - _KEY_LOOKBEHIND), idx)
+                    key = found.group(1) if found else None
+                stack.append((char, key))
+                if self._in_body(len(stack)):
+                    self._body_open = idx
+                    self.header = self._partial_header(buf[:idx + 1])
+                elif char == "{" and len(stack) == _BODY_DEPTH + 1 and self._in_body(_BODY_DEPTH):
+                    # A body block opens: scan the rest of it in block mode
+                    self._block_parts = ["{"]
+                    buf, rest = buf[:idx], buf[pos:]
+                    pos = idx
+                    break
+            else:
+                depth = len(stack)
+                if not stack or stack[-1][0] != ("{" if char == "}" else "["):
+                    raise ValueError(f"malformed AI view JSON: unexpected {char!r}")
+                if self._in_body(depth):
+                    # Keep "body": [] in the buffer for the final header parse
+                    buf = buf[:self._body_open + 1] + buf[idx:]
+                    pos = self._body_open + 2
+                stack.pop()
+                if not stack:
+                    self._done = True
+                    buf = buf[:pos]
+                    break
+        self._buf, self._pos = buf, pos
+        return rest
+
+    def _in_body(self, depth: int) -> bool:
+        stack = self._stack
+        return (
+            depth == _BODY_DEPTH
+            and len(stack) >= _BODY_DEPTH
+            and stack[1] == ("{", "document")
+            and stack[2] == ("[", "body")
+        )
+
+    def _partial_header(self, prefix: str) -> dict:
+        closers = "".join("}" if char == "{" else "]" for char, _ in reversed(self._stack))
+        return json.loads(prefix + closers)
+
+    def close(self) -> dict:
+        """结束输入：校验 JSON 完整并返回 AI 视图骨架（body 为空）。"""
+        if not self._done:
+            raise ValueError("incomplete AI view JSON: stream ended before the closing brace")
+        skeleton = json.loads(self._buf)
+        if self.header is None:
+            self.header = skeleton
+        return skeleton
+
+
+def iter_ai_view_blocks(chunks: Iterable[str]) -> Iterator[dict]:
+    """逐块产出文本流 *chunks* 中 AI 视图的 body block；流不完整时抛 ``ValueError``。"""
+    reader = AIViewStreamReader()
+    for chunk in chunks:
+        yield from reader.feed(chunk)
+    reader.close()
+
+
+class _OrderedMerge:
+    """按文档顺序把到达的 AI block 与原始 block 对齐合并。"""
+
+    def __init__(self, ast):
+        header, blocks = _resolve_ast(ast)
+        if isinstance(header, dict) and blocks is header["document"].get("body"):
+            ids = blocks
+        elif hasattr(ast, "block_ids"):
+            ids = ast.block_ids
+        else:
+            # No id index: materialize once so unknown AI ids can be told apart
+            blocks = ids = list(blocks)
+        self.header = header
+        self._known = {b.get("id") if isinstance(b, Mapping) else b for b in ids}
+        self._blocks = iter(blocks)
+        self._passed: set[str] = set()
+
+    def until(self, ai_block: Mapping) -> list:
+        """返回截至 *ai_block* 对应原始 block 的全部待渲染 block（末尾一个已合并）。"""
+        block_id = ai_block.get("id")
+        if block_id not in self._known:
+            return []  # merge_ai_edits ignores unknown ids too
+        if block_id in self._passed:
+            raise ValueError(
+                f"AI block {block_id!r} arrived after a later block was rendered; "
+                "streamed edits must follow document order"
+            )
+        ready = []
+        for block in self._blocks:
+            bid = block.get("id") if isinstance(block, Mapping) else None
+            if bid is not None:
+                self._passed.add(bid)
+            if bid == block_id:
+                with instrumentation.span("merge_ai_edits", block_id=block_id):
+                    ready.append(merge_block(copy.deepcopy(block), ai_block))
+                break
+            ready.append(block)
+        return ready
+
+    def rest(self) -> Iterator:
+        return self._blocks
+
+
+def _stream_blocks(reader: AIViewStreamReader, chunks: Iterable[str], merger, stats: dict) -> Iterator:
+    compact = None
+    for chunk in chunks:
+        for ai_block in reader.feed(chunk):
+            stats["ai_blocks"] += 1
+            if compact is None:
+                compact = reader.header["document"].get(COMPACT_KEY, False)
+            if compact:
+                ai_block = expand_block(ai_block, compact)
+            if merger is None:
+                yield ai_block
+            else:
+                yield from merger.until(ai_block)
+    reader.close()
+    if merger is not None:
+        yield from merger.rest()
+
+
+def render_ai_stream(
+    chunks: Iterable[str],
+    output_path: str | Path,
+    full_ast=None,
+    *,
+    flush_every: int = 64,
+) -> dict:
+    """消费 LLM 文本流 *chunks*，边接收边合并、渲染到 *output_path*。
+
+    *full_ast* is the full AST (dict, path or lazy AST) in edit mode, or
+    ``None`` to render the AI view itself.  Returns the number of AI
+    blocks received and of blocks rendered.
+    """
+    reader = AIViewStreamReader()
+    stats = {"ai_blocks": 0, "blocks": 0}
+    merger = header = None
+    if full_ast is not None:
+        merger = _OrderedMerge(full_ast)
+        header = merger.header
+    with instrumentation.span("ai_stream.render", output=str(output_path)):
+        blocks = _stream_blocks(reader, chunks, merger, stats)
+        # Create mode learns the header when the body opens, i.e. by the
+        # time the first block is out (or the stream has ended)
+        first = next(blocks, None)
+        if merger is None:
+            header = reader.header
+            if is_compact(header):
+                header = expand_header(header)
+        doc = _new_document(header)
+        styles = header["document"].get("styles", {})
+        with StreamingDocxWriter(doc, output_path, flush_every=flush_every) as writer:
+            for block in itertools.chain(() if first is None else (first,), blocks):
+                _render_block(doc, block, styles)
+                instrumentation.incr("rendered_blocks")
+                stats["blocks"] += 1
+                writer.block_done()
+    return stats
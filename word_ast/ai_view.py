@@ -10,33 +10,148 @@ The core round-trip pipeline is:
 AI only sees and modifies semantic fields; _raw_* XML is managed internally
 so that round-trip fidelity is preserved even when AI has not touched a field.
 """
-import copy
+from collections.abc import Mapping, Sequence
+
+from word_ast.nodes import Node
+
+_RAW_PREFIX = "_raw_"
+
+# Containers copied key by key: plain dicts and typed nodes (word_ast.nodes)
+_MAPPINGS = (dict, Node)
 
 
 def to_ai_view(ast: dict) -> dict:
     """返回适合给 AI 看的精简 AST，去掉所有 _raw_* 字段。
 
-    Returns a deep copy of *ast* with all keys starting with ``_raw_``
-    removed recursively.  AI only needs to see and modify semantic fields;
+    Returns a new AST equal to *ast* with every key starting with ``_raw_``
+    removed at any depth.  AI only needs to see and modify semantic fields;
     it does not need to understand the underlying XML representation.
+
+    The view is built in a single iterative pass: only non-``_raw_``
+    containers are copied, ``_raw_*`` values are never touched, and scalar
+    values (strings, numbers) are shared with *ast* since they are
+    immutable.  Nesting depth is not limited by the recursion limit.
+    *ast* itself is never modified.
+    """
+    return _build_view(ast)
+
+
+def _build_view(root):  # returns same type as input
+    """迭代地复制 dict/list 结构，跳过所有 ``_raw_`` 开头的 key。"""
+    if isinstance(root, _MAPPINGS):
+        result = {}
+    elif isinstance(root, list):
+        result = []
+    else:
+        return root
+
+    # Each entry is (source container, destination container); destinations
+    # are linked into their parent before being filled, so key order and
+    # list order match the source.
+    stack = [(root, result)]
+    while stack:
+        src, dst = stack.pop()
+        items = src.items() if isinstance(src, _MAPPINGS) else enumerate(src)
+        for key, value in items:
+            if isinstance(key, str) and key.startswith(_RAW_PREFIX):
+                continue
+            if isinstance(value, _MAPPINGS):
+                copied = {}
+                stack.append((value, copied))
+            elif isinstance(value, list):
+                copied = []
+                stack.append((value, copied))
+            else:
+                copied = value
+            if isinstance(dst, dict):
+                dst[key] = copied
+            else:
+                dst.append(copied)
+    return result
+
+
+class AIViewProxy(Mapping):
+    """完整 AST 上的只读零拷贝 AI 视图。
+
+    Read-only, zero-copy view over a full AST that hides ``_raw_*`` keys.
+    Nested dicts and lists are wrapped on access, so nothing is copied up
+    front; the proxy reflects later changes to the underlying AST.
+
+    Intended for callers that only read or serialize the view::
+
+        json.dump(AIViewProxy(ast), fp, default=json_default)
+
+    Use :meth:`to_dict` (or :func:`to_ai_view`) when a real, independent
+    dict is required.
     """
-    return _strip_raw(copy.deepcopy(ast))
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, key):
+        if isinstance(key, str) and key.startswith(_RAW_PREFIX):
+            raise KeyError(key)
+        return _wrap(self._data[key])
+
+    def __iter__(self):
+        for key in self._data:
+            if not (isinstance(key, str) and key.startswith(_RAW_PREFIX)):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"AIViewProxy({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        return _build_view(self._data)
+
+
+class _ListProxy(Sequence):
+    """:class:`AIViewProxy` 内部使用的只读 list 包装。"""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: list):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [_wrap(v) for v in self._data[index]]
+        return _wrap(self._data[index])
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, _ListProxy)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(_build_view(self._data))
+
+
+def _wrap(value):
+    if isinstance(value, _MAPPINGS):
+        return AIViewProxy(value)
+    if isinstance(value, list):
+        return _ListProxy(value)
+    return value
 
 
-def _strip_raw(obj):  # type: ignore[return]  # returns same type as input
-    """递归删除 dict/list 中所有以 '_raw_' 开头的 key。
+def json_default(obj):
+    """``json.dump(..., default=json_default)`` 用：逐层展开代理对象。
 
-    Recursively removes all keys starting with ``_raw_`` from every dict
-    nested inside *obj* (which may be a dict, list, or any scalar value).
-    Modifies *obj* in place and returns it for convenience.
+    Lets :mod:`json` serialize :class:`AIViewProxy` trees.  Each proxy is
+    expanded one level at a time into a shallow dict/list whose values are
+    still proxies, so serialization never materializes a full copy.
     """
-    if isinstance(obj, dict):
-        keys_to_del = [k for k in obj if k.startswith("_raw_")]
-        for k in keys_to_del:
-            del obj[k]
-        for v in obj.values():
-            _strip_raw(v)
-    elif isinstance(obj, list):
-        for item in obj:
-            _strip_raw(item)
-    return obj
+    if isinstance(obj, AIViewProxy):
+        return dict(obj.items())
+    if isinstance(obj, _ListProxy):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,199 @@
+"""asyncio 接口：在线程池或进程池中执行 parse / merge / render，支持并发上限、取消与超时。
+
+Async entry points for asyncio services.
+
+:class:`AsyncRunner` runs the blocking :func:`parse_docx`,
+:func:`merge_ai_edits` and :func:`render_ast` work in a thread pool (the
+default) or a process pool and exposes it as coroutines, so one event loop
+can serve many document jobs without blocking:
+
+- **concurrency limit** — at most *max_concurrency* jobs run at once; the
+  others wait on a semaphore without occupying a pool worker;
+- **cancellation** — cancelling the awaiting task signals the job, which
+  stops at the next block boundary; the slot is released only once the
+  worker has actually stopped;
+- **timeouts** — ``timeout=`` cancels the job the same way and raises
+  :class:`TimeoutError`.
+
+Module-level :func:`parse_docx`, :func:`merge_ai_edits` and
+:func:`render_ast` use a shared default runner (threads, concurrency 4)::
+
+    from word_ast import aio
+
+    ast = await aio.parse_docx("in.docx", timeout=30)
+    merged = await aio.merge_ai_edits(ast, ai_view)
+    await aio.render_ast(merged, "out.docx", streaming=True)
+
+Threads suit render and merge, which spend much of their time in lxml;
+``executor="process"`` sidesteps the GIL for CPU-bound parses at the cost
+of pickling the AST between processes.
+"""
+import asyncio
+import copy
+import multiprocessing
+import threading
+import weakref
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from word_ast import instrumentation
+from word_ast.ai_merge import _ai_blocks_by_id, merge_block
+from word_ast.parser.document_parser import iter_parse_docx
+from word_ast.renderer.document_renderer import _render_ast, _render_ast_streaming, _resolve_ast
+
+DEFAULT_CONCURRENCY = 4
+
+
+class _Cancelled(Exception):
+    """作业在 block 边界处观察到取消信号（仅在内部使用，不会抛给调用方）。"""
+
+
+def _checked(blocks: Iterable, cancel) -> Iterator:
+    for block in blocks:
+        if cancel.is_set():
+            raise _Cancelled
+        yield block
+
+
+def _parse_job(input_path, options: dict, cancel) -> dict:
+    ast, blocks = iter_parse_docx(input_path, **options)
+    ast["document"]["body"] = list(_checked(blocks, cancel))
+    return ast
+
+
+def _merge_job(original_ast: dict, ai_ast: dict, cancel) -> dict:
+    # Same result as merge_ai_edits, copied and merged block by block
+    document = original_ast["document"]
+    result = copy.deepcopy({**original_ast, "document": {**document, "body": []}})
+    body = result["document"]["body"]
+    ai_by_id = _ai_blocks_by_id(ai_ast)
+    for block in _checked(document.get("body", []), cancel):
+        block = copy.deepcopy(block)
+        if isinstance(block, Mapping) and block.get("id") in ai_by_id:
+            merge_block(block, ai_by_id[block["id"]])
+        body.append(block)
+    return result
+
+
+def _render_job(ast_or_path, output_path, options: dict, cancel) -> None:
+    header, blocks = _resolve_ast(ast_or_path)
+    render = _render_ast_streaming if options.pop("streaming", False) else _render_ast
+    render(header, _checked(blocks, cancel), output_path, **options)
+
+
+class AsyncRunner:
+    """可配置的异步作业执行器。
+
+    *executor* is ``"thread"``, ``"process"`` or an existing
+    :class:`concurrent.futures.Executor` (not shut down by :meth:`close`).
+    *max_workers* sizes a pool created here; it defaults to
+    *max_concurrency*.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        executor: str | Executor = "thread",
+        max_workers: int | None = None,
+    ):
+        self.max_concurrency = max_concurrency
+        # asyncio primitives belong to one event loop; keep one per loop
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._owns_executor = not isinstance(executor, Executor)
+        self._manager = None
+        if executor == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers or max_concurrency, thread_name_prefix="word-ast"
+            )
+        elif executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers or max_concurrency)
+            # Cancellation flags must be visible in the worker processes
+            self._manager = multiprocessing.Manager()
+        elif isinstance(executor, Executor):
+            self._executor = executor
+            if isinstance(executor, ProcessPoolExecutor):
+                self._manager = multiprocessing.Manager()
+        else:
+            raise ValueError(f"unknown executor {executor!r}; expected 'thread', 'process' or an Executor")
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def _new_event(self):
+        return self._manager.Event() if self._manager is not None else threading.Event()
+
+    async def _run(self, func, *args, timeout: float | None, name: str):
+        return await asyncio.wait_for(self._submit(func, *args, name=name), timeout)
+
+    async def _submit(self, func, *args, name: str):
+        async with self._semaphore():
+            cancel = self._new_event()
+            with instrumentation.span(f"aio.{name}"):
+                future = self._executor.submit(func, *args, cancel)
+                waiter = asyncio.wrap_future(future)
+                try:
+                    return await asyncio.shield(waiter)
+                except asyncio.CancelledError:
+                    cancel.set()
+                    future.cancel()  # drops it if it has not started yet
+                    # Keep the slot until the worker has really stopped
+                    await asyncio.wait([waiter])
+                    if not waiter.cancelled():
+                        waiter.exception()  # retrieved: the job stopped early
+                    raise
+
+    async def parse_docx(self, input_path: str | Path, *, timeout: float | None = None, **options) -> dict:
+        """异步 :func:`~word_ast.parse_docx`；*options* 同 ``iter_parse_docx``。"""
+        return await self._run(_parse_job, input_path, options, timeout=timeout, name="parse_docx")
+
+    async def merge_ai_edits(self, original_ast: dict, ai_ast: dict, *, timeout: float | None = None) -> dict:
+        """异步 :func:`~word_ast.merge_ai_edits`（dict AST）。"""
+        return await self._run(_merge_job, original_ast, ai_ast, timeout=timeout, name="merge_ai_edits")
+
+    async def render_ast(
+        self, ast_or_path, output_path: str | Path, *, timeout: float | None = None, **options
+    ) -> None:
+        """异步 :func:`~word_ast.render_ast`；*options* 为 ``workers`` / ``streaming``。"""
+        await self._run(_render_job, ast_or_path, output_path, options, timeout=timeout, name="render_ast")
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    async def __aenter__(self) -> "AsyncRunner":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+_default_runner: AsyncRunner | None = None
+
+
+def default_runner() -> AsyncRunner:
+    """模块级函数共用的默认执行器（线程池，并发上限 4）。"""
+    global _default_runner
+    if _default_runner is None:
+        _default_runner = AsyncRunner()
+    return _default_runner
+
+
+async def parse_docx(input_path: str | Path, *, timeout: float | None = None, **options) -> dict:
+    return await default_runner().parse_docx(input_path, timeout=timeout, **options)
+
+
+async def merge_ai_edits(original_ast: dict, ai_ast: dict, *, timeout: float | None = None) -> dict:
+    return await default_runner().merge_ai_edits(original_ast, ai_ast, timeout=timeout)
+
+
+async def render_ast(ast_or_path, output_path: str | Path, *, timeout: float | None = None, **options) -> None:
+    await default_runner().render_ast(ast_or_path, output_path, timeout=timeout, **options)
@@ -0,0 +1,260 @@
+"""紧凑 AI 视图：省略可推导的键与默认值，把重复格式提升到文档头部；配套无损展开。
+
+Token-minimized AI-view encoding.
+
+The standard AI view spells out the same things on every node.
+:func:`compact_ai_view` drops everything that can be restored:
+
+- ``"type": "Text"`` on content items (the default item type);
+- empty ``overrides`` / ``paragraph_format`` objects, ``col_span`` /
+  ``row_span`` of 1, ``based_on: null`` and ``style_id`` equal to its key
+  in the style table;
+- ids derived from their parent: ``<cell id>.p<n>`` for cell paragraphs
+  and ``<toc id>.title`` for TOC titles;
+- ``paragraph_format`` / ``default_run`` values that every paragraph of a
+  style shares — hoisted to ``document.compact.styles[<style id>]``;
+- run ``overrides`` objects used more than once — hoisted to the palette
+  ``document.compact.formats`` and referenced by key (``"overrides":
+  "f0"``).
+
+:func:`expand_ai_view` (and :func:`expand_block` for one block, e.g.
+while streaming) restores the standard view: a compact view expands to
+its source exactly, except that empty ``overrides`` / ``paragraph_format``
+objects stay absent, which :func:`~word_ast.merge_ai_edits` treats the
+same way.  A model editing a compact view may write values inline as
+usual; inline values win over hoisted ones.
+
+:func:`dumps_compact` serializes without the spaces after ``,`` and ``:``.
+"""
+import json
+from collections import Counter
+from collections.abc import Mapping
+
+from word_ast.ai_view import json_default, to_ai_view
+
+COMPACT_KEY = "compact"
+COMPACT_VERSION = 1
+
+# Hoisted per-style paragraph fields
+_STYLE_FIELDS = ("paragraph_format", "default_run")
+# A palette reference is only worth it for objects longer than this
+_MIN_FORMAT_CHARS = 12
+
+
+def _canonical(value) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def is_compact(view: Mapping) -> bool:
+    """*view* 是否为紧凑编码。"""
+    document = view.get("document")
+    return isinstance(document, Mapping) and COMPACT_KEY in document
+
+
+def dumps_compact(view) -> str:
+    """无多余空白的 JSON 序列化。"""
+    return json.dumps(view, ensure_ascii=False, separators=(",", ":"), default=json_default)
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+def _iter_paragraphs(node):
+    """产出 *node* 中的所有段落节点（顶层、单元格内、目录标题）。"""
+    if isinstance(node, list):
+        for item in node:
+            yield from _iter_paragraphs(item)
+    elif isinstance(node, dict):
+        if node.get("type") == "Paragraph":
+            yield node
+        for key, value in node.items():
+            if key != "content" or node.get("type") != "Paragraph":
+                yield from _iter_paragraphs(value)
+
+
+def _shared_style_fields(paragraphs: list[dict]) -> dict:
+    """每个样式下所有段落都相同的 (字段, 键, 值)。"""
+    groups: dict = {}
+    for p in paragraphs:
+        groups.setdefault(p.get("style"), []).append(p)
+    shared: dict = {}
+    for style, group in groups.items():
+        if style is None or len(group) < 2:
+            continue
+        hoisted = {}
+        for field in _STYLE_FIELDS:
+            first = group[0].get(field) or {}
+            common = {
+                k: v for k, v in first.items()
+                if all(k in (p.get(field) or {}) and p[field][k] == v for p in group[1:])
+            }
+            if common:
+                hoisted[field] = common
+        if hoisted:
+            shared[style] = hoisted
+    return shared
+
+
+def _format_palette(paragraphs: list[dict]) -> dict[str, str]:
+    """出现多次的 overrides → 调色板键（按出现次数从多到少编号）。"""
+    counts = Counter(
+        _canonical(item["overrides"])
+        for p in paragraphs
+        for item in p.get("content", [])
+        if isinstance(item, dict) and isinstance(item.get("overrides"), dict) and item["overrides"]
+    )
+    frequent = [key for key, n in counts.most_common() if n > 1 and len(key) > _MIN_FORMAT_CHARS]
+    return {key: f"f{i}" for i, key in enumerate(frequent)}
+
+
+def _compact_paragraph(p: dict, shared: dict, palette: dict[str, str]) -> None:
+    hoisted = shared.get(p.get("style"), {})
+    for field in _STYLE_FIELDS:
+        if field not in p:
+            continue
+        value = {k: v for k, v in p[field].items() if k not in hoisted.get(field, {})}
+        if value:
+            p[field] = value
+        else:
+            del p[field]
+    for item in p.get("content", []):
+        if not isinstance(item, dict) or item.get("type", "Text") != "Text":
+            continue
+        item.pop("type", None)
+        overrides = item.get("overrides")
+        if isinstance(overrides, dict):
+            if not overrides:
+                del item["overrides"]
+            else:
+                ref = palette.get(_canonical(overrides))
+                if ref is not None:
+                    item["overrides"] = ref
+
+
+def _compact_ids(block: dict) -> None:
+    if block.get("type") == "Table":
+        for row in block.get("rows", []):
+            for cell in row.get("cells", []):
+                for key in ("col_span", "row_span"):
+                    if cell.get(key) == 1:
+                        del cell[key]
+                for i, p in enumerate(cell.get("content", [])):
+                    if isinstance(p, dict) and p.get("id") == f"{cell.get('id')}.p{i}":
+                        del p["id"]
+    elif block.get("type") == "TOC":
+        title = block.get("title")
+        if isinstance(title, dict) and title.get("id") == f"{block.get('id')}.title":
+            del title["id"]
+
+
+def compact_ai_view(view: Mapping) -> dict:
+    """返回 AI 视图 *view* 的紧凑编码（*view* 本身不被修改）。"""
+    if is_compact(view):
+        return to_ai_view(view)
+    result = to_ai_view(view)  # a fresh copy, _raw_* stripped
+    document = result.setdefault("document", {})
+    body = document.get("body", [])
+    paragraphs = list(_iter_paragraphs(body))
+    shared = _shared_style_fields(paragraphs)
+    palette = _format_palette(paragraphs)
+    for p in paragraphs:
+        _compact_paragraph(p, shared, palette)
+    for block in body:
+        if isinstance(block, dict):
+            _compact_ids(block)
+    for style_id, style in document.get("styles", {}).items():
+        if isinstance(style, dict):
+            if style.get("style_id") == style_id:
+                del style["style_id"]
+            if "based_on" in style and style["based_on"] is None:
+                del style["based_on"]
+    header = {
+        "version": COMPACT_VERSION,
+        "styles": shared,
+        "formats": {ref: json.loads(key) for key, ref in palette.items()},
+    }
+    # Place the header before "body" so streaming readers see it first
+    result["document"] = {}
+    for key, value in document.items():
+        if key == "body":
+            result["document"][COMPACT_KEY] = header
+        result["document"][key] = value
+    result["document"].setdefault(COMPACT_KEY, header)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Expansion
+# ---------------------------------------------------------------------------
+
+def _expand_paragraph(p: dict, compact: Mapping) -> None:
+    hoisted = compact.get("styles", {}).get(p.get("style"), {})
+    for field in _STYLE_FIELDS:
+        if field in hoisted:
+            p[field] = {**hoisted[field], **(p.get(field) or {})}
+    formats = compact.get("formats", {})
+    for item in p.get("content", []):
+        if not isinstance(item, dict):
+            continue
+        item.setdefault("type", "Text")
+        ref = item.get("overrides")
+        if isinstance(ref, str):
+            if ref not in formats:
+                raise ValueError(f"unknown format reference {ref!r} in paragraph {p.get('id')!r}")
+            item["overrides"] = dict(formats[ref])
+
+
+def expand_block(block: Mapping, compact: Mapping) -> dict:
+    """按紧凑头部 *compact*（``document.compact``）把单个 block 展开为标准形式。"""
+    block = to_ai_view(block)
+    block_type = block.get("type")
+    if block_type == "Paragraph":
+        _expand_paragraph(block, compact)
+    elif block_type == "Table":
+        for row in block.get("rows", []):
+            for cell in row.get("cells", []):
+                cell.setdefault("col_span", 1)
+                cell.setdefault("row_span", 1)
+                for i, p in enumerate(cell.get("content", [])):
+                    if isinstance(p, dict):
+                        if "id" not in p and "id" in cell:
+                            p["id"] = f"{cell['id']}.p{i}"
+                        if p.get("type") == "Paragraph":
+                            _expand_paragraph(p, compact)
+    elif block_type == "TOC":
+        title = block.get("title")
+        if isinstance(title, dict):
+            if "id" not in title and "id" in block:
+                title["id"] = f"{block['id']}.title"
+            _expand_paragraph(title, compact)
+    return block
+
+
+def expand_header(view: Mapping) -> dict:
+    """展开文档头部（样式表），返回不含 ``compact`` 键的副本；body 原样保留。"""
+    document = view.get("document", {})
+    result = {**view, "document": {k: v for k, v in document.items() if k != COMPACT_KEY}}
+    styles = document.get("styles")
+    if isinstance(styles, Mapping):
+        result["document"]["styles"] = {
+            style_id: {"style_id": style_id, **style, "based_on": style.get("based_on")}
+            if isinstance(style, Mapping) else style
+            for style_id, style in styles.items()
+        }
+    return result
+
+
+def expand_ai_view(view: Mapping) -> dict:
+    """把紧凑视图展开为标准 AI 视图；标准视图原样复制返回。"""
+    if not is_compact(view):
+        return to_ai_view(view)
+    compact = view["document"][COMPACT_KEY]
+    if compact.get("version") != COMPACT_VERSION:
+        raise ValueError(f"unsupported compact view version {compact.get('version')!r}")
+    result = expand_header(view)
+    result["document"]["body"] = [
+        expand_block(block, compact) if isinstance(block, Mapping) else block
+        for block in view["document"].get("body", [])
+    ]
+    return result
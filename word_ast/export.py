@@ -0,0 +1,170 @@
+"""流式导出：一次遍历同时写出 full_ast.json 与 ai_view.json。
+
+Streaming export: writes the full AST and the AI view side by side in a
+single traversal of the document body.
+
+Each body block is parsed, serialized into both files and then dropped, so
+besides the python-docx document tree only one block is alive at a time.
+The output is byte-for-byte what ``json.dumps(ast, ensure_ascii=False,
+indent=2)`` would produce (or the ``separators=(",", ":")`` form when
+*compact* is set), so existing readers are unaffected.  The full AST can
+also be written in any format of :mod:`word_ast.serializers` (e.g. gzip or
+lzma-compressed JSON, chosen by *format* or the file suffix); a path ending
+in ``.jsonl`` selects the block-per-line layout of
+:mod:`word_ast.storage.jsonl` instead.
+"""
+import json
+from pathlib import Path
+from typing import TextIO
+
+from word_ast import instrumentation
+from word_ast.ai_view import to_ai_view
+from word_ast.nodes import json_default
+from word_ast.parser.document_parser import iter_parse_docx
+from word_ast.serializers import get_serializer, serializer_for_path
+from word_ast.storage.jsonl import write_jsonl_ast
+
+
+class AstJsonWriter:
+    """逐块写出 AST JSON 的写入器。
+
+    Writes an AST to the text stream *fp* incrementally::
+
+        writer = AstJsonWriter(fp)
+        writer.begin(ast)              # everything before the body
+        for block in blocks:
+            writer.write_block(block)
+        writer.end(ast)                # everything after the body
+
+    *ast* is the AST skeleton: ``begin`` writes the top-level keys and the
+    ``document`` keys that precede ``body``; ``end`` writes the keys that
+    follow it.  The ``body`` value in the skeleton itself is ignored.
+    """
+
+    def __init__(self, fp: TextIO, *, indent: int | None = 2):
+        self._fp = fp
+        self._indent = indent
+        self._block_count = 0
+
+    def _dumps(self, obj, level: int) -> str:
+        if self._indent is None:
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=json_default)
+        text = json.dumps(obj, ensure_ascii=False, indent=self._indent, default=json_default)
+        # JSON strings never contain a literal newline, so every "\n" is
+        # structural and can be re-indented to the nesting *level*.
+        return text.replace("\n", "\n" + " " * (self._indent * level))
+
+    def _write(self, text: str) -> None:
+        self._fp.write(text)
+
+    def _newline(self, level: int) -> str:
+        if self._indent is None:
+            return ""
+        return "\n" + " " * (self._indent * level)
+
+    def _key(self, key: str) -> str:
+        sep = ":" if self._indent is None else ": "
+        return json.dumps(key, ensure_ascii=False) + sep
+
+    def _fields(self, fields: list[tuple[str, object]], level: int, leading_comma: bool) -> None:
+        for i, (key, value) in enumerate(fields):
+            if i or leading_comma:
+                self._write(",")
+            self._write(self._newline(level) + self._key(key) + self._dumps(value, level))
+
+    def begin(self, ast: dict) -> None:
+        top_keys = list(ast)
+        doc_index = top_keys.index("document")
+        self._write("{")
+        self._fields([(k, ast[k]) for k in top_keys[:doc_index]], 1, False)
+        if doc_index:
+            self._write(",")
+        self._write(self._newline(1) + self._key("document") + "{")
+        document = ast["document"]
+        doc_keys = list(document)
+        head = doc_keys[: doc_keys.index("body")] if "body" in doc_keys else doc_keys
+        self._fields([(k, document[k]) for k in head], 2, False)
+        if head:
+            self._write(",")
+        self._write(self._newline(2) + self._key("body") + "[")
+
+    def write_block(self, block: dict) -> None:
+        if self._block_count:
+            self._write(",")
+        self._write(self._newline(3) + self._dumps(block, 3))
+        self._block_count += 1
+
+    def end(self, ast: dict) -> None:
+        if self._block_count:
+            self._write(self._newline(2))
+        self._write("]")
+        document = ast["document"]
+        doc_keys = list(document)
+        tail = doc_keys[doc_keys.index("body") + 1:] if "body" in doc_keys else []
+        self._fields([(k, document[k]) for k in tail], 2, True)
+        self._write(self._newline(1) + "}")
+        top_keys = list(ast)
+        self._fields([(k, ast[k]) for k in top_keys[top_keys.index("document") + 1:]], 1, True)
+        self._write(self._newline(0) + "}")
+
+
+def write_ast_json(ast: dict, fp: TextIO, *, indent: int | None = 2) -> None:
+    """将内存中的 AST 逐块写入 *fp*（不生成整份 JSON 字符串）。"""
+    writer = AstJsonWriter(fp, indent=indent)
+    writer.begin(ast)
+    for block in ast["document"].get("body", []):
+        writer.write_block(block)
+    writer.end(ast)
+
+
+def export_docx(
+    input_path: str | Path,
+    full_ast_path: str | Path,
+    ai_view_path: str | Path,
+    *,
+    compact: bool = False,
+    format: str | None = None,
+) -> int:
+    """一次遍历 docx，同时流式写出 full AST 与 AI 视图，返回 block 数。
+
+    Parses *input_path* block by block and streams every block into
+    *full_ast_path* and, stripped of ``_raw_*`` fields, into *ai_view_path*.
+    With *compact* the JSON files are written without indentation or
+    spaces.  *format* names a serializer for the full AST (default: implied
+    by the suffix of *full_ast_path*); compressed formats are always
+    compact.  A *full_ast_path* ending in ``.jsonl`` is written in the JSONL
+    layout (always compact) together with its offset index.
+    """
+    indent = None if compact else 2
+    serializer = get_serializer(format) if format else serializer_for_path(full_ast_path)
+    full_indent = None if compact else serializer.indent
+    with instrumentation.span("export", path=str(input_path)):
+        ast, blocks = iter_parse_docx(input_path)
+        view = to_ai_view(ast)
+        with open(ai_view_path, "w", encoding="utf-8") as view_fp:
+            view_writer = AstJsonWriter(view_fp, indent=indent)
+            view_writer.begin(view)
+
+            def _tee_view():
+                for block in blocks:
+                    view_writer.write_block(to_ai_view(block))
+                    yield block
+
+            if Path(full_ast_path).suffix == ".jsonl":
+                count = write_jsonl_ast(ast, full_ast_path, _tee_view())
+            else:
+                count = 0
+                with serializer.open(full_ast_path, "w") as full_fp:
+                    full_writer = AstJsonWriter(full_fp, indent=full_indent)
+                    full_writer.begin(ast)
+                    for block in _tee_view():
+                        full_writer.write_block(block)
+                        count += 1
+                    full_writer.end(ast)
+            view_writer.end(view)
+    if instrumentation.is_enabled():
+        instrumentation.incr(
+            "bytes_written",
+            Path(full_ast_path).stat().st_size + Path(ai_view_path).stat().st_size,
+        )
+    return count
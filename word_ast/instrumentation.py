@@ -0,0 +1,228 @@
+"""埋点层：解析 / 合并 / 渲染各阶段的 span 回调与计数器。
+
+Instrumentation layer: opt-in span callbacks and counters for the parse,
+view, merge and render stages, meant to be bridged to an external telemetry
+system.
+
+Disabled by default.  While disabled, :func:`span` returns a shared no-op
+context manager and :func:`incr` returns immediately, so instrumented code
+pays one global lookup and one function call per site.
+
+Usage::
+
+    from word_ast import instrumentation
+
+    instrumentation.add_span_hook(lambda s: print(s.name, s.duration))
+    instrumentation.enable()
+    parse_docx("report.docx")
+    print(instrumentation.get_counters())
+
+or, scoped to a block of code::
+
+    with instrumentation.record() as rec:
+        render_ast(ast, "out.docx")
+    rec.spans, rec.counters
+
+Span names used by the library:
+
+- ``parse_docx``, ``parse.load``, ``parse.styles``, ``parse_paragraph_block``,
+  ``parse_table_block``, ``parse.style_inheritance``, ``parse.image``,
+  ``parse.parallel``
+- ``export``
+- ``merge_ai_edits``, ``merge.xml_sync``
+- ``render_ast``, ``render.paragraph``, ``render.table``, ``render.toc``,
+  ``render.image``, ``render.save``, ``render.parallel``, ``render.stitch``,
+  ``render.flush``
+- ``pipeline.roundtrip``
+- ``aio.parse_docx``, ``aio.merge_ai_edits``, ``aio.render_ast`` (one per
+  :class:`~word_ast.aio.AsyncRunner` job, excluding time spent waiting for
+  a concurrency slot)
+- ``ai_stream.render``
+- ``llm.edit``, ``llm.request``
+
+Counters: ``parsed_blocks``, ``rendered_blocks``, ``runs``, ``images``,
+``raw_xml_parses``, ``cache_hits``, ``cache_misses``, ``bytes_written``,
+``llm_cache_hits``, ``llm_cache_misses``, ``llm_cache_evictions``.
+"""
+import contextvars
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+_enabled = False
+_span_hooks: list = []
+_counter_hooks: list = []
+_counters: Counter = Counter()
+_counters_lock = threading.Lock()
+_current_span: contextvars.ContextVar = contextvars.ContextVar(
+    "word_ast_current_span", default=None
+)
+
+
+class Span:
+    """一次计时区间；结束时传给所有 span 回调。
+
+    A timed region.  ``start``/``end`` are :func:`time.perf_counter` values,
+    ``parent`` is the enclosing span in the same thread/task (or ``None``).
+    """
+
+    __slots__ = ("name", "attrs", "parent", "start", "end", "_token")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.parent = None
+        self.start = 0.0
+        self.end = 0.0
+        self._token = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        for hook in tuple(_span_hooks):
+            hook(self)
+        return False
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, duration={self.duration:.6f}, attrs={self.attrs!r})"
+
+
+class _NullSpan:
+    """禁用时返回的共享空 span。"""
+
+    __slots__ = ()
+    attrs: dict = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable() -> None:
+    """开启埋点。"""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """关闭埋点（已注册的回调保留）。"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, **attrs):
+    """返回一个计时上下文管理器；禁用时返回共享空对象。
+
+    Return a context manager timing the enclosed block as span *name*.
+    Keyword arguments become ``span.attrs``.  When instrumentation is
+    disabled the shared no-op span is returned and nothing is recorded.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+
+def incr(name: str, value: int = 1) -> None:
+    """累加计数器 *name*；禁用时为空操作。"""
+    if not _enabled:
+        return
+    with _counters_lock:
+        _counters[name] += value
+    for hook in tuple(_counter_hooks):
+        hook(name, value)
+
+
+def get_counters() -> dict:
+    """返回当前计数器的快照。"""
+    with _counters_lock:
+        return dict(_counters)
+
+
+def reset_counters() -> None:
+    with _counters_lock:
+        _counters.clear()
+
+
+def add_span_hook(hook) -> None:
+    """注册 span 回调 ``hook(span)``，在每个 span 结束时调用。"""
+    _span_hooks.append(hook)
+
+
+def remove_span_hook(hook) -> None:
+    if hook in _span_hooks:
+        _span_hooks.remove(hook)
+
+
+def add_counter_hook(hook) -> None:
+    """注册计数器回调 ``hook(name, value)``，在每次 :func:`incr` 时调用。"""
+    _counter_hooks.append(hook)
+
+
+def remove_counter_hook(hook) -> None:
+    if hook in _counter_hooks:
+        _counter_hooks.remove(hook)
+
+
+class Recording:
+    """:func:`record` 收集到的 span 与计数器。"""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self.counters: Counter = Counter()
+
+    def _on_counter(self, name: str, value: int) -> None:
+        self.counters[name] += value
+
+    def totals(self) -> dict[str, float]:
+        """按 span 名汇总总耗时（秒）。"""
+        result: dict[str, float] = {}
+        for s in self.spans:
+            result[s.name] = result.get(s.name, 0.0) + s.duration
+        return result
+
+
+@contextmanager
+def record():
+    """在代码块内临时开启埋点，收集期间产生的全部 span 与计数。
+
+    Temporarily enables instrumentation for the ``with`` block and yields a
+    :class:`Recording` holding only what happened inside the block.  The
+    previous enabled state is restored afterwards; the global counters keep
+    accumulating as usual.
+    """
+    rec = Recording()
+    previous = _enabled
+    span_hook = rec.spans.append
+    counter_hook = rec._on_counter
+    add_span_hook(span_hook)
+    add_counter_hook(counter_hook)
+    enable()
+    try:
+        yield rec
+    finally:
+        remove_span_hook(span_hook)
+        remove_counter_hook(counter_hook)
+        if not previous:
+            disable()
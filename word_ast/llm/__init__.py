@@ -0,0 +1,25 @@
+"""LLM 编辑编排。
+
+Orchestrates LLM edits of long documents: the AI view is cut into chunks
+that are edited concurrently by a pluggable client and merged back into
+the full AST, with an optional persistent cache of edit results, and
+reports how many tokens each part of the AI view costs.
+"""
+from .cache import EditCache
+from .mock import MockLLMClient
+from .orchestrator import EditStats, chunk_blocks, edit_ai_view, edit_document, load_client
+from .tokens import TokenReport, estimate_tokens, load_tokenizer, token_report
+
+__all__ = [
+    "EditCache",
+    "EditStats",
+    "MockLLMClient",
+    "chunk_blocks",
+    "edit_ai_view",
+    "edit_document",
+    "load_client",
+    "TokenReport",
+    "estimate_tokens",
+    "load_tokenizer",
+    "token_report",
+]
@@ -0,0 +1,172 @@
+"""LLM 编辑结果缓存：按 (block 语义内容, 修改需求, 提示词版本) 持久化 AI 返回的 block。
+
+Persistent cache of LLM edit results (stdlib :mod:`sqlite3` only).
+
+Iterative editing sessions send the same unchanged blocks with the same
+instruction again and again.  :class:`EditCache` stores the block the
+model returned under ``sha256(block content, instruction, prompt
+version)``, and :func:`~word_ast.llm.orchestrator.edit_ai_view` serves
+hits directly instead of sending those blocks.
+
+The key ignores the block's id — the top-level ``id`` and the nested ids
+derived from it, such as ``t3.r0c1`` or ``toc0.title``, are rebased onto
+a placeholder before hashing — so a paragraph or table that moved (and
+was renumbered) still hits; on a hit the cached block's ids are rebased
+onto the requesting block's id.
+
+The cache holds at most *max_entries* blocks; the least recently used
+entries are evicted first.  ``hits`` / ``misses`` / ``stores`` /
+``evictions`` count this session's lookups and writes.
+"""
+import hashlib
+import json
+import sqlite3
+from collections.abc import Mapping
+from pathlib import Path
+
+from word_ast import instrumentation
+from word_ast.ai_view import json_default
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Stands in for the block id in cache keys
+_ID_PLACEHOLDER = "\x00"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS edits (
+    key       BLOB PRIMARY KEY,
+    block_id  TEXT,
+    block     TEXT NOT NULL,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS edits_last_used ON edits(last_used);
+"""
+
+
+def cache_key(block: Mapping, instruction: str, prompt_version: str) -> bytes:
+    """返回 block 的缓存键：语义内容（不含 block id）+ 修改需求 + 提示词版本的 SHA-256。"""
+    block_id = block.get("id")
+    if isinstance(block_id, str):
+        block = _rebase_ids(block, block_id, _ID_PLACEHOLDER)
+    content = {k: v for k, v in block.items() if k != "id"}
+    payload = json.dumps(
+        [content, instruction, prompt_version],
+        ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=json_default,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).digest()
+
+
+def _rebase_ids(obj, old: str, new: str):
+    """把 *obj* 中等于 *old* 或以 ``old.`` 开头的 ``id`` 改写为以 *new* 开头。"""
+    if isinstance(obj, list):
+        return [_rebase_ids(item, old, new) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    result = {}
+    for key, value in obj.items():
+        if key == "id" and isinstance(value, str) and (value == old or value.startswith(old + ".")):
+            value = new + value[len(old):]
+        result[key] = _rebase_ids(value, old, new)
+    return result
+
+
+class EditCache:
+    """LLM 编辑结果缓存。
+
+    Open (or create) the cache database at *path*; ``":memory:"`` is
+    accepted.  The cache is a context manager that commits and closes the
+    connection on exit.
+    """
+
+    def __init__(self, path: str | Path, *, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+        count, clock = self.conn.execute("SELECT COUNT(*), MAX(last_used) FROM edits").fetchone()
+        self._count = count
+        self._clock = clock or 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self) -> "EditCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def get(self, block: Mapping, instruction: str, prompt_version: str) -> dict | None:
+        """查找 *block* 的缓存结果；命中时返回已改写为 *block* id 的副本。"""
+        key = cache_key(block, instruction, prompt_version)
+        row = self.conn.execute("SELECT block_id, block FROM edits WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            instrumentation.incr("llm_cache_misses")
+            return None
+        self.hits += 1
+        instrumentation.incr("llm_cache_hits")
+        self.conn.execute("UPDATE edits SET last_used = ? WHERE key = ?", (self._tick(), key))
+        cached_id, data = row
+        result = json.loads(data)
+        block_id = block.get("id")
+        if cached_id is not None and block_id is not None and cached_id != block_id:
+            result = _rebase_ids(result, cached_id, block_id)
+        return result
+
+    def put(self, block: Mapping, result: Mapping, instruction: str, prompt_version: str) -> None:
+        """保存 AI 对 *block* 返回的 *result*，超出容量时淘汰最久未用的条目。"""
+        key = cache_key(block, instruction, prompt_version)
+        data = json.dumps(result, ensure_ascii=False, default=json_default)
+        existed = self.conn.execute("SELECT 1 FROM edits WHERE key = ?", (key,)).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO edits(key, block_id, block, last_used) VALUES (?, ?, ?, ?)",
+            (key, block.get("id"), data, self._tick()),
+        )
+        self.stores += 1
+        if existed is None:
+            self._count += 1
+        if self._count > self.max_entries:
+            self._evict(self._count - self.max_entries)
+
+    def _evict(self, n: int) -> None:
+        self.conn.execute(
+            "DELETE FROM edits WHERE key IN (SELECT key FROM edits ORDER BY last_used LIMIT ?)", (n,)
+        )
+        self._count -= n
+        self.evictions += n
+        instrumentation.incr("llm_cache_evictions", n)
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def clear(self) -> None:
+        self.conn.execute("DELETE FROM edits")
+        self.conn.commit()
+        self._count = 0
+
+    def stats(self) -> dict:
+        """命中统计：hits / misses / hit_rate / stores / evictions / entries。"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": self._count,
+        }
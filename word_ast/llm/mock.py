@@ -0,0 +1,69 @@
+"""本地模拟 LLM 客户端：不联网，按给定函数修改收到的 block，便于测试编排逻辑。
+
+Local mock LLM client.
+
+:class:`MockLLMClient` implements the client interface of
+:mod:`word_ast.llm.orchestrator` without a model: it pulls the AI view out
+of the prompt, passes every block through *edit* and answers with the
+result in a ```` ```json ```` fence, as the real prompt demands.  It can
+fail its first calls and add latency, to exercise retries and
+concurrency.
+"""
+import copy
+import json
+import re
+import threading
+import time
+from collections.abc import Callable
+
+from .orchestrator import extract_json
+
+_INSTRUCTION = re.compile(r"^修改需求：(.*)$", re.M)
+
+
+class MockLLMClient:
+    """模拟客户端。
+
+    *edit* is called as ``edit(block, instruction)`` on a copy of every
+    block and returns the block to send back (default: unchanged).  The
+    first *fail_first* calls raise :class:`ConnectionError`; every call
+    sleeps *delay* seconds.  ``calls`` counts calls, ``max_in_flight``
+    records the highest number of concurrent calls seen.
+    """
+
+    def __init__(
+        self,
+        edit: Callable[[dict, str], dict] | None = None,
+        *,
+        fail_first: int = 0,
+        delay: float = 0.0,
+    ):
+        self.edit = edit
+        self.fail_first = fail_first
+        self.delay = delay
+        self.calls = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def complete(self, system: str, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if call <= self.fail_first:
+                raise ConnectionError(f"mock failure on call {call}")
+            view = extract_json(prompt)
+            if self.edit is not None:
+                match = _INSTRUCTION.search(prompt)
+                instruction = match.group(1) if match else ""
+                body = view["document"]["body"]
+                body[:] = [self.edit(copy.deepcopy(block), instruction) for block in body]
+            return "```json\n" + json.dumps(view, ensure_ascii=False) + "\n```"
+        finally:
+            with self._lock:
+                self._in_flight -= 1
@@ -0,0 +1,276 @@
+"""分块并发的 LLM 编辑编排：把 AI 视图切块并发送给 LLM，重试失败块，合并结果。
+
+Chunked, concurrent LLM edit orchestration.
+
+A long document does not fit one prompt.  :func:`edit_ai_view` cuts the
+AI-view body into chunks of at most *chunk_chars* serialized characters,
+sends every chunk together with the edit instruction to an LLM client —
+at most *max_parallel* requests in flight — and joins the returned blocks
+back into one AI view in document order.  :func:`edit_document` then
+merges that view into the full AST through
+:func:`~word_ast.ai_merge.merge_ai_edits`.
+
+The client is pluggable: any object with a ``complete(system, prompt)``
+method returning the model's text.  Calls are made from worker threads,
+so the method must be thread-safe (HTTP clients usually are).
+:class:`~word_ast.llm.mock.MockLLMClient` is a local stand-in for tests.
+
+With an :class:`~word_ast.llm.cache.EditCache`, blocks whose result is
+cached for the same instruction and prompt version are filled in from
+the cache and only the remaining blocks are chunked and sent; every
+accepted reply block is stored.
+
+A reply is accepted only if it parses as an AI view whose blocks all come
+from the chunk with their ``type`` unchanged; anything else — exceptions
+from the client included — is retried up to *retries* times with
+exponential backoff.
+"""
+import hashlib
+import importlib
+import json
+import re
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from word_ast import instrumentation
+from word_ast.ai_merge import merge_ai_edits
+from word_ast.ai_view import json_default, to_ai_view
+
+DEFAULT_PARALLEL = 4
+DEFAULT_CHUNK_CHARS = 12000
+DEFAULT_RETRIES = 2
+
+DEFAULT_PROMPT_PATH = Path(__file__).resolve().parents[2] / "docs" / "AI_PROMPT.md"
+
+_FENCED_JSON = re.compile(r"```(?:json)?\s*\n(.*?)\n\s*```", re.S)
+
+_PROMPT_TEMPLATE = """修改需求：{instruction}
+
+以下是一份长文档的第 {index}/{total} 部分（body 中第 {first}–{last} 个 block）。
+请按模式 B 修改，只返回这一部分的完整 JSON，不要增删 block：
+
+```json
+{view}
+```"""
+
+
+class EditStats:
+    """编排运行统计。
+
+    ``chunks`` counts the chunks sent, ``requests`` every client call
+    (retries included), ``retries`` the calls that were repeats,
+    ``failed`` the chunks left unedited after all retries (only when
+    ``strict=False``) and ``cached`` the blocks served from the cache.
+    """
+
+    __slots__ = ("chunks", "requests", "retries", "failed", "cached")
+
+    def __init__(self):
+        self.chunks = 0
+        self.requests = 0
+        self.retries = 0
+        self.failed = 0
+        self.cached = 0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v}" for k, v in self.as_dict().items())
+        return f"EditStats({fields})"
+
+
+def load_system_prompt(path: str | Path | None = None) -> str:
+    """读取系统提示词（默认 ``docs/AI_PROMPT.md``）。"""
+    return Path(path or DEFAULT_PROMPT_PATH).read_text(encoding="utf-8")
+
+
+def prompt_version(system_prompt: str) -> str:
+    """系统提示词与分块提示模板的短哈希；任一变化都会使缓存结果失效。"""
+    digest = hashlib.sha256(f"{system_prompt}\0{_PROMPT_TEMPLATE}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def load_client(spec: str):
+    """按 ``"mock"`` 或 ``"package.module:factory"`` 创建 LLM 客户端。"""
+    if spec == "mock":
+        from .mock import MockLLMClient
+
+        return MockLLMClient()
+    module_name, sep, attr = spec.partition(":")
+    if not sep or not attr:
+        raise ValueError(f"client spec must be 'mock' or 'module:factory', got {spec!r}")
+    target = getattr(importlib.import_module(module_name), attr)
+    # A ready client instance is used as is; classes and factories are called
+    if hasattr(target, "complete") and not isinstance(target, type):
+        return target
+    return target()
+
+
+def chunk_blocks(blocks: list, chunk_chars: int = DEFAULT_CHUNK_CHARS) -> list[list]:
+    """按序列化长度把 *blocks* 切成连续的块；单个超长 block 独占一块。"""
+    chunks: list[list] = []
+    current: list = []
+    size = 0
+    for block in blocks:
+        n = len(json.dumps(block, ensure_ascii=False, default=json_default))
+        if current and size + n > chunk_chars:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(block)
+        size += n
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def extract_json(text: str):
+    """从模型回复中取出 JSON（兼容 ```json 代码围栏与前后说明文字）。"""
+    fenced = _FENCED_JSON.search(text)
+    if fenced:
+        text = fenced.group(1)
+    else:
+        start, end = text.find("{"), text.rfind("}")
+        if start >= 0 and end > start:
+            text = text[start:end + 1]
+    return json.loads(text)
+
+
+def _chunk_view(view: dict, blocks: list) -> dict:
+    document = view.get("document", {})
+    return {
+        "schema_version": view.get("schema_version", "1.0"),
+        "document": {"styles": document.get("styles", {}), "body": blocks},
+    }
+
+
+def _build_prompt(instruction: str, view: dict, blocks: list, index: int, total: int, first: int, last: int) -> str:
+    return _PROMPT_TEMPLATE.format(
+        instruction=instruction,
+        index=index + 1,
+        total=total,
+        first=first + 1,
+        last=last + 1,
+        view=json.dumps(_chunk_view(view, blocks), ensure_ascii=False, default=json_default),
+    )
+
+
+def _check_reply(reply: dict, sent: list) -> list:
+    """校验回复只包含本块的 block 且 type 未变，返回回复中的 block 列表。"""
+    blocks = reply.get("document", {}).get("body") if isinstance(reply, Mapping) else None
+    if not isinstance(blocks, list):
+        raise ValueError("reply has no document.body list")
+    sent_types = {b.get("id"): b.get("type") for b in sent if isinstance(b, Mapping)}
+    for block in blocks:
+        if not isinstance(block, Mapping) or block.get("id") not in sent_types:
+            raise ValueError(f"reply contains a block not in the chunk: {block!r:.80}")
+        if block.get("type") != sent_types[block["id"]]:
+            raise ValueError(f"reply changed the type of block {block['id']!r}")
+    return blocks
+
+
+def _run_chunk(client, system: str, prompt: str, sent: list, retries: int, backoff: float, index: int):
+    """发送一个块并按需重试；返回 (回复 block 列表, 调用次数)。"""
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(backoff * 2 ** (attempt - 1))
+        try:
+            with instrumentation.span("llm.request", chunk=index, attempt=attempt):
+                text = client.complete(system, prompt)
+            return _check_reply(extract_json(text), sent), attempt + 1
+        except Exception as exc:  # any client or reply failure is retried
+            error = exc
+    raise RuntimeError(f"chunk {index + 1} failed after {retries + 1} attempts: {error}") from error
+
+
+def edit_ai_view(
+    view: dict,
+    instruction: str,
+    client,
+    *,
+    max_parallel: int = DEFAULT_PARALLEL,
+    chunk_chars: int = DEFAULT_CHUNK_CHARS,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = 1.0,
+    system_prompt: str | None = None,
+    strict: bool = True,
+    cache=None,
+) -> tuple[dict, EditStats]:
+    """把 *instruction* 分块并发地应用到 AI 视图 *view*，返回 (修改后的视图, 统计)。
+
+    The returned view has *view*'s header and, in document order, the
+    cached and returned blocks.  With ``strict=False`` a chunk that still
+    fails after its retries keeps its original blocks instead of raising
+    :class:`RuntimeError`.  *cache* is an optional
+    :class:`~word_ast.llm.cache.EditCache`.
+    """
+    system = load_system_prompt() if system_prompt is None else system_prompt
+    version = prompt_version(system)
+    body = list(view.get("document", {}).get("body", []))
+    stats = EditStats()
+    results: dict[int, object] = {}
+    position = {id(block): i for i, block in enumerate(body)}
+    pending = []
+    for i, block in enumerate(body):
+        hit = cache.get(block, instruction, version) if cache is not None and isinstance(block, Mapping) else None
+        if hit is not None:
+            results[i] = hit
+            stats.cached += 1
+        else:
+            pending.append(block)
+
+    chunks = chunk_blocks(pending, chunk_chars)
+    stats.chunks = len(chunks)
+    jobs = [
+        (index, blocks, _build_prompt(
+            instruction, view, blocks, index, len(chunks),
+            position[id(blocks[0])], position[id(blocks[-1])],
+        ))
+        for index, blocks in enumerate(chunks)
+    ]
+
+    with instrumentation.span("llm.edit", chunks=len(chunks), cached=stats.cached, parallel=max_parallel):
+        with ThreadPoolExecutor(max(1, max_parallel), thread_name_prefix="word-ast-llm") as pool:
+            futures = [
+                pool.submit(_run_chunk, client, system, prompt, blocks, retries, backoff, index)
+                for index, blocks, prompt in jobs
+            ]
+            for (index, blocks, _), future in zip(jobs, futures):
+                try:
+                    reply, calls = future.result()
+                except RuntimeError:
+                    if strict:
+                        for other in futures:
+                            other.cancel()
+                        raise
+                    stats.requests += retries + 1
+                    stats.retries += retries
+                    stats.failed += 1
+                    for block in blocks:
+                        results[position[id(block)]] = block
+                    continue
+                stats.requests += calls
+                stats.retries += calls - 1
+                sent = {b.get("id"): b for b in blocks if isinstance(b, Mapping)}
+                for block in reply:
+                    original = sent[block["id"]]
+                    results[position[id(original)]] = block
+                    if cache is not None:
+                        cache.put(original, block, instruction, version)
+        if cache is not None:
+            cache.commit()
+
+    document = {**view.get("document", {}), "body": [results[i] for i in sorted(results)]}
+    return {**view, "document": document}, stats
+
+
+def edit_document(full_ast, instruction: str, client, **options) -> tuple[dict, EditStats]:
+    """对完整 AST 执行分块编辑并经 :func:`merge_ai_edits` 合并，返回 (合并结果, 统计)。
+
+    *options* are forwarded to :func:`edit_ai_view`.
+    """
+    edited_view, stats = edit_ai_view(to_ai_view(full_ast), instruction, client, **options)
+    return merge_ai_edits(full_ast, edited_view), stats
@@ -0,0 +1,154 @@
+"""AI 视图的 token 占用报告：按 block、字段与节点类型估算 token 数。
+
+Token-footprint report for the AI view.
+
+:func:`token_report` serializes the view the way it is sent to the model
+(``json.dumps(..., ensure_ascii=False)``) and counts tokens three ways:
+
+- **per block** — each body block as a whole;
+- **per field** — ``"<key>": <value>`` pairs grouped by owning node and
+  key, e.g. ``Text.overrides`` or ``Paragraph.default_run``; a field
+  includes everything nested under it, so nested fields overlap;
+- **per node type** — each node's own keys and punctuation, excluding
+  its child nodes, so node types add up to (about) the body total.
+
+Nodes are dicts with a ``type`` plus table rows and cells (``Row`` /
+``Cell``); untyped paragraph content items (compact views) count as
+``Text``.  Counts come from a pluggable tokenizer — any callable
+``str -> int`` — and default to :func:`estimate_tokens`, a heuristic
+close to common BPE tokenizers: one token per CJK character and about
+four characters per token for everything else.
+"""
+import json
+import math
+import re
+from collections.abc import Callable, Mapping
+
+from word_ast.ai_view import json_default
+
+Tokenizer = Callable[[str], int]
+
+# CJK ideographs, kana, hangul and full-width punctuation: ~1 token each
+_CJK = re.compile(r"[　-〿぀-ヿ㐀-䶿一-鿿가-힯豈-﫿＀-￯]")
+_CHARS_PER_TOKEN = 4
+
+_CHILD_LABELS = {"rows": "Row", "cells": "Cell"}
+
+
+def estimate_tokens(text: str) -> int:
+    """启发式 token 估算：CJK 字符各计 1，其余字符约 4 个计 1。"""
+    cjk = len(_CJK.findall(text))
+    return cjk + math.ceil((len(text) - cjk) / _CHARS_PER_TOKEN)
+
+
+def load_tokenizer(spec: str | None = None) -> Tokenizer:
+    """按 ``"heuristic"``（默认）或 ``"tiktoken:<encoding>"`` 返回 token 计数函数。"""
+    if spec in (None, "", "heuristic"):
+        return estimate_tokens
+    name, _, encoding = spec.partition(":")
+    if name != "tiktoken":
+        raise ValueError(f"unknown tokenizer {spec!r}; expected 'heuristic' or 'tiktoken:<encoding>'")
+    try:
+        import tiktoken
+    except ImportError as exc:
+        raise ImportError("tokenizer 'tiktoken' needs the tiktoken package (pip install tiktoken)") from exc
+    enc = tiktoken.get_encoding(encoding or "cl100k_base")
+    return lambda text: len(enc.encode(text, disallowed_special=()))
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=json_default)
+
+
+class TokenReport:
+    """token 占用报告。
+
+    ``total`` is the whole view, ``header`` everything but the body,
+    ``blocks`` a list of ``(block id, type, tokens)`` in document order,
+    ``by_type`` maps node type to ``[count, tokens]`` and ``by_field``
+    maps ``<node type>.<key>`` to ``[count, tokens]``.
+    """
+
+    __slots__ = ("total", "header", "blocks", "by_type", "by_field")
+
+    def __init__(self):
+        self.total = 0
+        self.header = 0
+        self.blocks: list[tuple[str | None, str | None, int]] = []
+        self.by_type: dict[str, list[int]] = {}
+        self.by_field: dict[str, list[int]] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "header": self.header,
+            "blocks": [{"id": i, "type": t, "tokens": n} for i, t, n in self.blocks],
+            "by_type": {k: {"count": c, "tokens": n} for k, (c, n) in self.by_type.items()},
+            "by_field": {k: {"count": c, "tokens": n} for k, (c, n) in self.by_field.items()},
+        }
+
+    def format(self, top: int = 10) -> str:
+        """返回可读的文本报告（每个分组列出 token 最多的 *top* 项）。"""
+        def pct(n: int) -> str:
+            return f"{n / self.total:6.1%}" if self.total else "   n/a"
+
+        body = self.total - self.header
+        lines = [
+            f"AI view tokens : {self.total}",
+            f"  header       : {self.header:>8} {pct(self.header)}",
+            f"  body         : {body:>8} {pct(body)} ({len(self.blocks)} blocks)",
+            "",
+            "By node type (exclusive):",
+        ]
+        for name, (count, tokens) in sorted(self.by_type.items(), key=lambda kv: -kv[1][1])[:top]:
+            lines.append(f"  {name:<24} {tokens:>8} {pct(tokens)}  x{count}")
+        lines += ["", "By field (inclusive):"]
+        for name, (count, tokens) in sorted(self.by_field.items(), key=lambda kv: -kv[1][1])[:top]:
+            lines.append(f"  {name:<24} {tokens:>8} {pct(tokens)}  x{count}")
+        lines += ["", "Largest blocks:"]
+        for block_id, block_type, tokens in sorted(self.blocks, key=lambda b: -b[2])[:top]:
+            lines.append(f"  {str(block_id):<24} {tokens:>8} {pct(tokens)}  {block_type}")
+        return "\n".join(lines)
+
+
+def _add(table: dict, key: str, tokens: int) -> None:
+    entry = table.setdefault(key, [0, 0])
+    entry[0] += 1
+    entry[1] += tokens
+
+
+def _walk(node: Mapping, label: str, inclusive: int, count: Tokenizer, report: TokenReport) -> None:
+    """累计 *node* 的字段 token 与排除子节点后的自身 token。"""
+    children = 0
+    for key, value in node.items():
+        _add(report.by_field, f"{label}.{key}", count(f"{_dumps(key)}: {_dumps(value)}"))
+        items = value if isinstance(value, list) else [value]
+        for item in items:
+            if not isinstance(item, Mapping):
+                continue
+            child_label = item.get("type") or _CHILD_LABELS.get(key)
+            if child_label is None and label == "Paragraph" and key == "content":
+                child_label = "Text"  # compact views omit the default item type
+            if child_label is None:
+                continue  # a format dict such as overrides: part of this node
+            child_tokens = count(_dumps(item))
+            children += child_tokens
+            _walk(item, child_label, child_tokens, count, report)
+    _add(report.by_type, label, inclusive - children)
+
+
+def token_report(view: Mapping, tokenizer: Tokenizer | None = None) -> TokenReport:
+    """估算 AI 视图 *view* 的 token 占用，返回 :class:`TokenReport`。"""
+    count = tokenizer or estimate_tokens
+    report = TokenReport()
+    report.total = count(_dumps(view))
+    document = view.get("document", {})
+    body = document.get("body", [])
+    report.header = count(_dumps({**view, "document": {**document, "body": []}}))
+    for block in body:
+        if not isinstance(block, Mapping):
+            continue
+        tokens = count(_dumps(block))
+        report.blocks.append((block.get("id"), block.get("type"), tokens))
+        _walk(block, block.get("type") or "Block", tokens, count, report)
+    return report
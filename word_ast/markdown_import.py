@@ -0,0 +1,428 @@
+"""Markdown → AST 快速导入：从零创建模式下让 LLM 输出 Markdown 而不是完整 AST JSON。
+
+Markdown importer for create mode.
+
+:func:`markdown_to_ast` converts a Markdown document into the AST that
+:func:`~word_ast.render_ast` consumes (no ``_raw_*`` fields), so a model
+creating a document can write a few lines of Markdown instead of the
+verbose JSON of ``docs/AI_PROMPT.md``.  Supported syntax (stdlib only):
+
+- ATX (``# 标题``) and setext (``===`` / ``---`` underlined) headings;
+- paragraphs — soft line breaks join lines (without a space between CJK
+  characters), two trailing spaces or ``\\`` force a line break;
+- ``**bold**``, ``*italic*``, ``***both***`` (also with ``_``),
+  ```code```, ``~~strike~~`` (rendered as plain text), links (text only),
+  backslash escapes;
+- bullet and ordered lists (nesting by indentation), block quotes,
+  fenced code blocks — one paragraph per line;
+- GFM pipe tables with column alignment;
+- images by path, ``![alt](figure.png)`` — relative to *base_dir*, scaled
+  down to the text width;
+- a line ``[TOC]`` for a table of contents.
+
+Which style each construct gets comes from a *style map*: element key →
+style id, or an object ``{"style": ..., "paragraph_format": {...},
+"overrides": {...}}`` whose ``overrides`` apply to every run of the
+element.  Entries given by the caller replace the entries of
+:data:`DEFAULT_STYLE_MAP`; nested list levels use ``bullet_list2``,
+``bullet_list3``… and fall back to the deepest level defined.  Every
+style id used that exists in the default python-docx template is written
+to ``document.styles`` with its name, so the renderer looks styles up by
+name.
+"""
+import base64
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from docx import Document
+from docx.image.exceptions import UnrecognizedImageError
+from docx.image.image import Image
+
+from word_ast.parser.style_parser import parse_styles
+
+DEFAULT_PAGE = {
+    "width": 11906,
+    "height": 16838,
+    "margin": {"top": 1440, "bottom": 1440, "left": 1800, "right": 1800},
+}
+
+DEFAULT_STYLE_MAP: dict = {
+    **{f"heading{n}": f"Heading{n}" for n in range(1, 7)},
+    "paragraph": "Normal",
+    "bullet_list": "ListBullet",
+    "bullet_list2": "ListBullet2",
+    "bullet_list3": "ListBullet3",
+    "ordered_list": "ListNumber",
+    "ordered_list2": "ListNumber2",
+    "ordered_list3": "ListNumber3",
+    "quote": "Quote",
+    "code_block": {"style": "NoSpacing", "overrides": {"font_ascii": "Consolas"}},
+    "code": {"overrides": {"font_ascii": "Consolas"}},
+    "image": {"style": "Normal", "paragraph_format": {"alignment": "center"}},
+    "table": "TableGrid",
+    "table_header": {"overrides": {"bold": True}},
+    "table_cell": {},
+}
+
+_TWIPS_PER_INCH = 1440
+
+_CJK = re.compile(r"[　-〿぀-ヿ㐀-䶿一-鿿가-힯豈-﫿＀-￯]")
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_HEADING = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+_SETEXT = re.compile(r"^ {0,3}(=+|-+)[ \t]*$")
+_RULE = re.compile(r"^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+_LIST_ITEM = re.compile(r"^([ \t]*)([-*+]|\d{1,9}[.)])[ \t]+(.*)$")
+_QUOTE = re.compile(r"^ {0,3}>[ \t]?(.*)$")
+_TABLE_RULE = re.compile(r"^[ \t]*\|?[ \t]*:?-+:?[ \t]*(\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$")
+_TOC = re.compile(r"^[ \t]*\[TOC\][ \t]*$", re.IGNORECASE)
+
+_INLINE = re.compile(r"""
+    \\(?P<esc>[\\`*_{}\[\]()#+\-.!|~>])
+  | (?P<ticks>`+)(?P<code>.+?)(?P=ticks)
+  | !\[(?P<alt>[^\]]*)\]\((?P<src>[^)\s]+)(?:[ \t]+"[^"]*")?\)
+  | \[(?P<label>[^\]]+)\]\([^)]*\)
+  | (?P<d3>\*\*\*|(?<![0-9A-Za-z])___)(?P<t3>\S(?:.*?\S)?)(?P=d3)
+  | (?P<d2>\*\*|(?<![0-9A-Za-z])__)(?P<t2>\S(?:.*?\S)?)(?P=d2)
+  | (?P<d1>\*|(?<![0-9A-Za-z])_)(?P<t1>\S(?:.*?\S)?)(?P=d1)
+  | ~~(?P<strike>.+?)~~
+""", re.VERBOSE)
+
+
+@lru_cache(maxsize=1)
+def _template_styles() -> dict:
+    """默认模板（``render_ast`` 新建文档所用）的样式表。"""
+    return parse_styles(Document())
+
+
+def load_style_map(path: str | Path) -> dict:
+    """读取 JSON 样式映射文件。"""
+    style_map = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(style_map, dict):
+        raise ValueError(f"style map {path} must be a JSON object")
+    return style_map
+
+
+def _entry(style_map: dict, key: str) -> dict:
+    """样式映射中 *key* 的规范形式 ``{"style", "paragraph_format", "overrides"}``。"""
+    value = style_map.get(key)
+    if isinstance(value, str):
+        value = {"style": value}
+    elif value is None:
+        value = {}
+    elif not isinstance(value, dict):
+        raise ValueError(f"style map entry {key!r} must be a style id or an object")
+    return {
+        "style": value.get("style"),
+        "paragraph_format": dict(value.get("paragraph_format") or {}),
+        "overrides": dict(value.get("overrides") or {}),
+    }
+
+
+def _join_lines(lines: list[str]) -> str:
+    """按 Markdown 软换行规则拼接段落的各行。"""
+    text = ""
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if i:
+            if line_break:
+                text += "\n"
+            elif not (text and stripped and _CJK.match(text[-1]) and _CJK.match(stripped[0])):
+                text += " "
+        line_break = line.endswith("  ") or stripped.endswith("\\")
+        text += stripped[:-1] if stripped.endswith("\\") else stripped
+    return text
+
+
+class _Builder:
+    """逐个生成 block，负责 id 编号、样式与行内格式。"""
+
+    def __init__(self, style_map: dict, base_dir: Path, text_width: int):
+        self.style_map = style_map
+        self.base_dir = base_dir
+        self.text_width = text_width
+        self.body: list[dict] = []
+        self._counts = {"p": 0, "t": 0, "toc": 0}
+
+    def _next_id(self, prefix: str) -> str:
+        n = self._counts[prefix]
+        self._counts[prefix] += 1
+        return f"{prefix}{n}"
+
+    # -- inline --------------------------------------------------------------
+
+    def _image(self, src: str) -> dict:
+        path = Path(src)
+        if not path.is_absolute():
+            path = self.base_dir / path
+        if not path.is_file():
+            raise FileNotFoundError(f"image not found: {src!r} (looked for {path.resolve()})")
+        blob = path.read_bytes()
+        try:
+            image = Image.from_blob(blob)
+        except UnrecognizedImageError as exc:
+            raise ValueError(f"unsupported image format: {src!r}") from exc
+        width = image.px_width * _TWIPS_PER_INCH // (image.horz_dpi or 96)
+        height = image.px_height * _TWIPS_PER_INCH // (image.vert_dpi or 96)
+        if width > self.text_width:
+            width, height = self.text_width, height * self.text_width // width
+        return {
+            "type": "InlineImage",
+            "data": base64.b64encode(blob).decode("ascii"),
+            "content_type": image.content_type,
+            "width": width,
+            "height": height,
+        }
+
+    def _inline(self, text: str, overrides: dict, out: list) -> None:
+        pos = 0
+        for match in _INLINE.finditer(text):
+            if match.start() > pos:
+                self._add_text(out, text[pos:match.start()], overrides)
+            pos = match.end()
+            if match.group("esc") is not None:
+                self._add_text(out, match.group("esc"), overrides)
+            elif match.group("ticks") is not None:
+                code = {**overrides, **_entry(self.style_map, "code")["overrides"]}
+                self._add_text(out, match.group("code").strip(), code)
+            elif match.group("src") is not None:
+                out.append(self._image(match.group("src")))
+            elif match.group("label") is not None:
+                self._inline(match.group("label"), overrides, out)
+            elif match.group("t3") is not None:
+                self._inline(match.group("t3"), {**overrides, "bold": True, "italic": True}, out)
+            elif match.group("t2") is not None:
+                self._inline(match.group("t2"), {**overrides, "bold": True}, out)
+            elif match.group("t1") is not None:
+                self._inline(match.group("t1"), {**overrides, "italic": True}, out)
+            else:
+                self._inline(match.group("strike"), overrides, out)
+        if pos < len(text):
+            self._add_text(out, text[pos:], overrides)
+
+    @staticmethod
+    def _add_text(out: list, text: str, overrides: dict) -> None:
+        if not text:
+            return
+        last = out[-1] if out else None
+        if last is not None and last["type"] == "Text" and last.get("overrides", {}) == overrides:
+            last["text"] += text
+            return
+        item = {"type": "Text", "text": text}
+        if overrides:
+            item["overrides"] = dict(overrides)
+        out.append(item)
+
+    # -- blocks --------------------------------------------------------------
+
+    def paragraph(self, key: str, text: str, block_id: str | None = None,
+                  extra_format: dict | None = None, run_overrides: dict | None = None) -> dict:
+        entry = _entry(self.style_map, key)
+        content: list = []
+        self._inline(text, {**entry["overrides"], **(run_overrides or {})}, content)
+        block = {"id": block_id or self._next_id("p"), "type": "Paragraph"}
+        if content and all(item["type"] == "InlineImage" for item in content):
+            image = _entry(self.style_map, "image")
+            entry = {
+                "style": image["style"] or entry["style"],
+                "paragraph_format": {**entry["paragraph_format"], **image["paragraph_format"]},
+            }
+        if entry["style"]:
+            block["style"] = entry["style"]
+        paragraph_format = {**entry["paragraph_format"], **(extra_format or {})}
+        if paragraph_format:
+            block["paragraph_format"] = paragraph_format
+        block["content"] = content
+        if block_id is None:
+            self.body.append(block)
+        return block
+
+    def code_line(self, line: str) -> None:
+        entry = _entry(self.style_map, "code_block")
+        block = {"id": self._next_id("p"), "type": "Paragraph"}
+        if entry["style"]:
+            block["style"] = entry["style"]
+        if entry["paragraph_format"]:
+            block["paragraph_format"] = entry["paragraph_format"]
+        block["content"] = []
+        self._add_text(block["content"], line, entry["overrides"])
+        self.body.append(block)
+
+    def list_item(self, ordered: bool, level: int, text: str) -> None:
+        base = "ordered_list" if ordered else "bullet_list"
+        key = base
+        for n in range(level + 1, 1, -1):
+            if f"{base}{n}" in self.style_map:
+                key = f"{base}{n}"
+                break
+        self.paragraph(key, text)
+
+    def table(self, rows: list[list[str]], alignments: list[str | None]) -> None:
+        table_id = self._next_id("t")
+        entry = _entry(self.style_map, "table")
+        result_rows = []
+        for r, cells in enumerate(rows):
+            key = "table_header" if r == 0 else "table_cell"
+            result_cells = []
+            for c, alignment in enumerate(alignments):
+                cell_id = f"{table_id}.r{r}c{c}"
+                text = cells[c] if c < len(cells) else ""
+                paragraph = self.paragraph(
+                    key, text, block_id=f"{cell_id}.p0",
+                    extra_format={"alignment": alignment} if alignment else None,
+                )
+                result_cells.append({"id": cell_id, "col_span": 1, "row_span": 1, "content": [paragraph]})
+            result_rows.append({"cells": result_cells})
+        block = {"id": table_id, "type": "Table"}
+        if entry["style"]:
+            block["style"] = entry["style"]
+        block["rows"] = result_rows
+        self.body.append(block)
+
+    def toc(self) -> None:
+        self.body.append({"id": self._next_id("toc"), "type": "TOC"})
+
+
+def _iter_blocks(body: list[dict]):
+    """产出 body 中的 block 与表格单元格内的段落。"""
+    for block in body:
+        yield block
+        for row in block.get("rows", []):
+            for cell in row.get("cells", []):
+                yield from cell.get("content", [])
+
+
+def _split_row(line: str) -> list[str]:
+    """拆分表格行（支持 ``\\|`` 转义）。"""
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip() for cell in re.split(r"(?<!\\)\|", line)]
+
+
+def _alignment(rule: str) -> str | None:
+    rule = rule.strip()
+    if rule.startswith(":") and rule.endswith(":"):
+        return "center"
+    if rule.endswith(":"):
+        return "right"
+    if rule.startswith(":"):
+        return "left"
+    return None
+
+
+def markdown_to_ast(
+    text: str,
+    *,
+    style_map: dict | None = None,
+    base_dir: str | Path = ".",
+    page: dict | None = None,
+) -> dict:
+    """把 Markdown 文本转换为可直接交给 ``render_ast`` 的 AST（从零创建模式）。
+
+    *style_map* entries replace those of :data:`DEFAULT_STYLE_MAP`;
+    image paths are resolved against *base_dir*; *page* overrides
+    :data:`DEFAULT_PAGE` (twips).
+    """
+    page = page or DEFAULT_PAGE
+    margin = page.get("margin", {})
+    text_width = page.get("width", 11906) - margin.get("left", 0) - margin.get("right", 0)
+    builder = _Builder({**DEFAULT_STYLE_MAP, **(style_map or {})}, Path(base_dir), text_width)
+
+    lines = text.expandtabs(4).replace("\r\n", "\n").split("\n")
+    # The open leaf block: (kind, argument, lines)
+    pending: list = [None, None, []]
+    # Indentation of the enclosing list items; its length is the nesting level
+    list_indents: list[int] = []
+
+    def flush() -> None:
+        kind, arg, buf = pending
+        if kind == "paragraph":
+            builder.paragraph("paragraph", _join_lines(buf))
+        elif kind == "quote":
+            builder.paragraph("quote", _join_lines(buf))
+        elif kind == "list":
+            ordered, level = arg
+            builder.list_item(ordered, level, _join_lines(buf))
+        pending[:] = [None, None, []]
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        if not line.strip():
+            flush()
+            continue
+        fence = _FENCE.match(line)
+        if fence:
+            flush()
+            marker = fence.group(1)
+            while i < len(lines) and not lines[i].strip().startswith(marker):
+                builder.code_line(lines[i])
+                i += 1
+            i += 1
+            continue
+        if pending[0] == "paragraph" and _SETEXT.match(line):
+            level = 1 if line.strip().startswith("=") else 2
+            builder.paragraph(f"heading{level}", _join_lines(pending[2]))
+            pending[:] = [None, None, []]
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            flush()
+            builder.paragraph(f"heading{len(heading.group(1))}", heading.group(2) or "")
+            continue
+        if _TOC.match(line):
+            flush()
+            builder.toc()
+            continue
+        if _RULE.match(line):
+            flush()
+            continue
+        if "|" in line and i < len(lines) and _TABLE_RULE.match(lines[i]) and "-" in lines[i]:
+            flush()
+            header = _split_row(line)
+            alignments = [_alignment(rule) for rule in _split_row(lines[i])]
+            alignments = (alignments + [None] * len(header))[:len(header)]
+            rows = [header]
+            i += 1
+            while i < len(lines) and lines[i].strip() and "|" in lines[i]:
+                rows.append(_split_row(lines[i]))
+                i += 1
+            builder.table(rows, alignments)
+            continue
+        item = _LIST_ITEM.match(line)
+        if item:
+            flush()
+            indent = len(item.group(1))
+            while list_indents and list_indents[-1] >= indent:
+                list_indents.pop()
+            ordered = item.group(2)[0].isdigit()
+            pending[:] = ["list", (ordered, len(list_indents)), [item.group(3)]]
+            list_indents.append(indent)
+            continue
+        if pending[0] != "list" or not line[:1].isspace():
+            list_indents.clear()
+        quote = _QUOTE.match(line)
+        if quote:
+            if pending[0] != "quote":
+                flush()
+                pending[:] = ["quote", None, []]
+            pending[2].append(quote.group(1))
+            continue
+        if pending[0] is None:
+            pending[0] = "paragraph"
+        pending[2].append(line)  # a paragraph line or a lazy continuation
+    flush()
+
+    template = _template_styles()
+    used = {block.get("style") for block in _iter_blocks(builder.body)}
+    styles = {style_id: dict(template[style_id]) for style_id in sorted(used - {None}) if style_id in template}
+    return {
+        "schema_version": "1.0",
+        "document": {"meta": {"page": page}, "styles": styles, "body": builder.body},
+    }
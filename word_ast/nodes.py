@@ -0,0 +1,295 @@
+"""可选的类型化 AST 节点层：``__slots__`` 类 + 字符串驻留。
+
+Optional typed node layer for the AST.
+
+The plain dict AST repeats the same keys ("type", "text", "overrides",
+"content", ...) in every node and pays per-dict overhead for each run,
+paragraph and cell.  The classes here store the same data in
+``__slots__``: the ``type`` key is a class constant, absent keys cost
+nothing, and repeated string values (style ids, font names, colours and
+``_raw_*`` XML, which is usually shared by many runs) are deduplicated
+through a per-document string pool.
+
+Every node is a :class:`~collections.abc.MutableMapping` with the same
+keys as its dict counterpart, so code written against the dict AST —
+``block.get("type")``, ``block["content"]``, ``del piece["overrides"]`` —
+works unchanged, and ``node == dict_node`` compares by content.  Keys not
+known to a class are kept in a per-node overflow dict, so conversion is
+lossless in both directions:
+
+    typed = ast_from_dict(ast)          # or parse_docx(path, typed=True)
+    assert ast_to_dict(typed) == ast
+
+Only body nodes are typed; the AST header (meta, styles, passthrough) and
+the small format dicts (``overrides``, ``paragraph_format``,
+``default_run``) stay plain dicts.  Keys iterate in the order the parser
+emits them, followed by overflow keys in insertion order.
+
+Typed ASTs are accepted by ``to_ai_view``, ``merge_ai_edits`` and
+``render_ast``; pass :func:`json_default` as ``default=`` to
+``json.dump`` (the serializers in :mod:`word_ast.serializers` do) to
+write them without converting first.
+"""
+import copy
+import sys
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+
+_UNSET = object()
+
+# Keys whose string values are pooled.  ``text`` and image ``data`` are
+# mostly unique, so pooling them would cost a hash lookup for nothing.
+_POOLED_KEYS = frozenset({
+    "style", "content_type", "instruction",
+    "_raw_rPr", "_raw_pPr", "_raw_tblPr", "_raw_trPr", "_raw_tcPr",
+    "font_ascii", "font_east_asia", "color", "alignment",
+})
+
+
+def _pooled(value, pool: dict):
+    if type(value) is str:
+        return pool.setdefault(value, value)
+    return value
+
+
+def _pool_dict(d: dict, pool: dict) -> dict:
+    return {
+        sys.intern(k): _pooled(v, pool) if k in _POOLED_KEYS else v
+        for k, v in d.items()
+    }
+
+
+class Node(MutableMapping):
+    """所有类型化节点的基类（dict 兼容接口）。
+
+    Subclasses set ``TYPE`` (the value of the ``type`` key, or ``None`` for
+    nodes without one), ``FIELDS`` (keys in emitted order; ``"type"`` marks
+    where the constant type key appears) and ``__slots__`` for every field
+    except ``type``.  Unset slots mean "key absent".
+    """
+
+    __slots__ = ("_extra",)
+    TYPE: str | None = None
+    FIELDS: tuple[str, ...] = ()
+    _SLOTS: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._SLOTS = frozenset(f for f in cls.FIELDS if f != "type")
+
+    def __init__(self, **fields):
+        self._extra = None
+        for key, value in fields.items():
+            self[key] = value
+
+    # -- Mapping protocol ---------------------------------------------------
+
+    def __getitem__(self, key):
+        if key in self._SLOTS:
+            value = getattr(self, key, _UNSET)
+            if value is not _UNSET:
+                return value
+        elif key == "type" and self.TYPE is not None:
+            return self.TYPE
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._SLOTS:
+            setattr(self, key, value)
+        elif key == "type" and self.TYPE is not None:
+            if value != self.TYPE:
+                raise ValueError(f"cannot change type of {self.TYPE} node to {value!r}")
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._SLOTS:
+            if getattr(self, key, _UNSET) is _UNSET:
+                raise KeyError(key)
+            delattr(self, key)
+        elif key == "type" and self.TYPE is not None:
+            raise KeyError(f"the type key of a {self.TYPE} node cannot be deleted")
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.FIELDS:
+            if key == "type" or getattr(self, key, _UNSET) is not _UNSET:
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key) -> bool:
+        if key in self._SLOTS:
+            return getattr(self, key, _UNSET) is not _UNSET
+        if key == "type":
+            return self.TYPE is not None
+        return self._extra is not None and key in self._extra
+
+    def __deepcopy__(self, memo):
+        new = self.__class__.__new__(self.__class__)
+        new._extra = copy.deepcopy(self._extra, memo)
+        for key in self._SLOTS:
+            value = getattr(self, key, _UNSET)
+            if value is not _UNSET:
+                setattr(new, key, value if type(value) is str else copy.deepcopy(value, memo))
+        return new
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+    # -- Conversion ---------------------------------------------------------
+
+    def as_dict(self) -> dict:
+        """浅转换：本节点变为 dict，子节点保持原样。"""
+        return dict(self.items())
+
+    def to_dict(self) -> dict:
+        """深转换为普通 dict AST 节点。"""
+        return to_dict(self)
+
+    @classmethod
+    def _from_dict(cls, d: Mapping, pool: dict) -> "Node":
+        node = cls.__new__(cls)
+        node._extra = None
+        for key, value in d.items():
+            factory = _CHILD_FACTORIES.get(key)
+            if factory is not None:
+                if type(value) is list:
+                    value = [factory(item, pool) for item in value]
+                elif type(value) is dict:
+                    value = factory(value, pool)
+            elif key in _FORMAT_KEYS and type(value) is dict:
+                value = _pool_dict(value, pool)
+            elif key in _POOLED_KEYS:
+                value = _pooled(value, pool)
+            node[key] = value
+        return node
+
+
+class Paragraph(Node):
+    __slots__ = ("id", "style", "content", "paragraph_format", "default_run")
+    TYPE = "Paragraph"
+    FIELDS = ("id", "type", "style", "content", "paragraph_format", "default_run")
+
+
+class Text(Node):
+    __slots__ = ("text", "overrides")
+    TYPE = "Text"
+    FIELDS = ("type", "text", "overrides")
+
+
+class InlineImage(Node):
+    __slots__ = ("data", "content_type", "width", "height")
+    TYPE = "InlineImage"
+    FIELDS = ("type", "data", "content_type", "width", "height")
+
+
+class Table(Node):
+    __slots__ = ("id", "style", "rows", "_raw_tblPr")
+    TYPE = "Table"
+    FIELDS = ("id", "type", "style", "rows", "_raw_tblPr")
+
+
+class Row(Node):
+    __slots__ = ("cells", "_raw_trPr")
+    FIELDS = ("cells", "_raw_trPr")
+
+
+class Cell(Node):
+    __slots__ = ("id", "content", "col_span", "row_span", "_raw_tcPr")
+    FIELDS = ("id", "content", "col_span", "row_span", "_raw_tcPr")
+
+
+class TOC(Node):
+    __slots__ = ("id", "instruction", "title")
+    TYPE = "TOC"
+    FIELDS = ("id", "type", "instruction", "title")
+
+
+NODE_TYPES: dict[str, type[Node]] = {
+    cls.TYPE: cls for cls in (Paragraph, Text, InlineImage, Table, TOC)
+}
+
+_FORMAT_KEYS = frozenset({"overrides", "paragraph_format", "default_run"})
+
+
+def _typed(cls: type[Node]):
+    def factory(value, pool: dict):
+        return cls._from_dict(value, pool) if type(value) is dict else value
+    return factory
+
+
+# Keys holding typed children (a node or a list of nodes) → converter.
+# ``content`` holds runs in a paragraph and paragraphs in a cell, so it
+# dispatches on the child's ``type``.
+_CHILD_FACTORIES = {
+    "content": lambda value, pool: from_dict(value, pool),
+    "title": lambda value, pool: from_dict(value, pool),
+    "rows": _typed(Row),
+    "cells": _typed(Cell),
+}
+
+
+def from_dict(obj, pool: dict | None = None):
+    """把一个 dict 节点（及其子节点）转换为类型化节点。
+
+    Dicts whose ``type`` has no node class (and non-dict values) are
+    returned unchanged.  *pool* is the string-deduplication table; share
+    one pool across a document to deduplicate between blocks.
+    """
+    if type(obj) is not dict:
+        return obj
+    cls = NODE_TYPES.get(obj.get("type"))
+    if cls is None:
+        return obj
+    return cls._from_dict(obj, {} if pool is None else pool)
+
+
+def to_dict(obj):
+    """深转换：类型化节点（含嵌套）→ 普通 dict；其他值原样返回。"""
+    if isinstance(obj, Node):
+        return {key: to_dict(value) for key, value in obj.items()}
+    if type(obj) is list:
+        return [to_dict(item) for item in obj]
+    return obj
+
+
+def typed_blocks(blocks: Iterable[dict], pool: dict | None = None) -> Iterator:
+    """逐个转换 body block（共享字符串池）。"""
+    pool = {} if pool is None else pool
+    for block in blocks:
+        yield from_dict(block, pool)
+
+
+def ast_from_dict(ast: dict) -> dict:
+    """返回 body 为类型化节点的新 AST（头部浅拷贝共享）。"""
+    document = dict(ast.get("document", {}))
+    document["body"] = list(typed_blocks(document.get("body", [])))
+    result = dict(ast)
+    result["document"] = document
+    return result
+
+
+def ast_to_dict(ast: dict) -> dict:
+    """返回 body 为普通 dict 的新 AST。"""
+    document = dict(ast.get("document", {}))
+    document["body"] = [to_dict(block) for block in document.get("body", [])]
+    result = dict(ast)
+    result["document"] = document
+    return result
+
+
+def json_default(obj):
+    """``json.dump(..., default=json_default)``：类型化节点按需逐层展开。"""
+    if isinstance(obj, Node):
+        return obj.as_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -1,3 +1,5 @@
-from .document_parser import parse_docx
+from .document_parser import iter_parse_docx, parse_docx
+from .lazy_document import LazyDocument
+from .text_extractor import extract_text
 
-__all__ = ["parse_docx"]
+__all__ = ["parse_docx", "iter_parse_docx", "LazyDocument", "extract_text"]
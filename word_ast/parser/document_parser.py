@@ -1,4 +1,4 @@
-import json
+from collections.abc import Iterator
 from pathlib import Path
 
 from docx import Document
@@ -6,6 +6,12 @@ from docx.oxml.ns import qn
 from docx.table import Table
 from docx.text.paragraph import Paragraph
 
+from word_ast import instrumentation
+from word_ast.nodes import typed_blocks
+from word_ast.serializers import DEFAULT_FORMAT, dump_ast, get_serializer
+
+from .options import DEFAULT_OPTIONS, ParseOptions
+from .parallel import iter_parallel_blocks
 from .paragraph_parser import parse_paragraph_block
 from .style_parser import parse_styles
 from .table_parser import parse_table_block
@@ -56,7 +62,7 @@ def _is_toc_sdt(sdt_el) -> bool:
     return False
 
 
-def _parse_toc_block(sdt_el, doc, block_id) -> dict:
+def _parse_toc_block(sdt_el, doc, block_id, options: ParseOptions = DEFAULT_OPTIONS) -> dict:
     """Parse a TOC SDT element into a ``TOC`` AST node."""
     sdt_content = sdt_el.find(qn("w:sdtContent"))
     _tag_p = qn("w:p")
@@ -103,7 +109,7 @@ def _parse_toc_block(sdt_el, doc, block_id) -> dict:
             paragraph = Paragraph(child, doc)
             # Only treat non-empty paragraphs as title
             if paragraph.text.strip():
-                title = parse_paragraph_block(paragraph, f"{block_id}.title")
+                title = parse_paragraph_block(paragraph, f"{block_id}.title", options)
                 break
 
     block: dict = {
@@ -116,61 +122,166 @@ def _parse_toc_block(sdt_el, doc, block_id) -> dict:
     return block
 
 
-def parse_docx(input_path: str | Path, output_dir: str | Path | None = None) -> dict:
-    doc = Document(str(input_path))
-    body = []
-    p_i = 0
-    t_i = 0
-    toc_i = 0
+def parse_docx(
+    input_path: str | Path,
+    output_dir: str | Path | None = None,
+    *,
+    format: str = DEFAULT_FORMAT,
+    typed: bool = False,
+    block_range: tuple[int, int | None] | None = None,
+    raw: bool = True,
+    images: bool = True,
+    text_only: bool = False,
+    workers: int | None = None,
+) -> dict:
+    """解析 docx 为完整 AST；给出 *output_dir* 时按 *format* 写出 ``document.ast.*``。
 
-    _tag_sdt = qn("w:sdt")
-    _tag_sdt_content = qn("w:sdtContent")
+    With *typed* the body holds ``__slots__`` nodes from
+    :mod:`word_ast.nodes` instead of dicts (same keys, less memory).
 
-    def _process_body_element(child):
-        nonlocal p_i, t_i
-        tag = child.tag.split("}")[-1]
-        if tag == "p":
-            paragraph = next((p for p in doc.paragraphs if p._p is child), None)
-            if paragraph is None:
-                paragraph = Paragraph(child, doc)
-            body.append(parse_paragraph_block(paragraph, f"p{p_i}"))
-            p_i += 1
-        elif tag == "tbl":
-            table = next((t for t in doc.tables if t._tbl is child), None)
-            if table is None:
-                table = Table(child, doc)
-            body.append(parse_table_block(table, f"t{t_i}"))
-            t_i += 1
+    Selective modes skip work at the source (see
+    :mod:`word_ast.parser.options`): *block_range* ``(start, stop)``
+    parses only top-level blocks ``start <= index < stop`` (ids are those
+    of a full parse), ``raw=False`` skips ``_raw_*`` capture,
+    ``images=False`` skips image payloads and ``text_only=True`` emits
+    paragraph text only.
 
-    for child in doc.element.body:
-        if child.tag == _tag_sdt:
-            if _is_toc_sdt(child):
-                body.append(_parse_toc_block(child, doc, f"toc{toc_i}"))
-                toc_i += 1
-            else:
-                sdt_content = child.find(_tag_sdt_content)
-                if sdt_content is not None:
-                    for inner in sdt_content:
-                        _process_body_element(inner)
-        elif child.tag == qn("w:sectPr"):
-            continue
-        else:
-            _process_body_element(child)
+    With *workers* > 1 the blocks are parsed in that many worker processes
+    (see :mod:`word_ast.parser.parallel`); the result is the same.
+    """
+    with instrumentation.span("parse_docx", path=str(input_path)):
+        ast, blocks = iter_parse_docx(
+            input_path, typed=typed, block_range=block_range,
+            raw=raw, images=images, text_only=text_only, workers=workers,
+        )
+        ast["document"]["body"] = list(blocks)
+
+    if output_dir:
+        out_dir = Path(output_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        serializer = get_serializer(format)
+        dump_ast(ast, out_dir / f"document.ast{serializer.suffix}", format)
+        (out_dir / "media").mkdir(exist_ok=True)
+
+    return ast
+
+
+def iter_parse_docx(
+    input_path: str | Path,
+    *,
+    typed: bool = False,
+    block_range: tuple[int, int | None] | None = None,
+    raw: bool = True,
+    images: bool = True,
+    text_only: bool = False,
+    workers: int | None = None,
+) -> tuple[dict, Iterator[dict]]:
+    """流式解析：返回 (不含 body 的 AST 头部, 按文档顺序产出 block 的迭代器)。
+
+    Streaming variant of :func:`parse_docx`.  Returns ``(ast, blocks)``
+    where *ast* is the complete AST skeleton (meta, styles, passthrough)
+    with an empty ``body`` list, and *blocks* lazily yields the body blocks
+    in document order with the same ids :func:`parse_docx` assigns.  Each
+    block is parsed only when the iterator reaches it, so consumers can
+    process and drop blocks one at a time.  With *typed* the blocks are
+    :mod:`word_ast.nodes` instances sharing one string pool.  The selective
+    options and *workers* are those of :func:`parse_docx`.
+    """
+    doc, ast = _load_document(input_path)
+    options = ParseOptions(raw=raw, images=images, text_only=text_only)
+    if workers is not None and workers > 1:
+        total = sum(1 for _ in _index_body(doc))
+        blocks = iter_parallel_blocks(
+            input_path, total, options, workers=workers, block_range=block_range
+        )
+    else:
+        blocks = _iter_body_blocks(doc, options, block_range)
+    return ast, typed_blocks(blocks) if typed else blocks
+
+
+def _load_document(input_path: str | Path) -> tuple:
+    """打开 docx 并构建 AST 头部骨架，返回 ``(doc, ast)``。"""
+    with instrumentation.span("parse.load"):
+        doc = Document(str(input_path))
+    with instrumentation.span("parse.styles"):
+        styles = parse_styles(doc)
 
     ast = {
         "schema_version": "1.0",
         "document": {
             "meta": _parse_meta(doc),
-            "styles": parse_styles(doc),
-            "body": body,
+            "styles": styles,
+            "body": [],
             "passthrough": {},
         },
     }
+    return doc, ast
 
-    if output_dir:
-        out_dir = Path(output_dir)
-        out_dir.mkdir(parents=True, exist_ok=True)
-        (out_dir / "document.ast.json").write_text(json.dumps(ast, ensure_ascii=False, indent=2), encoding="utf-8")
-        (out_dir / "media").mkdir(exist_ok=True)
 
-    return ast
+def _iter_body_blocks(
+    doc,
+    options: ParseOptions = DEFAULT_OPTIONS,
+    block_range: tuple[int, int | None] | None = None,
+) -> Iterator[dict]:
+    """按文档顺序解析 body 子元素并逐个产出 block。
+
+    Blocks outside *block_range* are only indexed (to keep ids stable),
+    never parsed; iteration stops at the end of the range.
+    """
+    start, stop = block_range if block_range is not None else (0, None)
+    for index, (block_id, kind, element) in enumerate(_index_body(doc)):
+        if stop is not None and index >= stop:
+            break
+        if index < start:
+            continue
+        block = _parse_body_element(doc, kind, element, block_id, options)
+        instrumentation.incr("parsed_blocks")
+        yield block
+
+
+def _index_body(doc) -> Iterator[tuple[str, str, object]]:
+    """按文档顺序产出 ``(block_id, kind, element)``，不解析内容。
+
+    *kind* is ``"p"``, ``"tbl"`` or ``"toc"``.  TOC content controls become
+    one block, other ``<w:sdt>`` wrappers are unwrapped, and ``<w:sectPr>``
+    and unknown elements are skipped, so the ids match :func:`parse_docx`.
+    """
+    counters = {"p": 0, "tbl": 0, "toc": 0}
+    prefixes = {"p": "p", "tbl": "t", "toc": "toc"}
+
+    _tag_sdt = qn("w:sdt")
+    _tag_sdt_content = qn("w:sdtContent")
+    _tag_sectPr = qn("w:sectPr")
+    _kinds = {qn("w:p"): "p", qn("w:tbl"): "tbl"}
+
+    def _entry(kind, element):
+        block_id = f"{prefixes[kind]}{counters[kind]}"
+        counters[kind] += 1
+        return block_id, kind, element
+
+    for child in doc.element.body:
+        if child.tag == _tag_sdt:
+            if _is_toc_sdt(child):
+                yield _entry("toc", child)
+                continue
+            sdt_content = child.find(_tag_sdt_content)
+            elements = sdt_content if sdt_content is not None else ()
+        elif child.tag == _tag_sectPr:
+            continue
+        else:
+            elements = (child,)
+        for element in elements:
+            kind = _kinds.get(element.tag)
+            if kind is not None:
+                yield _entry(kind, element)
+
+
+def _parse_body_element(
+    doc, kind: str, element, block_id: str, options: ParseOptions = DEFAULT_OPTIONS
+) -> dict:
+    """解析 :func:`_index_body` 产出的单个 body 元素。"""
+    if kind == "p":
+        return parse_paragraph_block(Paragraph(element, doc), block_id, options)
+    if kind == "tbl":
+        return parse_table_block(Table(element, doc), block_id, options)
+    return _parse_toc_block(element, doc, block_id, options)
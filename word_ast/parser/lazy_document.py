@@ -0,0 +1,104 @@
+"""按需解析的随机访问文档：打开时只建立 body 元素索引。
+
+Lazy random-access view of a docx file.
+
+Opening a :class:`LazyDocument` loads the package, parses styles and meta,
+and indexes the top-level body elements (ids are assigned exactly as
+:func:`~word_ast.parser.parse_docx` assigns them).  A block is parsed into
+its AST dict only when it is accessed, and recently parsed blocks are kept
+in an LRU cache, so looking up ``p1500`` in a huge document costs one
+block parse instead of a full parse.
+
+``LazyDocument`` implements the lazy-AST protocol (``header`` +
+``iter_blocks()`` + ``get_block()``), so it can be passed straight to
+``merge_ai_edits`` and ``render_ast``.  Returned blocks are shared with the
+cache; deep-copy a block before mutating it (``merge_ai_edits`` does).
+"""
+import copy
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from word_ast import instrumentation
+
+from .document_parser import _index_body, _load_document, _parse_body_element
+from .options import ParseOptions
+
+
+class LazyDocument:
+    """按需解析 block 的 docx 文档。
+
+    *cache_size* bounds the number of parsed blocks kept in memory
+    (``0`` disables caching).  Cache hits and misses are reported through
+    the ``cache_hits`` / ``cache_misses`` instrumentation counters.
+    *raw*, *images* and *text_only* select a parse mode as in
+    :func:`~word_ast.parser.parse_docx`.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        cache_size: int = 256,
+        raw: bool = True,
+        images: bool = True,
+        text_only: bool = False,
+    ):
+        self.path = Path(path)
+        self._options = ParseOptions(raw=raw, images=images, text_only=text_only)
+        self._doc, self._header = _load_document(path)
+        self._entries: dict[str, tuple[str, object]] = {
+            block_id: (kind, element) for block_id, kind, element in _index_body(self._doc)
+        }
+        self._cache: OrderedDict[str, dict] = OrderedDict()
+        self._cache_size = cache_size
+
+    @property
+    def header(self) -> dict:
+        """AST 头部骨架（``body`` 为空列表）。"""
+        return self._header
+
+    @property
+    def block_ids(self) -> list[str]:
+        """全部顶层 block id（文档顺序）。"""
+        return list(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, block_id) -> bool:
+        return block_id in self._entries
+
+    def get_block(self, block_id: str) -> dict:
+        """解析（或从缓存取出）单个 block；不存在时抛出 ``KeyError``。"""
+        block = self._cache.get(block_id)
+        if block is not None:
+            self._cache.move_to_end(block_id)
+            instrumentation.incr("cache_hits")
+            return block
+        kind, element = self._entries[block_id]
+        instrumentation.incr("cache_misses")
+        block = _parse_body_element(self._doc, kind, element, block_id, self._options)
+        instrumentation.incr("parsed_blocks")
+        if self._cache_size:
+            self._cache[block_id] = block
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return block
+
+    def get_blocks(self, block_ids: Iterable[str]) -> list[dict]:
+        return [self.get_block(block_id) for block_id in block_ids]
+
+    def iter_blocks(self) -> Iterator[dict]:
+        """按文档顺序逐个产出 block（经过 LRU 缓存）。"""
+        for block_id in self._entries:
+            yield self.get_block(block_id)
+
+    def load(self) -> dict:
+        """解析全部 block，物化为普通 dict AST（与 ``parse_docx`` 结果相同）。"""
+        ast = copy.deepcopy(self._header)
+        ast["document"]["body"] = list(self.iter_blocks())
+        return ast
+
+    def __repr__(self) -> str:
+        return f"LazyDocument({str(self.path)!r}, blocks={len(self)})"
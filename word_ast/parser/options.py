@@ -0,0 +1,39 @@
+"""解析选项：按需跳过不需要的工作（原始 XML、图片数据、格式）。
+
+Parse options shared by the block parsers.
+
+Each option turns off a piece of work at its source instead of stripping
+its output afterwards:
+
+- ``raw=False`` — view-only mode: no ``_raw_*`` XML is serialized and the
+  style chain is never walked to enrich it.  Adjacent runs that differ
+  only in raw XML are merged, so run positions can differ from a full
+  parse: edits made on such a view must not be merged into a full AST.
+- ``images=False`` — ``InlineImage`` nodes keep ``content_type``,
+  ``width`` and ``height`` but no ``data``; image parts are never read or
+  base64-encoded.
+- ``text_only=True`` — paragraphs become ``{"id", "type", "content"}``
+  with a single ``Text`` item holding the paragraph text (or no items for
+  an empty paragraph); no formatting, styles, raw XML or images.  Tables
+  keep their rows, cells and spans.
+
+Blocks parsed with ``raw=False`` or ``images=False`` cannot be rendered
+with full fidelity; they are meant for reading, indexing and AI views.
+"""
+
+
+class ParseOptions:
+    """块解析选项（见模块说明）。``text_only`` 隐含 ``raw=False, images=False``。"""
+
+    __slots__ = ("raw", "images", "text_only")
+
+    def __init__(self, *, raw: bool = True, images: bool = True, text_only: bool = False):
+        self.raw = raw and not text_only
+        self.images = images and not text_only
+        self.text_only = text_only
+
+    def __repr__(self) -> str:
+        return f"ParseOptions(raw={self.raw}, images={self.images}, text_only={self.text_only})"
+
+
+DEFAULT_OPTIONS = ParseOptions()
@@ -8,8 +8,12 @@ from docx.text.paragraph import Paragraph
 from docx.text.run import Run
 from lxml import etree
 
+from word_ast import instrumentation
 from word_ast.utils.units import pt_to_half_points
 
+from .options import DEFAULT_OPTIONS, ParseOptions
+from .style_cache import style_snapshot
+
 _WP_NS = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
 _A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
 _R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
@@ -55,7 +59,7 @@ _INHERITABLE_RPR_TAGS = {
 }
 
 
-def _inherit_style_rPr(rPr_el, paragraph) -> None:  # rPr_el: lxml _Element
+def _inherit_style_rPr(rPr_el, paragraph) -> list:  # rPr_el: lxml _Element
     """遍历 run 所在段落的样式继承链，将缺失的 <w:rPr> 子元素补入 rPr_el。
 
     Walk the paragraph's style inheritance chain and inject any <w:rPr> child
@@ -64,15 +68,17 @@ def _inherit_style_rPr(rPr_el, paragraph) -> None:  # rPr_el: lxml _Element
     Mutates *rPr_el* in place by appending deep-copies of inheritable tags
     found on ancestor styles.  Tags already present on the run are never
     overwritten (run-level values take precedence over style values).
+    Returns the appended elements so the caller can remove them again.
 
     This ensures that formatting defined on the style (e.g. a font family from
     "Heading 1") is captured in _raw_rPr even when the run itself carries no
     explicit rPr, preventing font substitution on round-trip.
     """
     present_tags = {child.tag for child in rPr_el}
+    added = []
 
-    style = paragraph.style
-    while style is not None:
+    snapshot = style_snapshot(paragraph.part)
+    for style in snapshot.chain(snapshot.paragraph_style(paragraph)):
         try:
             style_el = style.element
             style_rPr = style_el.rPr if style_el is not None else None
@@ -87,21 +93,21 @@ def _inherit_style_rPr(rPr_el, paragraph) -> None:  # rPr_el: lxml _Element
                     if child.tag == qn("w:color") and child.get(qn("w:themeColor")):
                         continue
                     # deepcopy to avoid mutating the shared style XML
-                    rPr_el.append(copy.deepcopy(child))
+                    inherited = copy.deepcopy(child)
+                    rPr_el.append(inherited)
+                    added.append(inherited)
                     present_tags.add(child.tag)
-        try:
-            style = style.base_style
-        except AttributeError:
-            break
+    return added
 
 
-def _font_to_overrides(font, *, skip_theme_color: bool = False, paragraph=None) -> dict:
+def _font_to_overrides(font, *, skip_theme_color: bool = False, paragraph=None, raw: bool = True) -> dict:
     """提取 run 的字体格式覆盖项，并序列化 _raw_rPr（含样式继承的完整信息）。
 
     Extract run-level font formatting overrides.  When *paragraph* is supplied
     the resulting ``_raw_rPr`` is enriched with properties inherited from the
     paragraph's style chain so that fonts and sizes are preserved on round-trip
-    even when the run itself carries no explicit <w:rPr>.
+    even when the run itself carries no explicit <w:rPr>.  With ``raw=False``
+    no ``_raw_rPr`` is produced and the style chain is not walked.
     """
     overrides = {}
     if font is None:
@@ -130,6 +136,9 @@ def _font_to_overrides(font, *, skip_theme_color: bool = False, paragraph=None)
     if ea_font:
         overrides["font_east_asia"] = ea_font
 
+    if not raw:
+        return overrides
+
     try:
         rPr_el = font._element.rPr
         if rPr_el is None:
@@ -137,14 +146,21 @@ def _font_to_overrides(font, *, skip_theme_color: bool = False, paragraph=None)
                 # 1d: run has no <w:rPr> — create a detached element, populate
                 # via style inheritance, and store only if non-empty.
                 rPr_el = OxmlElement("w:rPr")
-                _inherit_style_rPr(rPr_el, paragraph)
+                with instrumentation.span("parse.style_inheritance"):
+                    _inherit_style_rPr(rPr_el, paragraph)
                 if len(rPr_el):
                     overrides["_raw_rPr"] = etree.tostring(rPr_el, encoding="unicode")
         else:
+            added = []
             if paragraph is not None:
                 # Append inherited style properties absent from the run's own rPr
-                _inherit_style_rPr(rPr_el, paragraph)
+                with instrumentation.span("parse.style_inheritance"):
+                    added = _inherit_style_rPr(rPr_el, paragraph)
             overrides["_raw_rPr"] = etree.tostring(rPr_el, encoding="unicode")
+            # Take the injected elements out again: parsing must not modify
+            # the document, so re-parsing a block gives the same result.
+            for el in added:
+                rPr_el.remove(el)
     except (AttributeError, TypeError):
         pass
 
@@ -169,9 +185,10 @@ def _merge_runs(content: list[dict]) -> list[dict]:
     return merged
 
 
-def _parse_inline_image(run) -> dict | None:
+def _parse_inline_image(run, *, data: bool = True) -> dict | None:
     """Return an InlineImage node if *run* contains a ``<w:drawing>`` with an
-    inline image, otherwise return ``None``."""
+    inline image, otherwise return ``None``.  With ``data=False`` the image
+    part is not read and the node carries no ``data``."""
     r_el = run._element
     drawing = r_el.find(qn("w:drawing"))
     if drawing is None:
@@ -194,19 +211,21 @@ def _parse_inline_image(run) -> dict | None:
     if not r_id:
         return None
     try:
-        part = run.part
-        image_part = part.related_parts[r_id]
-        image_data = base64.b64encode(image_part.blob).decode("ascii")
-        content_type = image_part.content_type
+        with instrumentation.span("parse.image", r_id=r_id):
+            part = run.part
+            image_part = part.related_parts[r_id]
+            image_data = base64.b64encode(image_part.blob).decode("ascii") if data else None
+            content_type = image_part.content_type
     except (KeyError, AttributeError):
         return None
-    return {
-        "type": "InlineImage",
-        "data": image_data,
-        "content_type": content_type,
-        "width": cx // _EMU_PER_TWIP,
-        "height": cy // _EMU_PER_TWIP,
-    }
+    instrumentation.incr("images")
+    node = {"type": "InlineImage"}
+    if data:
+        node["data"] = image_data
+    node["content_type"] = content_type
+    node["width"] = cx // _EMU_PER_TWIP
+    node["height"] = cy // _EMU_PER_TWIP
+    return node
 
 
 _ALIGNMENT_MAP = {0: "left", 1: "center", 2: "right", 3: "justify"}
@@ -226,13 +245,14 @@ _INHERITABLE_PPR_TAGS = {
 }
 
 
-def _inherit_style_pPr(pPr_el, paragraph) -> None:
+def _inherit_style_pPr(pPr_el, paragraph) -> list:
     """Walk the paragraph's style inheritance chain and inject any <w:pPr>
     child elements that are absent from the paragraph's own pPr.
 
     Mutates *pPr_el* in place by appending deep-copies of inheritable tags
     found on ancestor styles.  Tags already present on the paragraph are never
     overwritten (paragraph-level values take precedence over style values).
+    Returns the appended elements so the caller can remove them again.
 
     This ensures that formatting defined on the style (e.g. <w:jc> for center
     alignment) is captured in _raw_pPr even when python-docx does not surface
@@ -240,9 +260,10 @@ def _inherit_style_pPr(pPr_el, paragraph) -> None:
     """
     # Collect tags already present so we never overwrite paragraph-level values
     present_tags = {child.tag for child in pPr_el}
+    added = []
 
-    style = paragraph.style
-    while style is not None:
+    snapshot = style_snapshot(paragraph.part)
+    for style in snapshot.chain(snapshot.paragraph_style(paragraph)):
         try:
             style_pPr = style.element.pPr if style.element is not None else None
         except AttributeError:
@@ -251,16 +272,17 @@ def _inherit_style_pPr(pPr_el, paragraph) -> None:
             for child in style_pPr:
                 if child.tag in _INHERITABLE_PPR_TAGS and child.tag not in present_tags:
                     # deepcopy to avoid mutating the shared style XML
-                    pPr_el.append(copy.deepcopy(child))
+                    inherited = copy.deepcopy(child)
+                    pPr_el.append(inherited)
+                    added.append(inherited)
                     present_tags.add(child.tag)
-        try:
-            style = style.base_style
-        except AttributeError:
-            break
+    return added
+
 
+def _parse_paragraph_format(paragraph: Paragraph, *, raw: bool = True) -> dict:
+    """Extract paragraph-level formatting (alignment, indentation, spacing).
 
-def _parse_paragraph_format(paragraph: Paragraph) -> dict:
-    """Extract paragraph-level formatting (alignment, indentation, spacing)."""
+    With ``raw=False`` no ``_raw_pPr`` is produced."""
     fmt: dict = {}
     pf = paragraph.paragraph_format
 
@@ -279,18 +301,25 @@ def _parse_paragraph_format(paragraph: Paragraph) -> dict:
     if pf.space_after is not None:
         fmt["space_after"] = pf.space_after.twips
 
+    if not raw:
+        return fmt
+
     try:
         pPr_el = paragraph._element.pPr
         if pPr_el is not None:
             # Inject inherited style properties that are absent from the
             # paragraph's own pPr (e.g. jc=center defined on a style).
-            _inherit_style_pPr(pPr_el, paragraph)
+            with instrumentation.span("parse.style_inheritance"):
+                added = _inherit_style_pPr(pPr_el, paragraph)
             fmt["_raw_pPr"] = etree.tostring(pPr_el, encoding="unicode")
+            for el in added:
+                pPr_el.remove(el)
         else:
             # 1c: paragraph has no explicit <w:pPr> — create a detached element,
             # populate via style inheritance, and store only if non-empty.
             pPr_el = OxmlElement("w:pPr")
-            _inherit_style_pPr(pPr_el, paragraph)
+            with instrumentation.span("parse.style_inheritance"):
+                _inherit_style_pPr(pPr_el, paragraph)
             if len(pPr_el):
                 fmt["_raw_pPr"] = etree.tostring(pPr_el, encoding="unicode")
     except (AttributeError, TypeError):
@@ -335,31 +364,61 @@ def _iter_runs(paragraph: Paragraph):
                     yield Run(r_el, paragraph)
 
 
-def parse_paragraph_block(paragraph: Paragraph, block_id: str) -> dict:
+def parse_paragraph_block(
+    paragraph: Paragraph,
+    block_id: str,
+    options: ParseOptions = DEFAULT_OPTIONS,
+) -> dict:
+    with instrumentation.span("parse_paragraph_block", block_id=block_id):
+        if options.text_only:
+            return _parse_paragraph_text(paragraph, block_id)
+        return _parse_paragraph_block(paragraph, block_id, options)
+
+
+def _parse_paragraph_text(paragraph: Paragraph, block_id: str) -> dict:
+    """text-only 模式：只取段落文本，不读取任何格式或样式。"""
+    runs = list(_iter_runs(paragraph))
+    instrumentation.incr("runs", len(runs))
+    text = "".join(run.text for run in runs)
+    return {
+        "id": block_id,
+        "type": "Paragraph",
+        "content": [{"type": "Text", "text": text}] if text else [],
+    }
+
+
+def _parse_paragraph_block(
+    paragraph: Paragraph,
+    block_id: str,
+    options: ParseOptions = DEFAULT_OPTIONS,
+) -> dict:
     content = []
+    run_count = 0
     for run in _iter_runs(paragraph):
-        image_node = _parse_inline_image(run)
+        run_count += 1
+        image_node = _parse_inline_image(run, data=options.images)
         if image_node is not None:
             content.append(image_node)
             continue
         item: dict = {"type": "Text", "text": run.text}
-        overrides = _font_to_overrides(run.font, paragraph=paragraph)
+        overrides = _font_to_overrides(run.font, paragraph=paragraph, raw=options.raw)
         if overrides:
             item["overrides"] = overrides
         content.append(item)
+    instrumentation.incr("runs", run_count)
     content = _merge_runs(content)
 
+    style = style_snapshot(paragraph.part).paragraph_style(paragraph)
     default_run = _font_to_overrides(
-        getattr(paragraph.style, "font", None), skip_theme_color=True
+        getattr(style, "font", None), skip_theme_color=True, raw=False
     )
-    default_run.pop("_raw_rPr", None)
 
-    para_fmt = _parse_paragraph_format(paragraph)
+    para_fmt = _parse_paragraph_format(paragraph, raw=options.raw)
 
     block = {
         "id": block_id,
         "type": "Paragraph",
-        "style": paragraph.style.style_id if paragraph.style else None,
+        "style": style.style_id if style else None,
         "content": content,
     }
     if para_fmt:
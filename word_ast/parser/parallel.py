@@ -0,0 +1,92 @@
+"""并行解析：把 body 切成连续分块，在进程池中解析后按文档顺序拼接。
+
+Parallel block parsing for very large documents.
+
+Once styles are known, paragraph and table blocks parse independently.
+:func:`iter_parallel_blocks` indexes the body in the calling process
+(ids are assigned exactly as in a serial parse), splits the index into
+contiguous chunks and hands the chunks to a :class:`ProcessPoolExecutor`.
+Every worker opens the package once, builds the same
+:class:`~word_ast.parser.style_cache.StyleSnapshot` and indexes the body
+the same way, so a chunk is just an index range.  Results are yielded in
+document order as soon as the leading chunk is done; the blocks are equal
+to those of a serial parse.
+
+Workers are separate processes: ``runs`` / ``images`` instrumentation
+counters recorded there are not reported; ``blocks`` is counted by the
+caller.
+"""
+import math
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from docx import Document
+
+from word_ast import instrumentation
+
+from .options import ParseOptions
+from .style_cache import style_snapshot
+
+# Chunks per worker: more chunks balance uneven blocks (large tables,
+# images) at the cost of more pickling round trips
+_CHUNKS_PER_WORKER = 4
+
+# Per-process state set up by _init_worker
+_worker_doc = None
+_worker_entries: list = []
+
+
+def _init_worker(path: str) -> None:
+    from .document_parser import _index_body
+
+    global _worker_doc, _worker_entries
+    _worker_doc = Document(path)
+    style_snapshot(_worker_doc.part)
+    _worker_entries = list(_index_body(_worker_doc))
+
+
+def _parse_chunk(start: int, stop: int, options: ParseOptions) -> list[dict]:
+    from .document_parser import _parse_body_element
+
+    return [
+        _parse_body_element(_worker_doc, kind, element, block_id, options)
+        for block_id, kind, element in _worker_entries[start:stop]
+    ]
+
+
+def chunk_ranges(start: int, stop: int, chunk_size: int) -> list[tuple[int, int]]:
+    """把 ``[start, stop)`` 切成长度不超过 *chunk_size* 的连续区间。"""
+    return [(i, min(i + chunk_size, stop)) for i in range(start, stop, chunk_size)]
+
+
+def iter_parallel_blocks(
+    input_path: str | Path,
+    total: int,
+    options: ParseOptions,
+    *,
+    workers: int,
+    block_range: tuple[int, int | None] | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[dict]:
+    """用 *workers* 个进程解析 *total* 个顶层 block（或 *block_range* 内的部分），按序产出。"""
+    start, stop = block_range if block_range is not None else (0, None)
+    stop = total if stop is None else min(stop, total)
+    start = min(start, stop)
+    if start == stop:
+        return
+    if chunk_size is None:
+        chunk_size = math.ceil((stop - start) / (workers * _CHUNKS_PER_WORKER))
+    ranges = chunk_ranges(start, stop, max(1, chunk_size))
+
+    with instrumentation.span("parse.parallel", workers=workers, chunks=len(ranges)):
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(ranges)),
+            initializer=_init_worker,
+            initargs=(str(input_path),),
+        ) as pool:
+            futures = [pool.submit(_parse_chunk, lo, hi, options) for lo, hi in ranges]
+            for future in futures:
+                for block in future.result():
+                    instrumentation.incr("parsed_blocks")
+                    yield block
@@ -0,0 +1,84 @@
+"""样式快照：一次性索引 styles.xml，替代 python-docx 每次查样式时的线性扫描。
+
+Style snapshot for the block parsers.
+
+python-docx resolves ``paragraph.style`` on every access: an XPath lookup
+by id and, for the (very common) paragraph without an explicit style, a
+scan of every ``<w:style>`` to find the type's default.  The parser reads
+the style several times per run, which made style resolution the bulk of
+parse time.
+
+:class:`StyleSnapshot` indexes the styles part once — first style per id,
+last default per type, as python-docx does — and memoizes each style's
+inheritance chain.  :func:`style_snapshot` returns the snapshot of a
+document part, building it on first use.  Parsing never modifies styles,
+so a snapshot stays valid for the lifetime of the loaded document.
+"""
+import weakref
+
+from docx.enum.style import WD_STYLE_TYPE
+from docx.styles.style import StyleFactory
+
+_snapshots: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+class StyleSnapshot:
+    """文档样式的只读索引（语义与 python-docx ``Styles.get_by_id`` 相同）。"""
+
+    __slots__ = ("_by_id", "_defaults", "_chains")
+
+    def __init__(self, styles_element):
+        # style id -> (w:type as written, style object); python-docx compares
+        # the raw attribute, so a style without w:type never matches a type
+        self._by_id: dict = {}
+        self._defaults: dict = {}
+        self._chains: dict = {}
+        for style_el in styles_element.style_lst:
+            style_id = style_el.styleId
+            if style_id is not None and style_id not in self._by_id:
+                self._by_id[style_id] = (style_el.type, StyleFactory(style_el))
+            if style_el.default and style_el.type is not None:
+                # The spec calls for the last default in document order
+                self._defaults[style_el.type] = style_el
+        self._defaults = {k: StyleFactory(v) for k, v in self._defaults.items()}
+
+    def get(self, style_id: str | None, style_type: WD_STYLE_TYPE):
+        """按 id 取样式；id 为空、不存在或类型不符时返回该类型的默认样式（可能为 ``None``）。"""
+        entry = self._by_id.get(style_id) if style_id else None
+        if entry is None or entry[0] != style_type:
+            return self._defaults.get(style_type)
+        return entry[1]
+
+    def paragraph_style(self, paragraph):
+        return self.get(paragraph._p.style, WD_STYLE_TYPE.PARAGRAPH)
+
+    def table_style(self, table):
+        return self.get(table._tbl.tblStyle_val, WD_STYLE_TYPE.TABLE)
+
+    def chain(self, style) -> tuple:
+        """*style* 及其 ``base_style`` 祖先（由近及远）。"""
+        if style is None:
+            return ()
+        key = style.style_id
+        chain = self._chains.get(key)
+        if chain is None:
+            chain = []
+            seen = set()
+            while style is not None and style.style_id not in seen:
+                chain.append(style)
+                seen.add(style.style_id)
+                try:
+                    base = style.base_style
+                except AttributeError:
+                    break
+                style = self._by_id.get(base.style_id, (None, base))[1] if base is not None else None
+            chain = self._chains[key] = tuple(chain)
+        return chain
+
+
+def style_snapshot(part) -> StyleSnapshot:
+    """返回文档部件 *part* 的样式快照（首次调用时构建，随部件释放）。"""
+    snapshot = _snapshots.get(part)
+    if snapshot is None:
+        snapshot = _snapshots[part] = StyleSnapshot(part.styles.element)
+    return snapshot
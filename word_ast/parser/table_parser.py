@@ -3,7 +3,10 @@ from docx.table import Table
 from docx.table import _Cell
 from lxml import etree
 
+from word_ast import instrumentation
+from word_ast.parser.options import DEFAULT_OPTIONS, ParseOptions
 from word_ast.parser.paragraph_parser import parse_paragraph_block
+from word_ast.parser.style_cache import style_snapshot
 
 
 def _grid_span(tc) -> int:
@@ -29,15 +32,24 @@ def _tc_at_column(tr, col_idx: int):
     return None
 
 
-def parse_table_block(table: Table, block_id: str) -> dict:
-    style_id = table.style.style_id if table.style else None
+def parse_table_block(table: Table, block_id: str, options: ParseOptions = DEFAULT_OPTIONS) -> dict:
+    with instrumentation.span("parse_table_block", block_id=block_id):
+        return _parse_table_block(table, block_id, options)
+
+
+def _parse_table_block(table: Table, block_id: str, options: ParseOptions = DEFAULT_OPTIONS) -> dict:
+    raw = options.raw
+    style_id = None
+    if not options.text_only:
+        style = style_snapshot(table.part).table_style(table)
+        style_id = style.style_id if style else None
 
     # Capture the raw table-level properties so the renderer can restore
     # alignment, width, borders, and other tblPr attributes.
     raw_tblPr = None
     try:
         tblPr_el = table._tbl.tblPr
-        if tblPr_el is not None:
+        if raw and tblPr_el is not None:
             raw_tblPr = etree.tostring(tblPr_el, encoding="unicode")
     except (AttributeError, TypeError):
         pass
@@ -48,7 +60,7 @@ def parse_table_block(table: Table, block_id: str) -> dict:
         # Capture raw row properties (e.g. row height, tblHeader flag).
         raw_trPr = None
         try:
-            trPr_el = tr.find(qn("w:trPr"))
+            trPr_el = tr.find(qn("w:trPr")) if raw else None
             if trPr_el is not None:
                 raw_trPr = etree.tostring(trPr_el, encoding="unicode")
         except (AttributeError, TypeError):
@@ -76,12 +88,14 @@ def parse_table_block(table: Table, block_id: str) -> dict:
             cell = _Cell(tc, table)
             cell_paragraphs = []
             for p_idx, p in enumerate(cell.paragraphs):
-                p_block = parse_paragraph_block(p, f"{block_id}.r{row_idx}c{col_cursor}.p{p_idx}")
+                p_block = parse_paragraph_block(
+                    p, f"{block_id}.r{row_idx}c{col_cursor}.p{p_idx}", options
+                )
                 cell_paragraphs.append(p_block)
 
             raw_tcPr = None
             try:
-                tcPr_el = tc.tcPr
+                tcPr_el = tc.tcPr if raw else None
                 if tcPr_el is not None:
                     raw_tcPr = etree.tostring(tcPr_el, encoding="unicode")
             except (AttributeError, TypeError):
@@ -101,7 +115,10 @@ def parse_table_block(table: Table, block_id: str) -> dict:
         if raw_trPr:
             row_data["_raw_trPr"] = raw_trPr
         rows.append(row_data)
-    block: dict = {"id": block_id, "type": "Table", "style": style_id, "rows": rows}
+    block: dict = {"id": block_id, "type": "Table"}
+    if not options.text_only:
+        block["style"] = style_id
+    block["rows"] = rows
     if raw_tblPr:
         block["_raw_tblPr"] = raw_tblPr
     return block
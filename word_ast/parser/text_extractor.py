@@ -0,0 +1,215 @@
+"""纯文本快速提取：直接流式读取 word/document.xml，不构建 python-docx 对象。
+
+Fast text extraction for indexing pipelines.
+
+:func:`extract_text` streams the main document part with
+:func:`lxml.etree.iterparse` and yields ``(block_id, text)`` pairs without
+constructing python-docx objects, resolving styles or serializing any raw
+XML.  Each top-level body element is processed as soon as it has been read
+and then freed, so memory stays flat on large documents.
+
+Block order, ids and TOC/SDT handling follow :func:`parse_docx`:
+
+- paragraphs yield ``("p{i}", text)``;
+- tables yield one entry per cell, ``("t{i}.r{row}c{col}", text)`` with the
+  cell's paragraphs joined by ``"\\n"``; vertically merged continuation
+  cells are skipped, as in the parser;
+- a TOC content control yields its title paragraph (``"toc{i}.title"``)
+  when it has one; other content controls are unwrapped.
+
+Paragraph text is the concatenation of its runs' text exactly as
+``parse_docx`` collects them (runs inside hyperlinks, tracked changes,
+smart tags, simple fields, custom XML and inline content controls
+included).
+"""
+import posixpath
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+
+from lxml import etree
+
+from word_ast import instrumentation
+
+_W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_OFFICE_DOCUMENT = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+
+
+def _w(tag: str) -> str:
+    return f"{{{_W}}}{tag}"
+
+
+_P, _R, _T, _TBL, _TR, _TC = _w("p"), _w("r"), _w("t"), _w("tbl"), _w("tr"), _w("tc")
+_SDT, _SDT_CONTENT, _SDT_PR, _SECT_PR = _w("sdt"), _w("sdtContent"), _w("sdtPr"), _w("sectPr")
+_BODY = _w("body")
+_TC_PR, _GRID_SPAN, _V_MERGE, _VAL = _w("tcPr"), _w("gridSpan"), _w("vMerge"), _w("val")
+_FLD_CHAR, _FLD_CHAR_TYPE, _INSTR_TEXT = _w("fldChar"), _w("fldCharType"), _w("instrText")
+_DOC_PART_OBJ, _DOC_PART_GALLERY = _w("docPartObj"), _w("docPartGallery")
+
+# Wrappers whose direct <w:r> children belong to the paragraph (see
+# paragraph_parser._iter_runs)
+_RUN_WRAPPERS = frozenset(
+    _w(t) for t in ("hyperlink", "ins", "del", "smartTag", "fldSimple", "customXml")
+)
+
+# Run inner content → text, mirroring python-docx ``Run.text``
+_TAB, _PTAB, _BR, _CR, _NB_HYPHEN, _BR_TYPE = (
+    _w("tab"), _w("ptab"), _w("br"), _w("cr"), _w("noBreakHyphen"), _w("type"),
+)
+
+
+def _run_text(r_el) -> str:
+    parts = []
+    for child in r_el:
+        tag = child.tag
+        if tag == _T:
+            parts.append(child.text or "")
+        elif tag == _TAB or tag == _PTAB:
+            parts.append("\t")
+        elif tag == _BR:
+            if child.get(_BR_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == _CR:
+            parts.append("\n")
+        elif tag == _NB_HYPHEN:
+            parts.append("-")
+    return "".join(parts)
+
+
+def _paragraph_text(p_el) -> str:
+    parts = []
+    for child in p_el:
+        tag = child.tag
+        if tag == _R:
+            parts.append(_run_text(child))
+        elif tag in _RUN_WRAPPERS:
+            parts.extend(_run_text(r) for r in child.iterchildren(_R))
+        elif tag == _SDT:
+            content = child.find(_SDT_CONTENT)
+            if content is not None:
+                parts.extend(_run_text(r) for r in content.iterchildren(_R))
+    return "".join(parts)
+
+
+def _is_toc_sdt(sdt_el) -> bool:
+    # Same rules as document_parser._is_toc_sdt, on plain lxml elements
+    sdt_pr = sdt_el.find(_SDT_PR)
+    if sdt_pr is not None:
+        obj = sdt_pr.find(_DOC_PART_OBJ)
+        if obj is not None:
+            gallery = obj.find(_DOC_PART_GALLERY)
+            if gallery is not None and "Table of Contents" in gallery.get(_VAL, ""):
+                return True
+    content = sdt_el.find(_SDT_CONTENT)
+    if content is not None:
+        for instr in content.iter(_INSTR_TEXT):
+            if instr.text and instr.text.strip().upper().startswith("TOC"):
+                return True
+    return False
+
+
+def _toc_title(sdt_el) -> str | None:
+    content = sdt_el.find(_SDT_CONTENT)
+    if content is None:
+        return None
+    for p_el in content.iterchildren(_P):
+        if any(fc.get(_FLD_CHAR_TYPE) == "begin" for fc in p_el.iter(_FLD_CHAR)):
+            return None
+        text = _paragraph_text(p_el)
+        if text.strip():
+            return text
+    return None
+
+
+def _grid_span(tc) -> int:
+    tc_pr = tc.find(_TC_PR)
+    span = tc_pr.find(_GRID_SPAN) if tc_pr is not None else None
+    if span is not None and span.get(_VAL) is not None:
+        return int(span.get(_VAL))
+    return 1
+
+
+def _is_merge_continuation(tc) -> bool:
+    tc_pr = tc.find(_TC_PR)
+    v_merge = tc_pr.find(_V_MERGE) if tc_pr is not None else None
+    return v_merge is not None and v_merge.get(_VAL, "continue") == "continue"
+
+
+def _table_cells(tbl_el, block_id: str) -> Iterator[tuple[str, str]]:
+    for row_idx, tr in enumerate(tbl_el.iterchildren(_TR)):
+        col = 0
+        for tc in tr.iterchildren(_TC):
+            span = _grid_span(tc)
+            if not _is_merge_continuation(tc):
+                text = "\n".join(_paragraph_text(p) for p in tc.iterchildren(_P))
+                yield f"{block_id}.r{row_idx}c{col}", text
+            col += span
+
+
+def _main_part_name(zf: zipfile.ZipFile) -> str:
+    """从 ``_rels/.rels`` 找到主文档部件（通常为 ``word/document.xml``）。"""
+    try:
+        rels = etree.fromstring(zf.read("_rels/.rels"))
+    except KeyError:
+        return "word/document.xml"
+    for rel in rels.iterchildren(f"{{{_REL_NS}}}Relationship"):
+        if rel.get("Type") == _OFFICE_DOCUMENT:
+            return posixpath.normpath(rel.get("Target").lstrip("/"))
+    return "word/document.xml"
+
+
+def _iter_body_children(fp) -> Iterator:
+    """流式产出 ``<w:body>`` 的直接子元素；处理完的元素随即释放。"""
+    depth = 0
+    body_depth = None
+    for event, el in etree.iterparse(fp, events=("start", "end"), huge_tree=True):
+        if event == "start":
+            depth += 1
+            if el.tag == _BODY and body_depth is None:
+                body_depth = depth
+            continue
+        if body_depth is not None and depth == body_depth + 1:
+            yield el
+            el.clear()
+            parent = el.getparent()
+            while el.getprevious() is not None:
+                del parent[0]
+        depth -= 1
+
+
+def extract_text(input_path: str | Path) -> Iterator[tuple[str, str]]:
+    """流式提取文本，按文档顺序产出 ``(block_id, text)``（id 与 parse_docx 一致）。"""
+    counters = {"p": 0, "t": 0, "toc": 0}
+
+    def _next_id(prefix: str) -> str:
+        block_id = f"{prefix}{counters[prefix]}"
+        counters[prefix] += 1
+        return block_id
+
+    def _element(el) -> Iterator[tuple[str, str]]:
+        if el.tag == _P:
+            instrumentation.incr("parsed_blocks")
+            yield _next_id("p"), _paragraph_text(el)
+        elif el.tag == _TBL:
+            instrumentation.incr("parsed_blocks")
+            yield from _table_cells(el, _next_id("t"))
+
+    with zipfile.ZipFile(input_path) as zf:
+        with zf.open(_main_part_name(zf)) as fp:
+            for child in _iter_body_children(fp):
+                if child.tag == _SDT:
+                    if _is_toc_sdt(child):
+                        instrumentation.incr("parsed_blocks")
+                        toc_id = _next_id("toc")
+                        title = _toc_title(child)
+                        if title is not None:
+                            yield f"{toc_id}.title", title
+                        continue
+                    content = child.find(_SDT_CONTENT)
+                    for el in (content if content is not None else ()):
+                        yield from _element(el)
+                elif child.tag != _SECT_PR:
+                    yield from _element(child)
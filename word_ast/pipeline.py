@@ -0,0 +1,197 @@
+"""解析→渲染流水线：解析器与渲染器通过有界队列连接，两阶段重叠执行。
+
+Parse-to-render streaming pipeline.
+
+:func:`roundtrip_docx` connects the block-yielding parser
+(:func:`~word_ast.parser.iter_parse_docx`) to the streaming renderer
+(:class:`~word_ast.renderer.streaming.StreamingDocxWriter`) through a
+bounded queue.  A producer parses blocks and puts them on the queue while
+the calling thread renders and flushes them, so rendering of early blocks
+overlaps parsing of later ones and neither the full AST nor the full
+output tree is ever in memory.
+
+Backpressure: when the renderer falls behind, the queue fills up and the
+producer blocks until there is room again.  Peak memory is bounded by
+*queue_size* blocks plus one render batch, independent of document
+length.
+
+The producer runs in a thread by default.  python-docx and most of the
+parser hold the GIL, so with ``process=True`` the producer runs in a child
+process instead and blocks are pickled across a ``multiprocessing``
+queue, which lets the two stages use two cores.
+
+An optional *transform* is applied to each block between the stages (for
+example an AI edit); returning ``None`` drops the block.
+"""
+import multiprocessing
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from word_ast import instrumentation
+from word_ast.parser.document_parser import iter_parse_docx
+from word_ast.renderer.document_renderer import _new_document, _render_block
+from word_ast.renderer.streaming import StreamingDocxWriter
+
+DEFAULT_QUEUE_SIZE = 64
+
+# End-of-stream marker; an exception instance is sent instead on failure
+_DONE = "__done__"
+# How often a blocked producer re-checks whether the consumer gave up
+_PUT_TIMEOUT = 0.1
+
+
+class PipelineStats:
+    """流水线运行统计。
+
+    ``blocks`` counts rendered blocks, ``producer_waits`` the number of
+    times the producer found the queue full and had to wait
+    (backpressure), ``max_queue_depth`` the largest queue length the
+    consumer observed.
+    """
+
+    __slots__ = ("blocks", "producer_waits", "max_queue_depth")
+
+    def __init__(self):
+        self.blocks = 0
+        self.producer_waits = 0
+        self.max_queue_depth = 0
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v}" for k, v in self.as_dict().items())
+        return f"PipelineStats({fields})"
+
+
+def _put(q, item, stop: threading.Event | None) -> int:
+    """放入队列；队列满时阻塞等待（背压），返回等待次数（0 或 1）。"""
+    try:
+        q.put_nowait(item)
+        return 0
+    except queue.Full:
+        pass
+    while True:
+        if stop is not None and stop.is_set():
+            return 1
+        try:
+            q.put(item, timeout=_PUT_TIMEOUT)
+            return 1
+        except queue.Full:
+            continue
+
+
+def _produce(blocks: Iterator[dict], q, stop: threading.Event | None, waits: list) -> None:
+    try:
+        for block in blocks:
+            if stop is not None and stop.is_set():
+                return
+            waits[0] += _put(q, block, stop)
+        _put(q, _DONE, stop)
+    except BaseException as exc:  # forwarded to and re-raised by the consumer
+        _put(q, exc, stop)
+
+
+def _process_producer(input_path: str, parse_kwargs: dict, q) -> None:
+    """子进程生产者：先发送 AST 头部，再逐个发送 block。"""
+    try:
+        header, blocks = iter_parse_docx(input_path, **parse_kwargs)
+        q.put(header)
+    except BaseException as exc:
+        q.put(exc)
+        return
+    waits = [0]
+    _produce(blocks, q, None, waits)
+    q.put(waits[0])
+
+
+def _consume(q, stats: PipelineStats) -> Iterator[dict]:
+    while True:
+        try:
+            stats.max_queue_depth = max(stats.max_queue_depth, q.qsize())
+        except NotImplementedError:  # multiprocessing queues on macOS
+            pass
+        item = q.get()
+        if isinstance(item, str) and item == _DONE:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+
+def roundtrip_docx(
+    input_path: str | Path,
+    output_path: str | Path,
+    *,
+    transform: Callable[[dict], dict | None] | None = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    process: bool = False,
+    flush_every: int = 64,
+    **parse_kwargs,
+) -> PipelineStats:
+    """流水线式 docx → docx：边解析边渲染，返回 :class:`PipelineStats`。
+
+    *parse_kwargs* are forwarded to :func:`~word_ast.parser.iter_parse_docx`
+    (e.g. ``images=False``).  The output equals
+    ``render_ast(parse_docx(input_path), output_path)`` (with *transform*
+    applied to every block).
+    """
+    stats = PipelineStats()
+    with instrumentation.span("pipeline.roundtrip", input=str(input_path), process=process):
+        if process:
+            _run_process(input_path, output_path, transform, queue_size, flush_every, parse_kwargs, stats)
+        else:
+            _run_thread(input_path, output_path, transform, queue_size, flush_every, parse_kwargs, stats)
+    return stats
+
+
+def _render_stream(header: dict, blocks: Iterator[dict], output_path, transform, flush_every, stats) -> None:
+    doc = _new_document(header)
+    styles = header["document"].get("styles", {})
+    with StreamingDocxWriter(doc, output_path, flush_every=flush_every) as writer:
+        for block in blocks:
+            if transform is not None:
+                block = transform(block)
+                if block is None:
+                    continue
+            _render_block(doc, block, styles)
+            instrumentation.incr("rendered_blocks")
+            stats.blocks += 1
+            writer.block_done()
+
+
+def _run_thread(input_path, output_path, transform, queue_size, flush_every, parse_kwargs, stats) -> None:
+    header, blocks = iter_parse_docx(input_path, **parse_kwargs)
+    q: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    waits = [0]
+    producer = threading.Thread(
+        target=_produce, args=(blocks, q, stop, waits), name="word-ast-parse", daemon=True
+    )
+    producer.start()
+    try:
+        _render_stream(header, _consume(q, stats), output_path, transform, flush_every, stats)
+    finally:
+        stop.set()
+        producer.join()
+        stats.producer_waits = waits[0]
+
+
+def _run_process(input_path, output_path, transform, queue_size, flush_every, parse_kwargs, stats) -> None:
+    q = multiprocessing.Queue(maxsize=queue_size)
+    producer = multiprocessing.Process(
+        target=_process_producer, args=(str(input_path), parse_kwargs, q), daemon=True
+    )
+    producer.start()
+    try:
+        header = q.get()
+        if isinstance(header, BaseException):
+            raise header
+        _render_stream(header, _consume(q, stats), output_path, transform, flush_every, stats)
+        stats.producer_waits = q.get()
+    finally:
+        if producer.is_alive():
+            producer.terminate()
+        producer.join()
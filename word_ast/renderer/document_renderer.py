@@ -1,4 +1,4 @@
-import json
+from collections.abc import Iterable
 from pathlib import Path
 
 from docx import Document
@@ -6,8 +6,13 @@ from docx.oxml.ns import qn
 from docx.shared import Twips
 from lxml import etree
 
+from word_ast import instrumentation
+from word_ast.serializers import load_ast
+from word_ast.storage.jsonl import JsonlAST, is_jsonl_ast
 
 from .paragraph_renderer import render_paragraph
+from .parallel import render_parallel
+from .streaming import StreamingDocxWriter
 from .style_renderer import render_styles
 from .table_renderer import render_table
 from .toc_renderer import render_toc
@@ -105,27 +110,105 @@ def _render_meta(doc, meta: dict):
             setattr(section, key, Twips(margin[field]))
 
 
-def render_ast(ast_or_path: dict | str | Path, output_path: str | Path):
-    if isinstance(ast_or_path, (str, Path)):
-        ast = json.loads(Path(ast_or_path).read_text(encoding="utf-8"))
-    else:
-        ast = ast_or_path
+def render_ast(
+    ast_or_path,
+    output_path: str | Path,
+    *,
+    workers: int | None = None,
+    streaming: bool = False,
+):
+    """将 AST 渲染为 docx。
+
+    *ast_or_path* may be an AST dict, a path to a full AST in any format of
+    :mod:`word_ast.serializers` (detected from its magic bytes), a path
+    to a ``.jsonl`` full AST (see :mod:`word_ast.storage.jsonl`), or any lazy
+    AST object exposing ``header`` and ``iter_blocks()``.  Lazy inputs are
+    streamed block by block instead of being loaded up front.
+
+    With *workers* > 1 blocks are rendered to XML fragments in that many
+    worker processes and stitched together here (see
+    :mod:`word_ast.renderer.parallel`); the output is the same.
+
+    With *streaming* ``word/document.xml`` is written to the output zip
+    while blocks are rendered and rendered blocks are dropped, so memory
+    stays bounded for any document length (see
+    :mod:`word_ast.renderer.streaming`).  Combine it with a lazy input to
+    keep the whole path bounded.
+    """
+    with instrumentation.span("render_ast", output=str(output_path)):
+        header, blocks = _resolve_ast(ast_or_path)
+        if streaming:
+            _render_ast_streaming(header, blocks, output_path, workers=workers)
+        else:
+            _render_ast(header, blocks, output_path, workers=workers)
+
 
+def _resolve_ast(ast_or_path) -> tuple[dict, Iterable[dict]]:
+    """返回 (AST 头部, block 可迭代对象)。"""
+    if isinstance(ast_or_path, (str, Path)):
+        path = Path(ast_or_path)
+        if is_jsonl_ast(path):
+            ast_or_path = JsonlAST(path)
+        else:
+            ast_or_path = load_ast(path)
+    if isinstance(ast_or_path, dict):
+        return ast_or_path, ast_or_path["document"].get("body", [])
+    return ast_or_path.header, ast_or_path.iter_blocks()
+
+
+def _new_document(ast: dict):
+    """新建空白文档并应用 AST 头部（样式、页面设置）。"""
     doc = Document()
     _remove_heading_colors(doc)
     _set_compat_mode_15(doc)
-    styles = ast["document"].get("styles", {})
-    render_styles(doc, styles)
+    render_styles(doc, ast["document"].get("styles", {}))
     _render_meta(doc, ast["document"].get("meta", {}))
+    return doc
+
 
-    body = ast["document"].get("body", [])
-    for block in body:
-        t = block.get("type")
-        if t == "Paragraph":
+def _render_block(doc, block: dict, styles: dict) -> None:
+    t = block.get("type")
+    if t == "Paragraph":
+        with instrumentation.span("render.paragraph", block_id=block.get("id")):
             render_paragraph(doc, block, styles)
-        elif t == "Table":
+    elif t == "Table":
+        with instrumentation.span("render.table", block_id=block.get("id")):
             render_table(doc, block, styles)
-        elif t == "TOC":
+    elif t == "TOC":
+        with instrumentation.span("render.toc", block_id=block.get("id")):
             render_toc(doc, block, styles)
 
-    doc.save(str(output_path))
+
+def _render_ast(
+    ast: dict, blocks: Iterable[dict], output_path: str | Path, *, workers: int | None = None
+) -> None:
+    doc = _new_document(ast)
+    if workers is not None and workers > 1:
+        render_parallel(doc, ast, blocks, workers=workers)
+    else:
+        styles = ast["document"].get("styles", {})
+        for block in blocks:
+            _render_block(doc, block, styles)
+            instrumentation.incr("rendered_blocks")
+
+    with instrumentation.span("render.save"):
+        doc.save(str(output_path))
+    if instrumentation.is_enabled():
+        instrumentation.incr("bytes_written", Path(output_path).stat().st_size)
+
+
+def _render_ast_streaming(
+    ast: dict, blocks: Iterable[dict], output_path: str | Path, *, workers: int | None = None
+) -> None:
+    doc = _new_document(ast)
+    with StreamingDocxWriter(doc, output_path) as writer:
+        if workers is not None and workers > 1:
+            render_parallel(doc, ast, blocks, workers=workers, after_chunk=writer.flush)
+        else:
+            styles = ast["document"].get("styles", {})
+            for block in blocks:
+                _render_block(doc, block, styles)
+                instrumentation.incr("rendered_blocks")
+                writer.block_done()
+    if instrumentation.is_enabled():
+        instrumentation.incr("bytes_written", Path(output_path).stat().st_size)
@@ -8,6 +8,7 @@ from docx.oxml.ns import qn
 from docx.oxml.parser import parse_xml
 from docx.shared import RGBColor, Pt, Twips
 
+from word_ast import instrumentation
 from word_ast.utils.units import half_points_to_pt
 
 _ALIGN_FROM_STR = {
@@ -19,6 +20,7 @@ _ALIGN_FROM_STR = {
 
 
 def _apply_raw_rPr(run, raw_rPr: str) -> None:
+    instrumentation.incr("raw_xml_parses")
     try:
         new_rPr = parse_xml(raw_rPr)
     except Exception:
@@ -37,6 +39,7 @@ def _apply_raw_rPr(run, raw_rPr: str) -> None:
 
 
 def _apply_raw_pPr(paragraph, raw_pPr: str) -> None:
+    instrumentation.incr("raw_xml_parses")
     try:
         new_pPr = parse_xml(raw_pPr)
     except Exception:
@@ -151,20 +154,23 @@ def render_paragraph(doc, block: dict, styles: dict | None = None):
     for piece in block.get("content", []):
         if piece.get("type") == "InlineImage":
             try:
-                image_bytes = base64.b64decode(piece["data"])
-                run = paragraph.add_run()
-                width = piece.get("width")
-                height = piece.get("height")
-                run.add_picture(
-                    io.BytesIO(image_bytes),
-                    width=Twips(width) if width else None,
-                    height=Twips(height) if height else None,
-                )
+                with instrumentation.span("render.image"):
+                    image_bytes = base64.b64decode(piece["data"])
+                    run = paragraph.add_run()
+                    width = piece.get("width")
+                    height = piece.get("height")
+                    run.add_picture(
+                        io.BytesIO(image_bytes),
+                        width=Twips(width) if width else None,
+                        height=Twips(height) if height else None,
+                    )
+                instrumentation.incr("images")
             except (KeyError, ValueError, OSError):
                 pass
             continue
         if piece.get("type") != "Text":
             continue
         run = paragraph.add_run(piece.get("text", ""))
+        instrumentation.incr("runs")
         run_overrides = piece.get("overrides", {})
         _apply_run_overrides(run, run_overrides)
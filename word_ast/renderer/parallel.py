@@ -0,0 +1,168 @@
+"""并行渲染：在子进程中把 block 分块渲染成 XML 片段，再在主进程中按序拼接。
+
+Parallel rendering of body chunks into XML fragments.
+
+Rendering a block only depends on the AST header (styles, page setup), so
+:func:`render_parallel` cuts the block stream into contiguous chunks and
+renders each chunk into a scratch document in a worker process.  A worker
+returns the chunk's body elements as ``<w:p>`` / ``<w:tbl>`` / ``<w:sdt>``
+XML strings together with the bytes of every image it embedded.
+
+The calling process owns the package: it parses the fragments in
+document order, adds each image to its own document part (so relationship
+ids and media part names are allocated in the same order as in a serial
+render) and renumbers ``<wp:docPr>`` ids the way python-docx would have
+(one more than the largest ``id`` already in the document).  The saved
+package is identical to the output of a serial render.
+
+Workers are separate processes: ``runs`` / ``images`` /
+``raw_xml_parses`` counters recorded there are not reported; ``blocks``
+is counted by the caller.
+"""
+import io
+import itertools
+import math
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import qn
+from docx.oxml.parser import parse_xml
+from lxml import etree
+
+from word_ast import instrumentation
+
+_WP_NS = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+_A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_TAG_DOC_PR = f"{{{_WP_NS}}}docPr"
+_TAG_BLIP = f"{{{_A_NS}}}blip"
+_ATTR_EMBED = f"{{{_R_NS}}}embed"
+
+# Chunks per worker when the number of blocks is known up front; lazy
+# block streams are cut into chunks of _STREAM_CHUNK_SIZE blocks
+_CHUNKS_PER_WORKER = 4
+_STREAM_CHUNK_SIZE = 256
+
+# Per-process AST header set up by _init_worker
+_worker_header: dict = {}
+
+
+def _init_worker(header: dict) -> None:
+    global _worker_header
+    _worker_header = header
+
+
+def _render_chunk(blocks: list[dict]) -> tuple[list[str], dict[str, bytes]]:
+    """在空白文档中渲染 *blocks*，返回 (body 子元素 XML 列表, {rId: 图片字节})。"""
+    from .document_renderer import _new_document, _render_block
+
+    doc = _new_document(_worker_header)
+    body = doc.element.body
+    existing = len(body) - 1  # the template body holds only <w:sectPr>
+    styles = _worker_header["document"].get("styles", {})
+    for block in blocks:
+        _render_block(doc, block, styles)
+    fragments = [etree.tostring(el, encoding="unicode") for el in body[existing:-1]]
+    images = {
+        r_id: rel.target_part.blob
+        for r_id, rel in doc.part.rels.items()
+        if rel.reltype == RT.IMAGE and not rel.is_external
+    }
+    return fragments, images
+
+
+def _chunks(blocks: Iterable[dict], workers: int) -> Iterator[list[dict]]:
+    if isinstance(blocks, list):
+        size = max(1, math.ceil(len(blocks) / (workers * _CHUNKS_PER_WORKER)))
+        for start in range(0, len(blocks), size):
+            yield blocks[start:start + size]
+        return
+    iterator = iter(blocks)
+    while chunk := list(itertools.islice(iterator, _STREAM_CHUNK_SIZE)):
+        yield chunk
+
+
+class _Stitcher:
+    """把片段按序插入主文档 body，并重新分配图片关系 id 与 ``docPr`` id。"""
+
+    def __init__(self, doc):
+        self._part = doc.part
+        self._sect_pr = doc.element.body.find(qn("w:sectPr"))
+        self._body = doc.element.body
+        # Largest numeric unqualified ``id`` in the document, as scanned by
+        # python-docx's StoryPart.next_id
+        self._max_id = self._part.next_id - 1
+
+    def add(self, fragments: list[str], images: dict[str, bytes]) -> None:
+        for xml in fragments:
+            element = parse_xml(xml)
+            self.renumber(element, images)
+            if self._sect_pr is not None:
+                self._sect_pr.addprevious(element)
+            else:
+                self._body.append(element)
+
+    def renumber(self, element, images: dict[str, bytes] | None = None) -> None:
+        """按文档顺序重写 *element* 内的 ``docPr`` id，并把 *images* 中的图片加入主文档。
+
+        Must be called on body elements in document order: a serial render
+        allocates both the image relationship and the docPr id when it
+        reaches the picture.  Renumbering elements that already carry
+        serial ids leaves them unchanged.
+        """
+        for el in element.iter(etree.Element):
+            if el.tag == _TAG_DOC_PR:
+                # CT_Inline.new writes id="<n>" name="Picture <n>"
+                self._max_id += 1
+                el.set("id", str(self._max_id))
+                el.set("name", f"Picture {self._max_id}")
+                continue
+            if el.tag == _TAG_BLIP and images:
+                blob = images.get(el.get(_ATTR_EMBED))
+                if blob is not None:
+                    r_id, _ = self._part.get_or_add_image(io.BytesIO(blob))
+                    el.set(_ATTR_EMBED, r_id)
+            value = el.get("id")
+            if value is not None and value.isdigit():
+                self._max_id = max(self._max_id, int(value))
+
+
+def render_parallel(
+    doc,
+    header: dict,
+    blocks: Iterable[dict],
+    *,
+    workers: int,
+    after_chunk: Callable[[], None] | None = None,
+) -> None:
+    """用 *workers* 个进程渲染 *blocks*，按文档顺序拼接到 *doc* 的 body。
+
+    At most ``2 * workers`` chunks are in flight, so lazy block streams are
+    consumed with bounded memory.  *after_chunk* is called after each
+    chunk has been stitched (the streaming writer flushes there).
+    """
+    header = {**header, "document": {**header["document"], "body": []}}
+    stitcher = _Stitcher(doc)
+    with instrumentation.span("render.parallel", workers=workers):
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(header,)
+        ) as pool:
+            pending: deque = deque()
+            for chunk in _chunks(blocks, workers):
+                pending.append((pool.submit(_render_chunk, chunk), len(chunk)))
+                if len(pending) >= 2 * workers:
+                    _drain(stitcher, pending.popleft(), after_chunk)
+            while pending:
+                _drain(stitcher, pending.popleft(), after_chunk)
+
+
+def _drain(stitcher: _Stitcher, entry, after_chunk) -> None:
+    future, count = entry
+    fragments, images = future.result()
+    with instrumentation.span("render.stitch", blocks=count):
+        stitcher.add(fragments, images)
+    instrumentation.incr("rendered_blocks", count)
+    if after_chunk is not None:
+        after_chunk()
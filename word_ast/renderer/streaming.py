@@ -0,0 +1,145 @@
+"""流式 docx 写出：边渲染边把 word/document.xml 增量写入 zip。
+
+Streaming docx writer.
+
+``doc.save()`` serializes the whole document tree at once, so a normal
+render holds every rendered block in memory until the end.
+:class:`StreamingDocxWriter` opens the output zip up front and streams the
+``word/document.xml`` entry: every ``flush()`` serializes the body
+elements rendered since the previous flush, writes them to the entry and
+drops them from the tree.  When the writer is closed it writes the
+closing ``<w:sectPr>`` and the remaining parts (styles, settings,
+relationships, media, content types) from the in-memory package.
+
+Part contents are byte-identical to ``doc.save()`` output; only the
+order of the zip entries differs.  Peak memory is bounded by the blocks
+between two flushes, plus the embedded image bytes, which the package
+keeps (deduplicated) until it is closed.
+
+The package is written to a temporary file next to *output_path* and
+moved into place only when it is complete; if rendering fails the
+temporary file is removed and *output_path* is left untouched.
+"""
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+from docx.opc.oxml import serialize_part_xml
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI
+from docx.opc.pkgwriter import _ContentTypesItem
+from docx.oxml.ns import qn
+
+from word_ast import instrumentation
+
+from .parallel import _Stitcher
+
+_BODY_OPEN = b"<w:body>"
+
+
+class StreamingDocxWriter:
+    """把 *doc* 的 body 增量写入 *output_path*。
+
+    Render blocks into *doc* as usual and call :meth:`flush` (or
+    :meth:`block_done` after each block, which flushes every
+    *flush_every* blocks); :meth:`close` — or leaving the ``with`` block
+    without an exception — completes the package, :meth:`abort` — or an
+    exception inside the ``with`` block — discards it.
+    """
+
+    def __init__(self, doc, output_path: str | Path, *, flush_every: int = 64):
+        self._doc = doc
+        self._part = doc.part
+        self._body = doc.element.body
+        self._sect_pr = self._body.find(qn("w:sectPr"))
+        self._flush_every = max(1, flush_every)
+        self._pending = 0
+        self._renumber = _Stitcher(doc).renumber
+
+        # Serialize the document around an empty body once: every flush
+        # then writes exactly the bytes between <w:body> and <w:sectPr>
+        if self._sect_pr is None or len(self._body) != 1:
+            raise ValueError("StreamingDocxWriter needs an empty body holding only <w:sectPr>")
+        skeleton = serialize_part_xml(doc.element)
+        split = skeleton.index(_BODY_OPEN) + len(_BODY_OPEN)
+        self._head, self._tail = skeleton[:split], skeleton[split:]
+
+        self.path = Path(output_path)
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=self.path.parent)
+        os.close(fd)
+        self._tmp_path = Path(tmp)
+        self._zip = zipfile.ZipFile(self._tmp_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._entry = self._zip.open(self._part.partname.membername, "w", force_zip64=True)
+        self._entry.write(self._head)
+        self.bytes_flushed = 0
+
+    def __enter__(self) -> "StreamingDocxWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def abort(self) -> None:
+        """放弃写出：关闭并删除临时文件，*output_path* 保持不变。"""
+        try:
+            if not self._entry.closed:
+                self._entry.close()
+            self._zip.close()
+        finally:
+            self._tmp_path.unlink(missing_ok=True)
+
+    def block_done(self) -> None:
+        """记录一个已渲染的 block；累计 *flush_every* 个时自动 flush。"""
+        self._pending += 1
+        if self._pending >= self._flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """写出自上次 flush 以来渲染的 body 元素并将其从文档树中移除。"""
+        self._pending = 0
+        elements = [el for el in self._body if el is not self._sect_pr]
+        if not elements:
+            return
+        with instrumentation.span("render.flush", elements=len(elements)):
+            for element in elements:
+                self._renumber(element)
+            data = serialize_part_xml(self._doc.element)
+            if not (data.startswith(self._head) and data.endswith(self._tail)):
+                raise RuntimeError("document changed outside the body while streaming")
+            chunk = data[len(self._head):len(data) - len(self._tail)]
+            self._entry.write(chunk)
+            self.bytes_flushed += len(chunk)
+            for element in elements:
+                self._body.remove(element)
+
+    def close(self) -> None:
+        """写出剩余 body、``<w:sectPr>`` 及其余所有部件，关闭 zip。"""
+        if self._entry.closed:
+            return
+        try:
+            self._finish()
+        except BaseException:
+            self.abort()
+            raise
+        os.replace(self._tmp_path, self.path)
+
+    def _finish(self) -> None:
+        self.flush()
+        self._entry.write(self._tail)
+        self._entry.close()
+        with instrumentation.span("render.save"):
+            package = self._part.package
+            parts = list(package.iter_parts())
+            for part in parts:
+                part.before_marshal()
+            self._zip.writestr(CONTENT_TYPES_URI.membername, _ContentTypesItem.from_parts(parts).blob)
+            self._zip.writestr(PACKAGE_URI.rels_uri.membername, package.rels.xml)
+            for part in parts:
+                if part is not self._part:
+                    self._zip.writestr(part.partname.membername, part.blob)
+                if len(part.rels):
+                    self._zip.writestr(part.partname.rels_uri.membername, part.rels.xml)
+            self._zip.close()
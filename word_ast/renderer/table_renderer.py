@@ -3,10 +3,13 @@ import copy
 from docx.oxml.ns import qn
 from docx.oxml.parser import parse_xml
 
+from word_ast import instrumentation
+
 from .paragraph_renderer import render_paragraph
 
 
 def _apply_raw_tcPr(tc_element, raw_tcPr: str) -> None:
+    instrumentation.incr("raw_xml_parses")
     try:
         new_tcPr = parse_xml(raw_tcPr)
     except Exception:
@@ -24,6 +27,7 @@ def _apply_raw_tblPr(tbl_element, raw_tblPr: str) -> None:
     the style already set by _apply_table_style; all other table properties
     (width, alignment, borders, etc.) are preserved.
     """
+    instrumentation.incr("raw_xml_parses")
     try:
         new_tblPr = parse_xml(raw_tblPr)
     except Exception:
@@ -45,6 +49,7 @@ def _apply_raw_tblPr(tbl_element, raw_tblPr: str) -> None:
 
 def _apply_raw_trPr(tr_element, raw_trPr: str) -> None:
     """Replace a table row's <w:trPr> with the round-tripped raw XML."""
+    instrumentation.incr("raw_xml_parses")
     try:
         new_trPr = parse_xml(raw_trPr)
     except Exception:
@@ -0,0 +1,140 @@
+"""完整 AST 的可插拔序列化格式（仅依赖标准库）。
+
+Pluggable serializers for the full AST.
+
+``full_ast.json`` is dominated by repetitive ``_raw_*`` XML strings and
+base64 image data, which compress very well.  Every serializer writes the
+same JSON document; they differ only in indentation and in the compression
+layer around the text stream:
+
+================  =============  =========================================
+name              file suffix    layout
+================  =============  =========================================
+``json``          ``.json``      ``indent=2`` (the historical default)
+``json-compact``  ``.json``      no indentation, ``(",", ":")`` separators
+``gzip``          ``.json.gz``   compact JSON, gzip level 6
+``lzma``          ``.json.xz``   compact JSON, xz preset 6
+================  =============  =========================================
+
+:func:`load_ast` detects the format from the file's magic bytes, so readers
+never need to be told which serializer produced a file.  Block-per-line
+JSONL files (:mod:`word_ast.storage.jsonl`) are recognized as well.
+"""
+import functools
+import gzip
+import json
+import lzma
+from collections.abc import Callable
+from pathlib import Path
+from typing import TextIO
+
+from word_ast import instrumentation
+from word_ast.nodes import json_default
+from word_ast.storage.jsonl import JsonlAST, is_jsonl_ast
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_XZ_MAGIC = b"\xfd7zXZ\x00"
+
+
+class Serializer:
+    """一种完整 AST 序列化格式。
+
+    *opener* is called as ``opener(path, mode, encoding="utf-8")`` with a
+    text mode (``"rt"``/``"wt"``) and must return a text stream.
+    """
+
+    __slots__ = ("name", "suffix", "indent", "_opener")
+
+    def __init__(self, name: str, suffix: str, *, indent: int | None = None,
+                 opener: Callable[..., TextIO] = open):
+        self.name = name
+        self.suffix = suffix
+        self.indent = indent
+        self._opener = opener
+
+    def open(self, path: str | Path, mode: str = "r") -> TextIO:
+        """以文本模式打开 *path*（``"r"`` 或 ``"w"``）。"""
+        return self._opener(path, mode + "t", encoding="utf-8")
+
+    def dump(self, ast: dict, path: str | Path) -> None:
+        with self.open(path, "w") as fp:
+            if self.indent is None:
+                json.dump(ast, fp, ensure_ascii=False, separators=(",", ":"), default=json_default)
+            else:
+                json.dump(ast, fp, ensure_ascii=False, indent=self.indent, default=json_default)
+
+    def load(self, path: str | Path) -> dict:
+        with self.open(path, "r") as fp:
+            return json.load(fp)
+
+    def __repr__(self) -> str:
+        return f"Serializer({self.name!r}, suffix={self.suffix!r})"
+
+
+SERIALIZERS: dict[str, Serializer] = {}
+
+
+def register_serializer(serializer: Serializer) -> Serializer:
+    """注册（或替换）一个序列化格式。"""
+    SERIALIZERS[serializer.name] = serializer
+    return serializer
+
+
+register_serializer(Serializer("json", ".json", indent=2))
+register_serializer(Serializer("json-compact", ".json"))
+register_serializer(Serializer("gzip", ".json.gz", opener=functools.partial(gzip.open, compresslevel=6)))
+register_serializer(Serializer("lzma", ".json.xz", opener=lzma.open))
+
+DEFAULT_FORMAT = "json"
+
+
+def get_serializer(name: str) -> Serializer:
+    try:
+        return SERIALIZERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown AST format {name!r}; expected one of {sorted(SERIALIZERS)}"
+        ) from None
+
+
+def serializer_for_path(path: str | Path) -> Serializer:
+    """按文件名后缀选择格式（``.json.gz`` → gzip，``.json.xz`` → lzma，其余 → json）。"""
+    name = Path(path).name
+    for serializer in SERIALIZERS.values():
+        if serializer.suffix != ".json" and name.endswith(serializer.suffix):
+            return serializer
+    return SERIALIZERS[DEFAULT_FORMAT]
+
+
+def detect_format(path: str | Path) -> str:
+    """根据文件头魔数识别格式：``gzip`` / ``lzma`` / ``jsonl`` / ``json``。"""
+    with open(path, "rb") as fp:
+        head = fp.read(8)
+    if head.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(_XZ_MAGIC):
+        return "lzma"
+    if is_jsonl_ast(path):
+        return "jsonl"
+    return "json"
+
+
+def dump_ast(ast: dict, path: str | Path, format: str | None = None) -> int:
+    """将 *ast* 写入 *path*，返回写出的字节数。
+
+    *format* defaults to the one implied by the file suffix (see
+    :func:`serializer_for_path`).
+    """
+    serializer = get_serializer(format) if format else serializer_for_path(path)
+    serializer.dump(ast, path)
+    size = Path(path).stat().st_size
+    instrumentation.incr("bytes_written", size)
+    return size
+
+
+def load_ast(path: str | Path) -> dict:
+    """读取任意受支持格式的完整 AST（自动识别格式）。"""
+    fmt = detect_format(path)
+    if fmt == "jsonl":
+        return JsonlAST(path).load()
+    return SERIALIZERS[fmt].load(path)
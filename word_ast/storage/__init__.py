@@ -0,0 +1,18 @@
+"""AST 存储后端。
+
+Storage backends for parsed ASTs.  Every backend exposes documents through
+the lazy-AST protocol (a ``header`` skeleton plus ``iter_blocks()``) so
+that ``merge_ai_edits`` and ``render_ast`` can consume them directly.
+"""
+from .jsonl import JsonlAST, write_jsonl_ast
+from .sqlite_store import SQLiteStore, StoredDocument
+from .versions import StoredVersion, VersionStore
+
+__all__ = [
+    "JsonlAST",
+    "write_jsonl_ast",
+    "SQLiteStore",
+    "StoredDocument",
+    "VersionStore",
+    "StoredVersion",
+]
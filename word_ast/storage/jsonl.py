@@ -0,0 +1,228 @@
+"""JSONL 格式的完整 AST：头部一行 + 每个 body block 一行 + 偏移索引。
+
+Block-per-line full-AST layout with lazy loading.
+
+File layout (UTF-8, one JSON value per line)::
+
+    {"format": "word_ast.jsonl", "schema_version": "1.0", "document": {meta, styles, passthrough}}
+    {"id": "p0", "type": "Paragraph", ...}
+    {"id": "t0", "type": "Table", ...}
+    ...
+
+A sidecar index ``<path>.idx`` maps every block id to the byte offset of its
+line.  :class:`JsonlAST` reads only the header and the index on open, then
+streams blocks with :meth:`JsonlAST.iter_blocks` or seeks straight to one
+with :meth:`JsonlAST.get_block`.  When the index is missing or stale it is
+rebuilt with one scan that reads only the ``id`` prefix of each line.
+
+``JsonlAST`` implements the lazy-AST protocol (``header`` +
+``iter_blocks()``) accepted by ``render_ast`` and ``merge_ai_edits``.
+"""
+import copy
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+
+from word_ast.nodes import json_default
+
+FORMAT_TAG = "word_ast.jsonl"
+INDEX_SUFFIX = ".idx"
+_INDEX_VERSION = 1
+
+# Blocks are written with "id" as their first key, so the id can be read
+# from the line prefix without decoding the whole block.
+_ID_PREFIX_RE = re.compile(rb'^\{"id":("(?:[^"\\]|\\.)*")')
+
+
+def _dumps_line(obj) -> bytes:
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=json_default
+    ).encode("utf-8") + b"\n"
+
+
+def _header_of(ast: dict) -> dict:
+    document = {k: v for k, v in ast.get("document", {}).items() if k != "body"}
+    header = {"format": FORMAT_TAG}
+    header.update({k: v for k, v in ast.items() if k != "document"})
+    header["document"] = document
+    return header
+
+
+def _id_first(block: dict) -> dict:
+    if not isinstance(block, Mapping) or "id" not in block or next(iter(block)) == "id":
+        return block
+    return {"id": block["id"], **{k: v for k, v in block.items() if k != "id"}}
+
+
+def index_path_for(path: str | Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+def write_jsonl_ast(
+    ast: dict,
+    path: str | Path,
+    blocks: Iterable[dict] | None = None,
+) -> int:
+    """写出 JSONL 格式的完整 AST 及其索引，返回 block 数。
+
+    Writes *ast* to *path* in the block-per-line layout and writes the
+    id → offset index next to it.  When *blocks* is given it is consumed
+    instead of ``ast["document"]["body"]``, which lets a streaming parser
+    (``iter_parse_docx``) feed the file without materializing the body.
+    """
+    path = Path(path)
+    if blocks is None:
+        blocks = ast.get("document", {}).get("body", [])
+    offsets: dict[str, int] = {}
+    order: list[str | None] = []
+    with open(path, "wb") as fp:
+        fp.write(_dumps_line(_header_of(ast)))
+        for block in blocks:
+            block_id = block.get("id") if isinstance(block, Mapping) else None
+            if block_id is not None:
+                offsets[block_id] = fp.tell()
+            order.append(block_id)
+            fp.write(_dumps_line(_id_first(block)))
+    _write_index(path, offsets, len(order))
+    return len(order)
+
+
+def _write_index(path: Path, offsets: dict[str, int], count: int) -> None:
+    stat = path.stat()
+    index = {
+        "version": _INDEX_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "count": count,
+        "offsets": offsets,
+    }
+    index_path_for(path).write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+
+
+def is_jsonl_ast(path: str | Path) -> bool:
+    """判断 *path* 是否为本模块写出的 JSONL AST（读取首行头部标记）。"""
+    try:
+        with open(path, "rb") as fp:
+            head = fp.read(64)
+    except OSError:
+        return False
+    return head.startswith(b'{"format":"' + FORMAT_TAG.encode("ascii") + b'"')
+
+
+class JsonlAST:
+    """JSONL 完整 AST 的惰性只读访问对象。
+
+    Lazy read-only access to a JSONL full AST.  Opening reads only the
+    header line and the index; block data is read on demand.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as fp:
+            header = json.loads(fp.readline())
+        if header.pop("format", None) != FORMAT_TAG:
+            raise ValueError(f"{self.path} is not a word_ast JSONL AST")
+        header.setdefault("document", {})
+        # Keep the canonical key order: body sits between styles and passthrough
+        document = header["document"]
+        passthrough = document.pop("passthrough", {})
+        document["body"] = []
+        document["passthrough"] = passthrough
+        self._header = header
+        self._offsets, self._count = self._load_index()
+
+    def _load_index(self) -> tuple[dict[str, int], int]:
+        index_path = index_path_for(self.path)
+        stat = self.path.stat()
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+            if (
+                index.get("version") == _INDEX_VERSION
+                and index.get("size") == stat.st_size
+                and index.get("mtime_ns") == stat.st_mtime_ns
+            ):
+                return index["offsets"], index["count"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return self.rebuild_index()
+
+    def rebuild_index(self) -> tuple[dict[str, int], int]:
+        """扫描文件重建 id → 偏移索引并写回 sidecar 文件。"""
+        offsets: dict[str, int] = {}
+        count = 0
+        with open(self.path, "rb") as fp:
+            fp.readline()
+            while True:
+                offset = fp.tell()
+                line = fp.readline()
+                if not line.strip():
+                    if not line:
+                        break
+                    continue
+                count += 1
+                match = _ID_PREFIX_RE.match(line)
+                if match:
+                    block_id = json.loads(match.group(1))
+                else:
+                    block = json.loads(line)
+                    block_id = block.get("id") if isinstance(block, dict) else None
+                if block_id is not None:
+                    offsets[block_id] = offset
+        try:
+            _write_index(self.path, offsets, count)
+        except OSError:
+            pass
+        self._offsets, self._count = offsets, count
+        return offsets, count
+
+    @property
+    def header(self) -> dict:
+        """AST 头部骨架（``body`` 为空列表）。"""
+        return self._header
+
+    @property
+    def block_ids(self) -> list[str]:
+        return list(self._offsets)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, block_id) -> bool:
+        return block_id in self._offsets
+
+    def iter_blocks(self) -> Iterator[dict]:
+        """按文件顺序逐行流式读取 block。"""
+        with open(self.path, "rb") as fp:
+            fp.readline()
+            for line in fp:
+                if line.strip():
+                    yield json.loads(line)
+
+    def get_block(self, block_id: str) -> dict:
+        """按 id 随机读取单个 block；不存在时抛出 ``KeyError``。"""
+        offset = self._offsets[block_id]
+        with open(self.path, "rb") as fp:
+            fp.seek(offset)
+            return json.loads(fp.readline())
+
+    def get_blocks(self, block_ids: Iterable[str]) -> list[dict]:
+        """按偏移顺序批量读取若干 block（返回顺序与 *block_ids* 一致）。"""
+        wanted = list(block_ids)
+        found: dict[str, dict] = {}
+        with open(self.path, "rb") as fp:
+            for block_id in sorted(set(wanted), key=self._offsets.__getitem__):
+                fp.seek(self._offsets[block_id])
+                found[block_id] = json.loads(fp.readline())
+        return [found[block_id] for block_id in wanted]
+
+    def load(self) -> dict:
+        """物化为普通 dict AST。"""
+        ast = copy.deepcopy(self._header)
+        ast["document"]["body"] = list(self.iter_blocks())
+        return ast
+
+    def __repr__(self) -> str:
+        return f"JsonlAST({os.fspath(self.path)!r}, blocks={self._count})"
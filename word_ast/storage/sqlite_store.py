@@ -0,0 +1,477 @@
+"""基于 sqlite3 的 AST 文档库。
+
+SQLite-backed document store for parsed ASTs (stdlib :mod:`sqlite3` only).
+
+Schema:
+
+- ``documents`` — one row per document: name, schema version, the AST
+  header (everything except ``body``) and the block count;
+- ``blocks`` — one row per body block in document order, with ``block_id``,
+  ``type`` and ``style`` columns (all indexed) and the block JSON;
+- ``runs`` — a query projection of every paragraph run (top-level and
+  table-cell paragraphs) for text search; the block JSON stays authoritative;
+- ``raw_xml`` — a deduplicated pool of ``_raw_*`` XML strings.  Inside the
+  stored block JSON every ``_raw_*`` value is replaced by the integer id of
+  its pool row, so formatting XML repeated across runs and documents is
+  stored once;
+- ``media`` — a deduplicated pool of image bytes.  ``InlineImage.data`` is
+  stored as the integer id of its row (decoded bytes, not base64).
+
+Deleting a document removes its blocks and runs and every pool row no
+other document still references.
+
+Stored documents are exposed as :class:`StoredDocument` objects that follow
+the lazy-AST protocol, so they can be passed straight to ``merge_ai_edits``
+and ``render_ast``.
+"""
+import base64
+import copy
+import hashlib
+import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from word_ast import instrumentation
+
+_RAW_PREFIX = "_raw_"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id         INTEGER PRIMARY KEY,
+    name           TEXT,
+    schema_version TEXT,
+    header         TEXT NOT NULL,
+    block_count    INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS documents_name ON documents(name);
+
+CREATE TABLE IF NOT EXISTS raw_xml (
+    raw_id INTEGER PRIMARY KEY,
+    digest BLOB NOT NULL UNIQUE,
+    xml    TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS media (
+    media_id INTEGER PRIMARY KEY,
+    digest   BLOB NOT NULL UNIQUE,
+    data     BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS blocks (
+    doc_id   INTEGER NOT NULL REFERENCES documents(doc_id) ON DELETE CASCADE,
+    seq      INTEGER NOT NULL,
+    block_id TEXT,
+    type     TEXT,
+    style    TEXT,
+    data     TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS blocks_doc_seq ON blocks(doc_id, seq);
+CREATE INDEX IF NOT EXISTS blocks_block_id ON blocks(doc_id, block_id);
+CREATE INDEX IF NOT EXISTS blocks_style ON blocks(style);
+CREATE INDEX IF NOT EXISTS blocks_type ON blocks(type);
+
+CREATE TABLE IF NOT EXISTS runs (
+    doc_id       INTEGER NOT NULL REFERENCES documents(doc_id) ON DELETE CASCADE,
+    block_seq    INTEGER NOT NULL,
+    paragraph_id TEXT,
+    run_seq      INTEGER NOT NULL,
+    type         TEXT,
+    text         TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_doc ON runs(doc_id, block_seq);
+"""
+
+
+def _iter_paragraphs(block: dict) -> Iterator[dict]:
+    """产出 block 内的所有段落（顶层段落、表格单元格段落、目录标题）。"""
+    t = block.get("type")
+    if t == "Paragraph":
+        yield block
+    elif t == "Table":
+        for row in block.get("rows", []):
+            for cell in row.get("cells", []):
+                for p in cell.get("content", []):
+                    yield p
+    elif t == "TOC" and isinstance(block.get("title"), dict):
+        yield block["title"]
+
+
+class SQLiteStore:
+    """AST 文档库。
+
+    Open (or create) the database at *path*; ``":memory:"`` is accepted.
+    The store is a context manager that closes the connection on exit.
+    *raw_cache_size* bounds the in-process cache of raw-XML pool ids used
+    to avoid a lookup per ``_raw_*`` string during bulk inserts.
+    """
+
+    def __init__(self, path: str | Path, *, raw_cache_size: int = 200_000):
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(_SCHEMA)
+        # Pool ids of committed rows; ids inserted by the open transaction
+        # stay in _pending_raw_ids until it commits, since a rollback
+        # removes their rows again
+        self._raw_ids: dict[str, int] = {}
+        self._pending_raw_ids: dict[str, int] = {}
+        self._raw_cache_size = raw_cache_size
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._commit()
+        self.close()
+        return False
+
+    def _commit(self) -> None:
+        self.conn.commit()
+        if len(self._raw_ids) + len(self._pending_raw_ids) > self._raw_cache_size:
+            self._raw_ids.clear()
+        self._raw_ids.update(self._pending_raw_ids)
+        self._pending_raw_ids.clear()
+
+    def _rollback(self) -> None:
+        self.conn.rollback()
+        self._pending_raw_ids.clear()
+
+    # ------------------------------------------------------------------
+    # Raw XML / media pools
+    # ------------------------------------------------------------------
+
+    def _pool_id(self, table: str, key: str, value) -> int:
+        digest = hashlib.sha1(value.encode("utf-8") if isinstance(value, str) else value).digest()
+        cur = self.conn.execute(
+            f"INSERT OR IGNORE INTO {table}(digest, {key}) VALUES (?, ?)", (digest, value)
+        )
+        if cur.rowcount:
+            return cur.lastrowid
+        return self.conn.execute(
+            f"SELECT rowid FROM {table} WHERE digest = ?", (digest,)
+        ).fetchone()[0]
+
+    def _raw_id(self, xml: str) -> int:
+        raw_id = self._raw_ids.get(xml)
+        if raw_id is None:
+            raw_id = self._pending_raw_ids.get(xml)
+        if raw_id is not None:
+            instrumentation.incr("cache_hits")
+            return raw_id
+        instrumentation.incr("cache_misses")
+        raw_id = self._pool_id("raw_xml", "xml", xml)
+        self._pending_raw_ids[xml] = raw_id
+        return raw_id
+
+    def _pool_raw(self, obj):
+        """返回 *obj* 的副本：``_raw_*`` 字符串与图片数据替换为池 id。"""
+        if isinstance(obj, dict):
+            pooled = {}
+            for k, v in obj.items():
+                if isinstance(v, str) and k.startswith(_RAW_PREFIX):
+                    pooled[k] = self._raw_id(v)
+                elif k == "data" and isinstance(v, str) and obj.get("type") == "InlineImage":
+                    pooled[k] = self._pool_id("media", "data", base64.b64decode(v))
+                else:
+                    pooled[k] = self._pool_raw(v)
+            return pooled
+        if isinstance(obj, list):
+            return [self._pool_raw(v) for v in obj]
+        return obj
+
+    def _collect_pool_ids(self, obj, raw_ids: set, media_ids: set) -> None:
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                if isinstance(v, int) and k.startswith(_RAW_PREFIX):
+                    raw_ids.add(v)
+                elif k == "data" and isinstance(v, int) and obj.get("type") == "InlineImage":
+                    media_ids.add(v)
+                else:
+                    self._collect_pool_ids(v, raw_ids, media_ids)
+        elif isinstance(obj, list):
+            for v in obj:
+                self._collect_pool_ids(v, raw_ids, media_ids)
+
+    def _fetch_pool(self, table: str, column: str, ids: set) -> dict:
+        result: dict = {}
+        ids = list(ids)
+        # Stay well below SQLite's default host-parameter limit
+        for start in range(0, len(ids), 900):
+            chunk = ids[start:start + 900]
+            marks = ",".join("?" * len(chunk))
+            result.update(self.conn.execute(
+                f"SELECT rowid, {column} FROM {table} WHERE rowid IN ({marks})", chunk
+            ))
+        return result
+
+    def _resolve_pools(self, obj, raw: dict[int, str], media: dict[int, bytes]):
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                if isinstance(v, int) and k.startswith(_RAW_PREFIX):
+                    obj[k] = raw[v]
+                elif k == "data" and isinstance(v, int) and obj.get("type") == "InlineImage":
+                    obj[k] = base64.b64encode(media[v]).decode("ascii")
+                else:
+                    self._resolve_pools(v, raw, media)
+        elif isinstance(obj, list):
+            for v in obj:
+                self._resolve_pools(v, raw, media)
+        return obj
+
+    def _decode_blocks(self, rows: Iterable[tuple[str]]) -> list[dict]:
+        blocks = [json.loads(data) for (data,) in rows]
+        raw_ids: set = set()
+        media_ids: set = set()
+        for block in blocks:
+            self._collect_pool_ids(block, raw_ids, media_ids)
+        raw = self._fetch_pool("raw_xml", "xml", raw_ids) if raw_ids else {}
+        media = self._fetch_pool("media", "data", media_ids) if media_ids else {}
+        return [self._resolve_pools(block, raw, media) for block in blocks]
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _insert_document(self, ast: dict, name: str | None, blocks: Iterable[dict] | None) -> int:
+        document = ast.get("document", {})
+        header = {k: v for k, v in ast.items() if k != "document"}
+        header["document"] = {k: v for k, v in document.items() if k != "body"}
+        cur = self.conn.execute(
+            "INSERT INTO documents(name, schema_version, header) VALUES (?, ?, ?)",
+            (name, ast.get("schema_version"),
+             json.dumps(header, ensure_ascii=False, separators=(",", ":"))),
+        )
+        doc_id = cur.lastrowid
+
+        block_rows = []
+        run_rows = []
+        count = 0
+        for seq, block in enumerate(document.get("body", []) if blocks is None else blocks):
+            count += 1
+            block_rows.append((
+                doc_id, seq, block.get("id"), block.get("type"), block.get("style"),
+                json.dumps(self._pool_raw(block), ensure_ascii=False, separators=(",", ":")),
+            ))
+            for p in _iter_paragraphs(block):
+                for run_seq, piece in enumerate(p.get("content", [])):
+                    run_rows.append((
+                        doc_id, seq, p.get("id"), run_seq, piece.get("type"), piece.get("text"),
+                    ))
+        self.conn.executemany(
+            "INSERT INTO blocks(doc_id, seq, block_id, type, style, data) VALUES (?, ?, ?, ?, ?, ?)",
+            block_rows,
+        )
+        self.conn.executemany(
+            "INSERT INTO runs(doc_id, block_seq, paragraph_id, run_seq, type, text) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            run_rows,
+        )
+        self.conn.execute("UPDATE documents SET block_count = ? WHERE doc_id = ?", (count, doc_id))
+        return doc_id
+
+    def add_document(self, ast: dict, name: str | None = None, *, blocks: Iterable[dict] | None = None) -> int:
+        """保存一份 AST，返回 doc_id。
+
+        *blocks*, when given, is consumed instead of ``ast["document"]["body"]``
+        (for streaming from ``iter_parse_docx``).
+        """
+        try:
+            doc_id = self._insert_document(ast, name, blocks)
+        except BaseException:
+            self._rollback()
+            raise
+        self._commit()
+        return doc_id
+
+    def add_documents(self, items: Iterable, *, batch_size: int = 500) -> list[int]:
+        """批量保存多份 AST，每 *batch_size* 份提交一次事务。
+
+        *items* yields either AST dicts or ``(name, ast)`` pairs.  Returns
+        the new doc ids in input order.
+        """
+        doc_ids = []
+        pending = 0
+        try:
+            for item in items:
+                name, ast = item if isinstance(item, tuple) else (None, item)
+                doc_ids.append(self._insert_document(ast, name, None))
+                pending += 1
+                if pending >= batch_size:
+                    self._commit()
+                    pending = 0
+            self._commit()
+        except BaseException:
+            self._rollback()
+            raise
+        return doc_ids
+
+    def add_docx(self, docx_path: str | Path, name: str | None = None) -> int:
+        """解析 docx 并流式写入库中（不在内存中保留整个 body）。"""
+        from word_ast.parser.document_parser import iter_parse_docx
+
+        ast, blocks = iter_parse_docx(docx_path)
+        return self.add_document(ast, name or Path(docx_path).name, blocks=blocks)
+
+    def delete_document(self, doc_id: int) -> None:
+        """删除文档及其 block / run，并回收不再被引用的 raw XML 与图片池条目。
+
+        Finding unreferenced pool rows reads the remaining blocks, so a
+        delete costs a scan of the store when the document had pooled data.
+        """
+        raw_ids: set = set()
+        media_ids: set = set()
+        for (data,) in self.conn.execute("SELECT data FROM blocks WHERE doc_id = ?", (doc_id,)):
+            self._collect_pool_ids(json.loads(data), raw_ids, media_ids)
+        with self.conn:
+            self.conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+            if raw_ids or media_ids:
+                for (data,) in self.conn.execute("SELECT data FROM blocks"):
+                    used_raw: set = set()
+                    used_media: set = set()
+                    self._collect_pool_ids(json.loads(data), used_raw, used_media)
+                    raw_ids -= used_raw
+                    media_ids -= used_media
+                    if not raw_ids and not media_ids:
+                        break
+                self.conn.executemany("DELETE FROM raw_xml WHERE raw_id = ?", ((i,) for i in raw_ids))
+                self.conn.executemany("DELETE FROM media WHERE media_id = ?", ((i,) for i in media_ids))
+        if raw_ids:
+            self._raw_ids.clear()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def documents(self) -> list[tuple[int, str | None, int]]:
+        """列出所有文档：``(doc_id, name, block_count)``。"""
+        return list(self.conn.execute(
+            "SELECT doc_id, name, block_count FROM documents ORDER BY doc_id"
+        ))
+
+    def header(self, doc_id: int) -> dict:
+        row = self.conn.execute(
+            "SELECT header FROM documents WHERE doc_id = ?", (doc_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(doc_id)
+        header = json.loads(row[0])
+        document = header.setdefault("document", {})
+        passthrough = document.pop("passthrough", {})
+        document["body"] = []
+        document["passthrough"] = passthrough
+        return header
+
+    def load_ast(self, doc_id: int) -> dict:
+        """读取完整 AST（与保存时的 dict 相等）。"""
+        ast = self.header(doc_id)
+        ast["document"]["body"] = self.load_blocks(doc_id)
+        return ast
+
+    def load_blocks(
+        self,
+        doc_id: int,
+        block_ids: Iterable[str] | None = None,
+        *,
+        type: str | None = None,
+        style: str | None = None,
+    ) -> list[dict]:
+        """按文档顺序读取选定的 block（可按 id / type / style 过滤）。"""
+        sql = "SELECT data FROM blocks WHERE doc_id = ?"
+        params: list = [doc_id]
+        if type is not None:
+            sql += " AND type = ?"
+            params.append(type)
+        if style is not None:
+            sql += " AND style = ?"
+            params.append(style)
+        if block_ids is None:
+            return self._decode_blocks(self.conn.execute(sql + " ORDER BY seq", params))
+        ids = list(block_ids)
+        blocks: list[dict] = []
+        for start in range(0, len(ids), 900):
+            chunk = ids[start:start + 900]
+            marks = ",".join("?" * len(chunk))
+            blocks += self._decode_blocks(self.conn.execute(
+                f"{sql} AND block_id IN ({marks})", params + chunk
+            ))
+        order = {block_id: i for i, block_id in enumerate(ids)}
+        blocks.sort(key=lambda b: order[b.get("id")])
+        return blocks
+
+    def iter_blocks(self, doc_id: int, *, batch_size: int = 256) -> Iterator[dict]:
+        """按文档顺序分批流式读取 block。"""
+        last_seq = -1
+        while True:
+            rows = self.conn.execute(
+                "SELECT seq, data FROM blocks WHERE doc_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+                (doc_id, last_seq, batch_size),
+            ).fetchall()
+            if not rows:
+                return
+            last_seq = rows[-1][0]
+            yield from self._decode_blocks((data,) for _, data in rows)
+
+    def find_blocks(
+        self,
+        *,
+        type: str | None = None,
+        style: str | None = None,
+        block_id: str | None = None,
+    ) -> Iterator[tuple[int, dict]]:
+        """跨文档按 type / style / block_id 查找，产出 ``(doc_id, block)``。"""
+        clauses, params = [], []
+        for column, value in (("type", type), ("style", style), ("block_id", block_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        cur = self.conn.execute(f"SELECT doc_id, data FROM blocks{where} ORDER BY doc_id, seq", params)
+        for doc_id, data in cur:
+            yield doc_id, self._decode_blocks([(data,)])[0]
+
+    def search_text(self, needle: str) -> list[tuple[int, str, str]]:
+        """在 runs 投影中做子串查找，返回 ``(doc_id, paragraph_id, text)``。"""
+        escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return list(self.conn.execute(
+            "SELECT doc_id, paragraph_id, text FROM runs "
+            "WHERE text LIKE ? ESCAPE '\\' ORDER BY doc_id, block_seq, run_seq",
+            (f"%{escaped}%",),
+        ))
+
+    def document(self, doc_id: int) -> "StoredDocument":
+        """返回可直接交给 ``merge_ai_edits`` / ``render_ast`` 的惰性文档。"""
+        return StoredDocument(self, doc_id)
+
+
+class StoredDocument:
+    """库中单个文档的惰性 AST 视图（lazy-AST 协议）。"""
+
+    def __init__(self, store: SQLiteStore, doc_id: int):
+        self.store = store
+        self.doc_id = doc_id
+        self._header = store.header(doc_id)
+
+    @property
+    def header(self) -> dict:
+        return self._header
+
+    def iter_blocks(self) -> Iterator[dict]:
+        return self.store.iter_blocks(self.doc_id)
+
+    def get_block(self, block_id: str) -> dict:
+        blocks = self.store.load_blocks(self.doc_id, [block_id])
+        if not blocks:
+            raise KeyError(block_id)
+        return blocks[0]
+
+    def load(self) -> dict:
+        ast = copy.deepcopy(self._header)
+        ast["document"]["body"] = list(self.iter_blocks())
+        return ast
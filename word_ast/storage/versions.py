@@ -0,0 +1,235 @@
+"""内容寻址的版本库：同一文档多轮编辑只存储变化的 block。
+
+Content-addressed version store for successive edits of the same document.
+
+Every body block (and the AST header) is stored once under the hash of its
+canonical JSON; a version is a small record listing the hashes of its
+blocks in order.  Committing a new AI turn therefore only writes the blocks
+that actually changed, and storage grows with the amount edited rather than
+with ``turns × document size``.
+
+Layout under *root*::
+
+    objects/<h[:2]>/<h[2:]>.json   # one block or header, compact JSON
+    versions/<n>.json              # {"parent", "created", "message", "header", "ids", "blocks"}
+
+Versions are numbered from 1.  :meth:`VersionStore.checkout` rebuilds the
+AST of any version, :meth:`VersionStore.diff` compares two versions by
+block id, and :meth:`VersionStore.render` renders one.  Versions are also
+available as lazy ASTs (``header`` + ``iter_blocks()``).
+"""
+import copy
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+
+from word_ast import instrumentation
+from word_ast.nodes import json_default
+
+
+def _canonical(obj) -> bytes:
+    return json.dumps(
+        obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=json_default
+    ).encode("utf-8")
+
+
+def block_hash(obj) -> str:
+    """返回 block（或头部）规范 JSON 的内容哈希。"""
+    return hashlib.blake2b(_canonical(obj), digest_size=16).hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class VersionStore:
+    """同一文档的版本库。
+
+    *cache_size* bounds the in-memory LRU of decoded objects (as JSON text)
+    that makes switching between nearby versions cheap.
+    """
+
+    def __init__(self, root: str | Path, *, cache_size: int = 4096):
+        self.root = Path(root)
+        self._objects = self.root / "objects"
+        self._versions = self.root / "versions"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._versions.mkdir(parents=True, exist_ok=True)
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._cache_size = cache_size
+
+    # ------------------------------------------------------------------
+    # Objects
+    # ------------------------------------------------------------------
+
+    def _object_path(self, digest: str) -> Path:
+        return self._objects / digest[:2] / f"{digest[2:]}.json"
+
+    def _put(self, obj) -> str:
+        digest = block_hash(obj)
+        path = self._object_path(digest)
+        if not path.exists():
+            data = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=json_default)
+            _atomic_write(path, data.encode("utf-8"))
+            instrumentation.incr("bytes_written", path.stat().st_size)
+        return digest
+
+    def _get(self, digest: str):
+        text = self._cache.get(digest)
+        if text is not None:
+            self._cache.move_to_end(digest)
+            instrumentation.incr("cache_hits")
+        else:
+            instrumentation.incr("cache_misses")
+            text = self._object_path(digest).read_text(encoding="utf-8")
+            self._cache[digest] = text
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return json.loads(text)
+
+    # ------------------------------------------------------------------
+    # Versions
+    # ------------------------------------------------------------------
+
+    def _version_path(self, version: int) -> Path:
+        return self._versions / f"{version}.json"
+
+    def versions(self) -> list[int]:
+        """全部版本号（升序）。"""
+        return sorted(int(p.stem) for p in self._versions.glob("*.json"))
+
+    @property
+    def head(self) -> int | None:
+        """最新版本号；空库时为 ``None``。"""
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def _record(self, version: int) -> dict:
+        try:
+            return json.loads(self._version_path(version).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise KeyError(version) from None
+
+    def commit(self, ast: dict, message: str | None = None) -> int:
+        """保存一个新版本，返回版本号；只写入库中尚不存在的 block。"""
+        document = ast.get("document", {})
+        body = document.get("body", [])
+        header = {k: v for k, v in ast.items() if k != "document"}
+        header["document"] = {k: v for k, v in document.items() if k != "body"}
+        record = {
+            "parent": self.head,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "message": message,
+            "header": self._put(header),
+            "ids": [block.get("id") for block in body],
+            "blocks": [self._put(block) for block in body],
+        }
+        version = (self.head or 0) + 1
+        _atomic_write(
+            self._version_path(version),
+            json.dumps(record, ensure_ascii=False).encode("utf-8"),
+        )
+        return version
+
+    def commit_ai_edits(self, ai_ast: dict, message: str | None = None, *, base: int | None = None) -> int:
+        """把一轮 AI 修改合并到 *base*（默认最新版本）并提交为新版本。"""
+        from word_ast.ai_merge import merge_ai_edits
+
+        base = self.head if base is None else base
+        if base is None:
+            return self.commit(ai_ast, message)
+        return self.commit(merge_ai_edits(self.checkout(base), ai_ast), message)
+
+    def log(self) -> list[dict]:
+        """版本历史：每项含 version / parent / created / message / blocks 数。"""
+        entries = []
+        for version in self.versions():
+            record = self._record(version)
+            entries.append({
+                "version": version,
+                "parent": record.get("parent"),
+                "created": record.get("created"),
+                "message": record.get("message"),
+                "blocks": len(record["blocks"]),
+            })
+        return entries
+
+    def header(self, version: int) -> dict:
+        header = self._get(self._record(version)["header"])
+        document = header.setdefault("document", {})
+        passthrough = document.pop("passthrough", {})
+        document["body"] = []
+        document["passthrough"] = passthrough
+        return header
+
+    def iter_blocks(self, version: int) -> Iterator[dict]:
+        for digest in self._record(version)["blocks"]:
+            yield self._get(digest)
+
+    def checkout(self, version: int) -> dict:
+        """重建指定版本的完整 AST。"""
+        ast = self.header(version)
+        ast["document"]["body"] = list(self.iter_blocks(version))
+        return ast
+
+    def lazy(self, version: int) -> "StoredVersion":
+        """返回指定版本的惰性 AST（可直接交给 ``render_ast``）。"""
+        return StoredVersion(self, version)
+
+    def render(self, version: int, output_path: str | Path) -> None:
+        """渲染指定版本为 docx。"""
+        from word_ast.renderer.document_renderer import render_ast
+
+        render_ast(self.lazy(version), output_path)
+
+    def diff(self, old: int, new: int) -> dict:
+        """按 block id 比较两个版本。
+
+        Returns ``{"added": [...], "removed": [...], "changed": [...],
+        "header_changed": bool}``; ids are listed in document order of the
+        version they belong to.  Only the version records are read; blocks
+        are compared by hash and never loaded.
+        """
+        old_rec, new_rec = self._record(old), self._record(new)
+        old_ids = list(zip(old_rec["ids"], old_rec["blocks"]))
+        new_ids = list(zip(new_rec["ids"], new_rec["blocks"]))
+        old_map = dict(old_ids)
+        new_map = dict(new_ids)
+        return {
+            "added": [i for i, _ in new_ids if i not in old_map],
+            "removed": [i for i, _ in old_ids if i not in new_map],
+            "changed": [i for i, h in new_ids if i in old_map and old_map[i] != h],
+            "header_changed": old_rec["header"] != new_rec["header"],
+        }
+
+    def storage_bytes(self) -> int:
+        """对象与版本记录占用的总字节数。"""
+        return sum(p.stat().st_size for p in self.root.rglob("*.json"))
+
+
+class StoredVersion:
+    """版本库中一个版本的惰性 AST（lazy-AST 协议）。"""
+
+    def __init__(self, store: VersionStore, version: int):
+        self.store = store
+        self.version = version
+        self._header = store.header(version)
+
+    @property
+    def header(self) -> dict:
+        return self._header
+
+    def iter_blocks(self) -> Iterator[dict]:
+        return self.store.iter_blocks(self.version)
+
+    def load(self) -> dict:
+        ast = copy.deepcopy(self._header)
+        ast["document"]["body"] = list(self.iter_blocks())
+        return ast
@@ -0,0 +1,150 @@
+"""锚点文本视图：每个 block 一行（``[p12] 文本``），供 LLM 做纯文本改写。
+
+Line-oriented anchored text view.
+
+For text-only rewrites the JSON AI view mostly spends tokens on structure
+the model is not supposed to change.  :func:`to_text_view` writes the
+body as one line per block, prefixed with the block id::
+
+    [p0] 新生研讨课报告
+    [p1] 普通文字⟦1⟧加粗的部分⟦2⟧其余文字
+    [t0] ⟦table⟧
+    [p2] ⟦0:image⟧
+
+Runs keep their positions: ``⟦k⟧`` starts the text of content item *k*
+(item 0 needs no marker), so a run's formatting stays with its text.
+Non-text items are atoms such as ``⟦3:image⟧``.  Line breaks inside a
+run are written as ``↵``.  Tables and TOCs appear as ``⟦table⟧`` /
+``⟦toc⟧`` placeholders for context only.
+
+:func:`parse_text_view` reads the model's edited text back into an AI
+view holding the changed paragraphs — each one the original paragraph
+with only run texts replaced — which :func:`~word_ast.merge_ai_edits`
+merges like any other AI edit, so formatting survives through the
+``_raw_*`` fields.  Parsing is lenient:
+
+- lines without an anchor continue the previous line (joined by a space);
+- unknown anchors, placeholder lines and text that belongs to no text
+  run (e.g. added to an image-only paragraph) are ignored;
+- a run whose marker was deleted ends up empty: its text joins the run
+  before it.
+"""
+import re
+from collections.abc import Mapping
+
+from word_ast.ai_view import to_ai_view
+from word_ast.renderer.document_renderer import _resolve_ast
+
+_ANCHOR = re.compile(r"^\[([^\[\]\s]+)\] ?(.*)$")
+_MARKER = re.compile(r"⟦(\d+)(?::[A-Za-z]+)?⟧")
+_NEWLINE = "↵"
+
+_PLACEHOLDERS = {"Table": "⟦table⟧", "TOC": "⟦toc⟧"}
+
+
+def _atom(item: Mapping) -> str:
+    kind = item.get("type") or "item"
+    return "image" if kind == "InlineImage" else kind.lower()
+
+
+def _is_text(item) -> bool:
+    return isinstance(item, Mapping) and item.get("type", "Text") == "Text"
+
+
+def _paragraph_line(block: Mapping) -> str:
+    parts = []
+    for k, item in enumerate(block.get("content", [])):
+        if not isinstance(item, Mapping):
+            continue
+        if not _is_text(item):
+            parts.append(f"⟦{k}:{_atom(item)}⟧")
+            continue
+        if k:
+            parts.append(f"⟦{k}⟧")
+        parts.append(str(item.get("text", "")).replace("\n", _NEWLINE))
+    return "".join(parts)
+
+
+def to_text_view(ast) -> str:
+    """把 AST（完整 AST、AI 视图或 lazy AST）写成锚点文本视图。"""
+    _, blocks = _resolve_ast(ast)
+    lines = []
+    for block in blocks:
+        if not isinstance(block, Mapping):
+            continue
+        block_type = block.get("type")
+        if block_type == "Paragraph":
+            text = _paragraph_line(block)
+        else:
+            text = _PLACEHOLDERS.get(block_type, f"⟦{str(block_type).lower()}⟧")
+        lines.append(f"[{block.get('id')}] {text}" if text else f"[{block.get('id')}]")
+    return "\n".join(lines) + "\n"
+
+
+def _split_lines(text: str) -> dict[str, str]:
+    """锚点 → 行文本（无锚点的行接到上一行，重复锚点以最后一次为准）。"""
+    edited: dict[str, str] = {}
+    current = None
+    for line in text.split("\n"):
+        line = line.removesuffix("\r")
+        match = _ANCHOR.match(line)
+        if match:
+            current = match.group(1)
+            edited[current] = match.group(2)
+        elif current is not None and line.strip():
+            edited[current] = f"{edited[current]} {line.strip()}"
+    return edited
+
+
+def _run_texts(line: str, content: list) -> list[str] | None:
+    """把一行文本按 ``⟦k⟧`` 标记分配给各 run；返回新的 run 文本（非文本项为 None）。"""
+    text_indexes = [k for k, item in enumerate(content) if _is_text(item)]
+    if not text_indexes:
+        return None
+    texts: list = [("" if k in text_indexes else None) for k in range(len(content))]
+
+    def target(k: int | None) -> int | None:
+        if k is not None and 0 <= k < len(content) and texts[k] is not None:
+            return k
+        before = [i for i in text_indexes if k is None or i < k]
+        if k is not None and before:
+            return before[-1]
+        after = [i for i in text_indexes if k is None or i > k]
+        return after[0] if after else None
+
+    pos = 0
+    owner = target(0)
+    for match in _MARKER.finditer(line):
+        if owner is not None:
+            texts[owner] += line[pos:match.start()]
+        owner = target(int(match.group(1)))
+        pos = match.end()
+    if owner is not None:
+        texts[owner] += line[pos:]
+    return [t.replace(_NEWLINE, "\n") if t is not None else None for t in texts]
+
+
+def parse_text_view(text: str, ast) -> dict:
+    """把改写后的锚点文本读回为只含变化段落的 AI 视图，供 ``merge_ai_edits`` 使用。
+
+    *ast* is the AST the text view was made from (full AST, AI view, path
+    or lazy AST); it supplies each paragraph's runs and formatting.
+    """
+    edited = _split_lines(text)
+    header, blocks = _resolve_ast(ast)
+    body = []
+    for block in blocks:
+        if not isinstance(block, Mapping) or block.get("type") != "Paragraph":
+            continue
+        line = edited.get(block.get("id"))
+        if line is None or line == _paragraph_line(block):
+            continue
+        view = to_ai_view(block)
+        texts = _run_texts(line, view.get("content", []))
+        if texts is None:
+            continue
+        for item, new_text in zip(view["content"], texts):
+            if new_text is not None:
+                item["text"] = new_text
+        body.append(view)
+    return {"schema_version": header.get("schema_version", "1.0"), "document": {"body": body}}